@@ -20,6 +20,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExampl
 from drf_spectacular.openapi import OpenApiResponse
 from rest_framework.decorators import api_view, permission_classes
 from authentication.utils.email import send_verification_email
+from core.conditional import ConditionalGetMixin
 from .models import User, UserProfile
 from .serializers import (
     LogoutSerializer, UserSerializer, UserListSerializer, UserRegistrationSerializer,
@@ -460,11 +461,13 @@ class CurrentUserView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserProfileListCreateView(ListCreateAPIView):
+class UserProfileListCreateView(ConditionalGetMixin, ListCreateAPIView):
     """User profile list and create endpoint"""
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    # Email, name and account type come from the user row
+    validator_related = ('user__updated_at',)
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['profession']
     search_fields = ['user__email', 'user__first_name', 'user__last_name', 'profession']
@@ -499,11 +502,13 @@ class UserProfileListCreateView(ListCreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
-class UserProfileRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class UserProfileRetrieveUpdateDestroyView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """User profile retrieve, update, and delete endpoint"""
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    # Email, name and account type come from the user row
+    validator_related = ('user__updated_at',)
     lookup_field = 'id'
 
     def get_queryset(self):
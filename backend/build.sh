@@ -10,4 +10,7 @@ python manage.py collectstatic --noinput
 echo "Running database migrations..."
 python manage.py migrate
 
+echo "Extending shift calendar..."
+python manage.py generate_shift_occurrences
+
 echo "Build complete!"
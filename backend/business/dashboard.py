@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from core.cache import Namespace, get_or_compute, get_or_compute_many
+
+
+COUNTERS = (
+    'total_staff', 'total_active_staff', 'staff_on_leave',
+    'active_jobs', 'total_applications', 'pending_applications', 'accepted_applications',
+    'total_shifts', 'hours_pending_approval', 'total_hours_this_week',
+)
+
+
+DASHBOARDS = Namespace('business-dashboard')
+
+
+def _entry(business_id, week_start):
+    # The week is part of the key so weekly hours roll over without an invalidation
+    return (business_id, week_start.isoformat()), [(business_id,)]
+
+
+def _grouped(queryset, key, **aggregates):
+    return {row.pop(key): row for row in queryset.values(key).annotate(**aggregates).order_by()}
+
+
+def compute_counters(businesses, week_start):
+    """
+    Dashboard counters for several businesses: one grouped aggregate per table.
+
+    Jobs and applications belong to the owner's posts, so every business of
+    the same owner shows the same job numbers.
+    """
+    from posts.models import JobApplication, Post
+    from workforce.models import BusinessStaff, HoursCard, HoursRollup, Shift
+
+    business_ids = [business.id for business in businesses]
+    owner_ids = {business.user_id for business in businesses}
+
+    staff = _grouped(
+        BusinessStaff.objects.filter(business_id__in=business_ids), 'business_id',
+        total_staff=Count('id'),
+        total_active_staff=Count('id', filter=Q(status='ACTIVE')),
+        staff_on_leave=Count('id', filter=Q(status='ON_LEAVE')),
+    )
+    shifts = _grouped(
+        Shift.objects.filter(business_id__in=business_ids, is_active=True), 'business_id',
+        total_shifts=Count('id'),
+    )
+    pending_cards = _grouped(
+        HoursCard.objects.filter(staff__business_id__in=business_ids, status='SIGNED'), 'staff__business_id',
+        hours_pending_approval=Count('id'),
+    )
+    week_hours = _grouped(
+        HoursRollup.objects.filter(business_id__in=business_ids, period='WEEK', period_start=week_start), 'business_id',
+        seconds=Sum('submitted_seconds'),
+    )
+    jobs = _grouped(
+        Post.objects.filter(user_id__in=owner_ids, post_type='JOB', is_active=True), 'user_id',
+        active_jobs=Count('id'),
+    )
+    applications = _grouped(
+        JobApplication.objects.filter(job__user_id__in=owner_ids), 'job__user_id',
+        total_applications=Count('id'),
+        pending_applications=Count('id', filter=Q(status='PENDING')),
+        accepted_applications=Count('id', filter=Q(status='ACCEPTED')),
+    )
+
+    result = {}
+    for business in businesses:
+        counters = dict.fromkeys(COUNTERS, 0)
+        for row in (
+            staff.get(business.id), shifts.get(business.id), pending_cards.get(business.id),
+            jobs.get(business.user_id), applications.get(business.user_id),
+        ):
+            counters.update(row or {})
+        seconds = (week_hours.get(business.id) or {}).get('seconds') or 0
+        counters['total_hours_this_week'] = round(seconds / 3600, 1)
+        result[business.id] = counters
+    return result
+
+
+def _timeout():
+    return getattr(settings, 'DASHBOARD_CACHE_SECONDS', 300)
+
+
+def counters_for(businesses):
+    """
+    Cached dashboard counters keyed by business id.
+
+    Every key is computed single-flight; for a page of businesses the misses
+    this request locks are computed together.
+    """
+    from workforce.rollups import week_start_for
+
+    week_start = week_start_for(timezone.localdate())
+    keys = DASHBOARDS.keys({business.id: _entry(business.id, week_start) for business in businesses})
+    if len(businesses) == 1:
+        business = businesses[0]
+        return {business.id: get_or_compute(
+            keys[business.id], lambda: compute_counters([business], week_start)[business.id], _timeout()
+        )}
+
+    by_id = {business.id: business for business in businesses}
+    return get_or_compute_many(
+        keys,
+        lambda business_ids: compute_counters([by_id[business_id] for business_id in business_ids], week_start),
+        _timeout(),
+    )
+
+
+def versions(business_ids):
+    """Token per business that changes whenever its counters are invalidated, for HTTP validators"""
+    from workforce.rollups import week_start_for
+
+    week = week_start_for(timezone.localdate()).isoformat()
+    tokens = DASHBOARDS.versions([(business_id,) for business_id in business_ids])
+    return {business_id: f"{tokens[(business_id,)]}:{week}" for business_id in business_ids}
+
+
+def invalidate(business_ids):
+    """Expire cached counters for the businesses once the current transaction commits"""
+    scopes = [(business_id,) for business_id in set(business_ids) if business_id]
+    if scopes:
+        DASHBOARDS.bump(*scopes)
+
+
+def invalidate_owner(user_id):
+    """Jobs and applications are per owner, so they touch all of the owner's businesses"""
+    from .models import Business
+
+    invalidate(Business.objects.filter(user_id=user_id).values_list('id', flat=True))
@@ -0,0 +1,16 @@
+# Generated by Django 4.2 on 2026-10-16 15:10
+
+from django.db import migrations
+
+from core.ids import create_sequence
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0003_business_street'),
+    ]
+
+    operations = [
+        create_sequence('business_business_id_seq'),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-16 23:16
+
+from django.db import migrations, models
+
+
+def backfill_geohash(apps, schema_editor):
+    from business.models import business_geohash
+
+    Business = apps.get_model('business', 'Business')
+    batch = []
+    located = Business.objects.filter(workplace_latitude__isnull=False, workplace_longitude__isnull=False)
+    for business in located.only('id', 'workplace_latitude', 'workplace_longitude').iterator(chunk_size=2000):
+        business.geohash = business_geohash(business.workplace_latitude, business.workplace_longitude)
+        batch.append(business)
+        if len(batch) >= 1000:
+            Business.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    if batch:
+        Business.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0004_business_id_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, help_text='Geohash of the workplace location, kept in sync on save for nearby search', max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_verified', True), models.Q(('geohash', ''), _negated=True)), fields=['geohash'], name='business_nearby_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
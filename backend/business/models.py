@@ -1,13 +1,30 @@
 from django.db import models
 from django.conf import settings
+from core.ids import CodeAllocator
 from core.models import UUIDModel
-import string
-import random
+
+
+BUSINESS_IDS = CodeAllocator(
+    prefix='BIZ', length=8, sequence='business_business_id_seq',
+    model='business.Business', field='business_id', multiplier=2654435761,
+)
 
 
 def generate_business_id():
     """Generate unique business ID"""
-    return f"BIZ-{''.join(random.choices(string.ascii_uppercase + string.digits, k=8))}"
+    return BUSINESS_IDS.allocate()[0]
+
+
+# About 5 m cells; searches only ever use a prefix of the stored hash
+GEOHASH_PRECISION = 9
+
+
+def business_geohash(latitude, longitude):
+    """Stored geohash for a workplace location, or '' when it isn't set"""
+    from core.geo import geohash_encode
+    if latitude is None or longitude is None:
+        return ''
+    return geohash_encode(latitude, longitude, GEOHASH_PRECISION)
 
 
 class Business(UUIDModel):
@@ -85,6 +102,12 @@ class Business(UUIDModel):
         default=True,
         help_text="Require workers to be at workplace location to clock in"
     )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        editable=False,
+        help_text="Geohash of the workplace location, kept in sync on save for nearby search"
+    )
 
     class Meta:
         verbose_name = 'Business'
@@ -95,12 +118,23 @@ class Business(UUIDModel):
             models.Index(fields=['business_id']),
             models.Index(fields=['slug']),
             models.Index(fields=['user', 'is_active']),
+            # Prefix scans for nearby search; pattern ops let PostgreSQL use it for LIKE 'prefix%'
+            models.Index(
+                fields=['geohash'],
+                name='business_nearby_idx',
+                opclasses=['varchar_pattern_ops'],
+                condition=models.Q(is_verified=True, is_active=True) & ~models.Q(geohash=''),
+            ),
         ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             from django.utils.text import slugify
             self.slug = slugify(self.name)
+        self.geohash = business_geohash(self.workplace_latitude, self.workplace_longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'workplace_latitude', 'workplace_longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -0,0 +1,59 @@
+import math
+from functools import reduce
+from operator import or_
+
+import numpy as np
+from django.db.models import Q
+
+from core.geo import geohash_cover, haversine_many
+from .models import Business
+
+
+DEFAULT_RADIUS_METERS = 10000
+MAX_RADIUS_METERS = 100000
+MAX_RESULTS = 200
+
+
+def parse_point(params):
+    """(lat, lon, radius_meters) from lat/lng/radius_km query parameters; raises ValueError"""
+    lat = float(params.get('lat', ''))
+    lon = float(params.get('lng', params.get('lon', '')))
+    if not (math.isfinite(lat) and math.isfinite(lon) and -90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError('Coordinates out of range')
+    radius = float(params['radius_km']) * 1000 if params.get('radius_km') else DEFAULT_RADIUS_METERS
+    if not (math.isfinite(radius) and radius > 0):
+        raise ValueError('Radius must be a positive number')
+    return lat, lon, min(radius, MAX_RADIUS_METERS)
+
+
+def parse_limit(params, default=50):
+    try:
+        return max(1, min(int(params.get('limit', default)), MAX_RESULTS))
+    except ValueError:
+        return default
+
+
+def nearby_businesses(lat, lon, radius_meters, queryset=None, limit=MAX_RESULTS):
+    """
+    Verified, active businesses within radius_meters of a point, nearest first.
+
+    Candidates come from a prefix scan of the geohash index over the few
+    cells covering the search circle; exact haversine distances are then
+    computed for those candidates only. Returns (business_id, owner_id,
+    distance_meters) tuples.
+    """
+    queryset = Business.objects.all() if queryset is None else queryset
+    cells = reduce(or_, (Q(geohash__startswith=cell) for cell in geohash_cover(lat, lon, radius_meters)))
+    candidates = list(
+        queryset.filter(cells, is_verified=True, is_active=True)
+        .exclude(geohash='')
+        .values_list('id', 'user_id', 'workplace_latitude', 'workplace_longitude')
+    )
+    if not candidates:
+        return []
+
+    ids, owner_ids, lats, lons = zip(*candidates)
+    distances = haversine_many(lat, lon, lats, lons)
+    within = np.flatnonzero(distances <= radius_meters)
+    nearest = within[np.argsort(distances[within], kind='stable')][:limit]
+    return [(ids[i], owner_ids[i], float(distances[i])) for i in nearest]
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import JobApplication, Post
+from workforce.models import BusinessStaff, HoursRollup, Shift
+from . import dashboard
+
+
+# Hours card changes are caught through the rollups every card write refreshes,
+# including bulk approvals, batched punches and the sweeper that skip HoursCard signals
+@receiver([post_save, post_delete], sender=BusinessStaff)
+@receiver([post_save, post_delete], sender=Shift)
+@receiver([post_save, post_delete], sender=HoursRollup)
+def invalidate_dashboard(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    dashboard.invalidate([instance.business_id])
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_dashboard_for_post(sender, instance, raw=False, **kwargs):
+    if raw or instance.post_type != 'JOB':
+        return
+    dashboard.invalidate_owner(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=JobApplication)
+def invalidate_dashboard_for_application(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    owner_id = Post.objects.filter(id=instance.job_id).values_list('user_id', flat=True).first()
+    if owner_id:
+        dashboard.invalidate_owner(owner_id)
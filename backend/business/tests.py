@@ -1,3 +1,65 @@
-from django.test import TestCase
+import math
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from core.geo import EARTH_RADIUS_METERS, geohash_cover, geohash_encode, haversine_many
+from .nearby import parse_point
+
+
+def destination(lat, lon, bearing, distance):
+    """Point ``distance`` meters from (lat, lon) along ``bearing`` degrees"""
+    angle = distance / EARTH_RADIUS_METERS
+    lat1, lon1, theta = math.radians(lat), math.radians(lon), math.radians(bearing)
+    lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(theta))
+    lon2 = lon1 + math.atan2(
+        math.sin(theta) * math.sin(angle) * math.cos(lat1),
+        math.cos(angle) - math.sin(lat1) * math.sin(lat2),
+    )
+    return math.degrees(lat2), (math.degrees(lon2) + 180) % 360 - 180
+
+
+class GeohashTests(SimpleTestCase):
+    def test_encode_known_vectors(self):
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(geohash_encode(42.605, -5.603, 5), 'ezs42')
+        self.assertEqual(geohash_encode(-25.382708, -49.265506, 9), '6gkzwgjzn')
+
+    def test_cover_includes_every_point_within_radius(self):
+        centers = [
+            (52.5, 13.4),
+            (0.0, 179.99),
+            (-33.9, -179.95),
+            (89.99, 0.0),
+            (-89.5, 120.0),
+            (64.1, -21.9),
+        ]
+        for lat, lon in centers:
+            for radius in (500, 10000, 100000):
+                cover = geohash_cover(lat, lon, radius)
+                for distance in (radius * 0.5, radius * 0.999):
+                    for bearing in range(0, 360, 5):
+                        point_lat, point_lon = destination(lat, lon, bearing, distance)
+                        self.assertLessEqual(haversine_many(lat, lon, [point_lat], [point_lon])[0], radius)
+                        geohash = geohash_encode(point_lat, point_lon)
+                        with self.subTest(center=(lat, lon), radius=radius, point=(point_lat, point_lon)):
+                            self.assertTrue(any(geohash.startswith(prefix) for prefix in cover))
+
+    def test_cover_wraps_at_the_antimeridian(self):
+        cover = geohash_cover(0.0, 179.99, 10000)
+        self.assertTrue(any(geohash_encode(0.0, -179.99).startswith(prefix) for prefix in cover))
+
+
+class ParsePointTests(SimpleTestCase):
+    def test_valid_point(self):
+        self.assertEqual(parse_point({'lat': '52.5', 'lng': '13.4', 'radius_km': '2'}), (52.5, 13.4, 2000.0))
+
+    def test_rejects_non_finite_values(self):
+        for params in (
+            {'lat': 'nan', 'lng': '13.4'},
+            {'lat': '52.5', 'lng': 'inf'},
+            {'lat': '52.5', 'lng': '13.4', 'radius_km': 'nan'},
+            {'lat': '52.5', 'lng': '13.4', 'radius_km': 'inf'},
+            {'lat': '52.5', 'lng': '13.4', 'radius_km': '-1'},
+        ):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                parse_point(params)
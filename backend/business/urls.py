@@ -6,6 +6,7 @@ app_name = 'business'
 urlpatterns = [
     # Businesses
     path('', views.BusinessListCreateView.as_view(), name='business-list-create'),
+    path('nearby/', views.NearbyBusinessListView.as_view(), name='business-nearby'),
     path('<uuid:pk>/', views.BusinessRetrieveUpdateDestroyView.as_view(), name='business-detail'),
     path('<uuid:pk>/request-verification/', views.BusinessRetrieveUpdateDestroyView.as_view(), {'action': 'request_verification'}, name='business-request-verification'),
 
@@ -11,16 +11,34 @@ from drf_spectacular.openapi import OpenApiResponse
 from django.core.mail import send_mail
 from django.conf import settings
 
+from core.conditional import ConditionalGetMixin
 from .models import Business, ContactUs
-from .serializers import BusinessSerializer, BusinessListSerializer, ContactUsSerializer
+from .serializers import BusinessSerializer, BusinessListSerializer, ContactUsSerializer, NearbyBusinessSerializer
 
 
-class BusinessListCreateView(ListCreateAPIView):
+# Beyond this many businesses (workers browsing the directory) responses aren't validated
+MAX_VALIDATED_BUSINESSES = 100
+
+
+def dashboard_validator(queryset):
+    """Validator part for the dashboard counters of the businesses in a response"""
+    from .dashboard import versions
+
+    business_ids = list(queryset.values_list('id', flat=True)[:MAX_VALIDATED_BUSINESSES + 1])
+    if len(business_ids) > MAX_VALIDATED_BUSINESSES:
+        return None
+    tokens = versions(business_ids)
+    return ','.join(tokens[business_id] for business_id in sorted(business_ids, key=str))
+
+
+class BusinessListCreateView(ConditionalGetMixin, ListCreateAPIView):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['category', 'size', 'city', 'country', 'is_verified']
     search_fields = ['name', 'business_id', 'description', 'city']
     ordering_fields = ['created_at', 'name', 'size']
     ordering = ['-created_at']
+    # The owner's name is rendered with each business
+    validator_related = ('user__updated_at',)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -29,16 +47,19 @@ class BusinessListCreateView(ListCreateAPIView):
         user = self.request.user
         if user.account_type == 'BUSINESS':
             # Business users only see their own business
-            return Business.objects.filter(user=user)
+            return Business.objects.filter(user=user).select_related('user')
         else:
             # Workers see all verified, active businesses
-            return Business.objects.filter(is_verified=True, is_active=True)
+            return Business.objects.filter(is_verified=True, is_active=True).select_related('user')
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return BusinessListSerializer
         return BusinessSerializer
 
+    def get_validator_extra(self, queryset):
+        return dashboard_validator(queryset)
+
     def perform_create(self, serializer):
         if self.request.user.account_type != 'BUSINESS':
             from rest_framework.exceptions import PermissionDenied
@@ -77,9 +98,11 @@ class BusinessListCreateView(ListCreateAPIView):
 
 
 
-class BusinessRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class BusinessRetrieveUpdateDestroyView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = BusinessSerializer
     permission_classes = [IsAuthenticated]
+    # The owner's name is rendered with each business
+    validator_related = ('user__updated_at',)
 
     def get_queryset(self):
         user = self.request.user
@@ -88,6 +111,9 @@ class BusinessRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         else:
             return Business.objects.filter(is_verified=True, is_active=True)
 
+    def get_validator_extra(self, queryset):
+        return dashboard_validator(queryset)
+
     def get_permissions(self):
         if self.request.method in ['PATCH', 'DELETE']:
             return [permissions.IsAuthenticated()]
@@ -175,6 +201,45 @@ class BusinessRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         return Response({'message': 'Verification request submitted successfully'})
 
 
+class NearbyBusinessListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Nearby businesses",
+        description="Verified businesses ranked by distance from a point",
+        parameters=[
+            OpenApiParameter('lat', float, required=True, description='Latitude'),
+            OpenApiParameter('lng', float, required=True, description='Longitude'),
+            OpenApiParameter('radius_km', float, description='Search radius in km (default 10, max 100)'),
+            OpenApiParameter('category', str, description='Filter by category'),
+            OpenApiParameter('limit', int, description='Maximum results (default 50, max 200)'),
+        ],
+        responses={200: NearbyBusinessSerializer(many=True)}
+    )
+    def get(self, request):
+        from .nearby import nearby_businesses, parse_limit, parse_point
+
+        try:
+            lat, lon, radius = parse_point(request.query_params)
+        except (KeyError, ValueError):
+            return Response(
+                {'error': "'lat' and 'lng' must be valid coordinates and 'radius_km' a positive number"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = Business.objects.all()
+        if request.query_params.get('category'):
+            queryset = queryset.filter(category=request.query_params['category'])
+        ranked = nearby_businesses(lat, lon, radius, queryset, limit=parse_limit(request.query_params))
+
+        distances = {business_id: distance for business_id, _, distance in ranked}
+        businesses = Business.objects.in_bulk(distances.keys())
+        serializer = NearbyBusinessSerializer(
+            [businesses[business_id] for business_id in distances], many=True, context={'distances': distances}
+        )
+        return Response({'count': len(ranked), 'radius_km': radius / 1000, 'results': serializer.data})
+
+
 class ContactUsView(APIView):
     permission_classes = [AllowAny]
 
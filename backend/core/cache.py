@@ -0,0 +1,298 @@
+"""
+Application cache helpers on top of Django's cache (Redis in production).
+
+Every call fails open: if the cache is unreachable the error is logged and
+callers fall back to computing values, so a cache outage slows requests
+down instead of failing them.
+"""
+import hashlib
+import logging
+import time
+import uuid
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+MISS = object()
+
+# Stored in place of None so "computed, nothing there" is distinguishable from a miss
+NEGATIVE = '__negative__'
+
+# Response headers replayed from a cached view response
+REPLAYED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+
+def _fail_open(default):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.warning("Cache unavailable in %s: %s", func.__name__, e)
+                return default() if callable(default) else default
+        return wrapper
+    return decorator
+
+
+@_fail_open(MISS)
+def get(key):
+    return cache.get(key, MISS)
+
+
+@_fail_open(dict)
+def get_many(keys):
+    return cache.get_many(list(keys))
+
+
+@_fail_open(None)
+def set(key, value, timeout):
+    cache.set(key, value, timeout)
+
+
+@_fail_open(None)
+def set_many(values, timeout):
+    cache.set_many(values, timeout)
+
+
+@_fail_open(None)
+def delete(key):
+    cache.delete(key)
+
+
+@_fail_open(None)
+def delete_many(keys):
+    cache.delete_many(list(keys))
+
+
+@_fail_open(True)
+def add(key, value, timeout):
+    """True if the key was created; without a cache every caller wins"""
+    return cache.add(key, value, timeout)
+
+
+# Period each name was last claimed for in this process
+_claimed_periods = {}
+
+
+def claim_period(name, period, timeout):
+    """
+    True for the first caller of ``name`` in ``period`` (a date, an hour number...).
+
+    Lets upkeep jobs piggyback on requests instead of depending on a
+    scheduler. Claims are shared across processes while the cache is up;
+    without it each process still claims each period only once.
+    """
+    if _claimed_periods.get(name) == period:
+        return False
+    _claimed_periods[name] = period
+    return add(f"claim:{name}:{period}", 1, timeout)
+
+
+def digest(*parts):
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+class Namespace:
+    """
+    A versioned key space.
+
+    Keys embed the current version of each scope they depend on (e.g. a
+    business id), so bumping a scope's version orphans every key built from
+    it without having to find and delete them; orphaned entries simply
+    expire. A missing version is replaced with a fresh random one, never a
+    constant, so an evicted version can't bring back stale entries.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _version_key(self, scope):
+        return f"{self.name}:version:{':'.join(str(part) for part in scope)}"
+
+    def versions(self, scopes):
+        """Current version per scope tuple, in one round trip"""
+        keys = {scope: self._version_key(scope) for scope in scopes}
+        found = get_many(keys.values())
+        fresh = {key: uuid.uuid4().hex for key in keys.values() if key not in found}
+        if fresh:
+            set_many(fresh, None)
+            found.update(fresh)
+        return {scope: found[key] for scope, key in keys.items()}
+
+    def keys(self, entries):
+        """Keys for several ``{name: (parts, scopes)}`` entries with a single version lookup"""
+        versions = self.versions({scope for _, scopes in entries.values() for scope in scopes})
+        return {
+            name: f"{self.name}:{digest(*parts, *(versions[scope] for scope in scopes))}"
+            for name, (parts, scopes) in entries.items()
+        }
+
+    def key(self, *parts, scopes=((),)):
+        """Cache key for ``parts`` that changes whenever any of ``scopes`` is bumped"""
+        return self.keys({None: (parts, scopes)})[None]
+
+    def bump(self, *scopes):
+        """Invalidate everything built from the scopes once the current transaction commits"""
+        values = {self._version_key(scope): uuid.uuid4().hex for scope in scopes or ((),)}
+        transaction.on_commit(lambda: set_many(values, None))
+
+
+def invalidate_on(namespace, *models, scope=None, ignore=None):
+    """
+    Bump ``namespace`` whenever a row of any of ``models`` is saved or deleted.
+
+    ``scope(instance)`` returns the scope tuples to bump; by default the
+    whole namespace is bumped. Saves whose update_fields are all in
+    ``ignore`` don't affect the cached values and are skipped.
+    """
+    ignored = frozenset(ignore or ())
+
+    def receiver(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (ignored and update_fields and frozenset(update_fields) <= ignored):
+            return
+        namespace.bump(*(scope(instance) if scope else ((),)))
+
+    for model in models:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                receiver, sender=model, weak=False,
+                dispatch_uid=f"cache-invalidate:{namespace.name}:{model._meta.label}:{signal is post_save}",
+            )
+
+
+def _lock(key):
+    return f"{key}:lock"
+
+
+def get_or_compute(key, compute, timeout, negative_timeout=60, lock_timeout=30, wait=5):
+    """
+    Cached value for ``key``, computing it at most once at a time.
+
+    On a miss one caller takes a short lock and computes; concurrent callers
+    poll for its result for up to ``wait`` seconds (or until the lock is
+    released without a value) before computing themselves. A None result is
+    cached for ``negative_timeout`` seconds; ``timeout`` may also be a
+    function of the computed value.
+    """
+    value = get(key)
+    if value is MISS:
+        lock = _lock(key)
+        if add(lock, 1, lock_timeout):
+            try:
+                value = compute()
+                if value is None:
+                    set(key, NEGATIVE, negative_timeout)
+                else:
+                    set(key, value, timeout(value) if callable(timeout) else timeout)
+            finally:
+                delete(lock)
+            return value
+
+        deadline = time.monotonic() + wait
+        while value is MISS and time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = get(key)
+            if value is MISS and get(lock) is MISS:
+                value = get(key)
+                break
+        if value is MISS:
+            return compute()
+    return None if isinstance(value, str) and value == NEGATIVE else value
+
+
+def get_or_compute_many(keys, compute, timeout, lock_timeout=30, wait=5):
+    """
+    Cached values for ``{name: key}``, computing each missing one at most once at a time.
+
+    Missing names this caller manages to lock are computed together with a
+    single ``compute(names)`` call returning ``{name: value}``; names locked
+    by other callers are polled for up to ``wait`` seconds and computed here
+    only if they still haven't appeared.
+    """
+    found = get_many(keys.values())
+    result = {name: found[key] for name, key in keys.items() if key in found}
+    missing = [name for name in keys if name not in result]
+    owned = [name for name in missing if add(_lock(keys[name]), 1, lock_timeout)]
+    if owned:
+        try:
+            computed = compute(owned)
+            set_many({keys[name]: value for name, value in computed.items()}, timeout)
+        finally:
+            delete_many(_lock(keys[name]) for name in owned)
+        result.update(computed)
+
+    waiting = [name for name in missing if name not in result]
+    deadline = time.monotonic() + wait
+    while waiting and time.monotonic() < deadline:
+        time.sleep(0.05)
+        found = get_many(keys[name] for name in waiting)
+        result.update({name: found[keys[name]] for name in waiting if keys[name] in found})
+        waiting = [name for name in waiting if name not in result]
+    if waiting:
+        result.update(compute(waiting))
+    return result
+
+
+class _Uncacheable(Exception):
+    """Carries a response that must not be stored out of a cached computation"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def cache_response(namespace, timeout, vary=None, scopes=None, negative_timeout=60, bypass=None):
+    """
+    Cache successful (and 404) DRF GET responses in ``namespace``.
+
+    The key covers the path with its query string, ``vary(request)`` (the
+    user id by default; return something shared to cache across users) and
+    the versions of ``scopes(request, *args, **kwargs)``. Requests for
+    which ``bypass(request)`` is true are never cached. Misses are rendered
+    single-flight through get_or_compute. Hits replay the stored validators,
+    so a matching If-None-Match is still answered with a 304. Use on
+    function views below @api_view, or with method_decorator.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or (bypass and bypass(request)):
+                return view(request, *args, **kwargs)
+
+            varies_on = vary(request) if vary else (request.user.pk,)
+            scope_list = tuple(scopes(request, *args, **kwargs)) if scopes else ((),)
+            key = namespace.key(request.get_full_path(), varies_on, sorted(kwargs.items()), scopes=scope_list)
+
+            def render():
+                response = view(request, *args, **kwargs)
+                if response.status_code not in (200, 404) or not isinstance(response, Response):
+                    raise _Uncacheable(response)
+                return {
+                    'status': response.status_code,
+                    'data': response.data,
+                    'headers': {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)},
+                }
+
+            try:
+                stored = get_or_compute(
+                    key, render,
+                    timeout=lambda stored: negative_timeout if stored['status'] == 404 else timeout,
+                )
+            except _Uncacheable as uncacheable:
+                return uncacheable.response
+
+            headers = stored['headers']
+            not_modified = headers.get('ETag') and get_conditional_response(request, etag=headers['ETag'])
+            response = not_modified or Response(stored['data'], status=stored['status'])
+            for name, value in headers.items():
+                response[name] = value
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,83 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Opt-in ETag/Last-Modified handling for DRF generic list and detail views.
+
+    A list's validator is MAX(updated_at) and COUNT over the filtered
+    queryset (the count catches deletions); a detail view's comes from the
+    object. Both are combined with the user and full path, which also shape
+    the payload. A matching If-None-Match gets a 304 before anything is
+    serialized.
+
+    Related rows the serializer renders (an author's name, a business
+    name) are listed in validator_related as lookups such as
+    'user__updated_at'; their MAX joins the same aggregate. Views whose
+    payload also depends on other tables return a version string for them
+    from get_validator_extra(), or None to skip conditional handling for
+    that request. Last-Modified is only sent for detail views with neither,
+    where updated_at alone is exact.
+    """
+    validator_field = 'updated_at'
+    validator_related = ()
+
+    def get_validator_extra(self, queryset):
+        """Version of anything besides the rows themselves that the payload depends on"""
+        return ''
+
+    def _related_state(self):
+        return {f'related_{index}': Max(lookup) for index, lookup in enumerate(self.validator_related)}
+
+    def _etag(self, request, *parts):
+        user = request.user.pk if request.user.is_authenticated else ''
+        source = '|'.join(str(part) for part in (request.get_full_path(), user, *parts))
+        return f'W/"{hashlib.sha256(source.encode()).hexdigest()[:32]}"'
+
+    def _finish(self, response, etag, last_modified=None):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = self.get_validator_extra(queryset)
+        if extra is None:
+            return super().list(request, *args, **kwargs)
+
+        state = queryset.order_by().aggregate(
+            last=Max(self.validator_field), count=Count('pk'), **self._related_state()
+        )
+        last = state.pop('last')
+        etag = self._etag(request, last.isoformat() if last else '', *state.values(), extra)
+        response = get_conditional_response(request, etag=etag) or super().list(request, *args, **kwargs)
+        return self._finish(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        rows = self.get_queryset().filter(pk=instance.pk)
+        extra = self.get_validator_extra(rows)
+        if extra is None:
+            return Response(self.get_serializer(instance).data)
+
+        related = rows.order_by().aggregate(**self._related_state()) if self.validator_related else {}
+        last = getattr(instance, self.validator_field)
+        etag = self._etag(request, instance.pk, last.isoformat() if last else '', *related.values(), extra)
+        last_modified = last if last and not extra and not related else None
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self._finish(response, etag, last_modified)
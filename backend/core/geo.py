@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS_METERS = 6371000
+METERS_PER_DEGREE_LATITUDE = 111320
+
+
+def haversine_matrix(lats1, lons1, lats2, lons2):
+    """
+    Distances in meters between every point in (lats1, lons1) and every point
+    in (lats2, lons2), as an array of shape (len(lats1), len(lats2)).
+    """
+    lat1 = np.radians(np.asarray(lats1, dtype=float))[:, None]
+    lon1 = np.radians(np.asarray(lons1, dtype=float))[:, None]
+    lat2 = np.radians(np.asarray(lats2, dtype=float))[None, :]
+    lon2 = np.radians(np.asarray(lons2, dtype=float))[None, :]
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def haversine_many(lat, lon, lats, lons):
+    """Distances in meters from one point to each point in (lats, lons)"""
+    return haversine_matrix([lat], [lon], lats, lons)[0]
+
+
+def longitude_delta(lat, radius_meters):
+    """
+    Degrees of longitude a circle of radius_meters spans east or west of its
+    center; 180 once the circle reaches a pole and so covers every longitude.
+    """
+    angle = math.radians(radius_meters / METERS_PER_DEGREE_LATITUDE)
+    cos_lat = math.cos(math.radians(float(lat)))
+    if angle >= math.pi / 2 or math.sin(angle) >= cos_lat:
+        return 180.0
+    return math.degrees(math.asin(math.sin(angle) / cos_lat))
+
+
+def wrap_longitude(lon):
+    """Longitude folded back into [-180, 180)"""
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def bounding_box(lat, lon, radius_meters):
+    """(min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_meters around a point"""
+    lat, lon = float(lat), float(lon)
+    lat_delta = radius_meters / METERS_PER_DEGREE_LATITUDE
+    lon_delta = longitude_delta(lat, radius_meters)
+    return (
+        max(lat - lat_delta, -90.0),
+        min(lat + lat_delta, 90.0),
+        max(lon - lon_delta, -180.0),
+        min(lon + lon_delta, 180.0),
+    )
+
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def geohash_encode(lat, lon, precision=9):
+    """Geohash of a point; nearby points share prefixes, so prefix ranges act as a spatial index"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, value, bits, even = [], 0, 0, True
+    lat, lon = float(lat), float(lon)
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            value, bits = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cell_degrees(precision):
+    """(height, width) in degrees of a geohash cell; longitude gets the extra bit on odd lengths"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def _samples(low, high, step):
+    """Points from low to high no further apart than step, so every cell of that size is hit"""
+    count = max(math.ceil((high - low) / step), 1)
+    return [low + (high - low) * index / count for index in range(count + 1)]
+
+
+# Slack for the spherical approximations of the bounding box
+COVER_MARGIN = 1.01
+
+
+def geohash_cover(lat, lon, radius_meters, max_precision=9):
+    """
+    Geohash prefixes whose cells together cover a circle around a point.
+
+    Uses the longest prefix whose cells are at least as large as the radius,
+    so the circle's bounding box touches only a few cells per axis; points
+    no further apart than a cell are sampled across the box to collect them.
+    Longitudes wrap, so a circle crossing the antimeridian picks up cells on
+    both sides.
+    """
+    radius = radius_meters * COVER_MARGIN
+    min_lat, max_lat, _, _ = bounding_box(lat, lon, radius)
+    lon_delta = longitude_delta(lat, radius)
+    cos_lat = max(math.cos(math.radians(max(abs(min_lat), abs(max_lat)))), 0.01)
+
+    precision = 1
+    for candidate in range(max_precision, 0, -1):
+        height, width = geohash_cell_degrees(candidate)
+        if (
+            height * METERS_PER_DEGREE_LATITUDE >= radius
+            and width * METERS_PER_DEGREE_LATITUDE * cos_lat >= radius
+        ):
+            precision = candidate
+            break
+
+    height, width = geohash_cell_degrees(precision)
+    lats = _samples(min_lat, max_lat, height)
+    lons = [wrap_longitude(sample) for sample in _samples(float(lon) - lon_delta, float(lon) + lon_delta, width)]
+    return sorted({geohash_encode(sample_lat, sample_lon, precision) for sample_lat in lats for sample_lon in lons})
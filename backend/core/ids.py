@@ -0,0 +1,105 @@
+import os
+import random
+import string
+import threading
+
+from django.apps import apps
+from django.db import connection
+
+
+ALPHABET = string.ascii_uppercase + string.digits
+
+# Values fetched from the sequence per round trip; unused values are simply skipped
+BLOCK_SIZE = 100
+
+
+def encode(number, length, multiplier):
+    """
+    Map a sequence number to a fixed-length code.
+
+    ``number * multiplier mod 36**length`` is a bijection when the multiplier
+    shares no factor with 36, so distinct numbers give distinct codes while
+    consecutive ones don't look consecutive.
+    """
+    space = len(ALPHABET) ** length
+    value = (number * multiplier) % space
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+class CodeAllocator:
+    """
+    Hands out collision-free codes like ``EMP-7Q2K9D`` from a PostgreSQL sequence.
+
+    Sequence values are fetched in blocks and kept per process, so bulk
+    inserts allocate many codes with a single round trip. Each new block is
+    checked once against existing codes, which only matters for rows created
+    before codes were sequence-backed. Databases without sequences fall back
+    to random codes checked the same way.
+    """
+
+    def __init__(self, prefix, length, sequence, model, field, multiplier):
+        self.prefix = prefix
+        self.length = length
+        self.sequence = sequence
+        self.model = model
+        self.field = field
+        self.multiplier = multiplier
+        self._lock = threading.Lock()
+        self._pool = []
+        self._pid = None
+
+    def _code(self, number):
+        return f"{self.prefix}-{encode(number, self.length, self.multiplier)}"
+
+    def _random_code(self):
+        return f"{self.prefix}-{''.join(random.choices(ALPHABET, k=self.length))}"
+
+    def _without_taken(self, codes):
+        model = apps.get_model(self.model)
+        taken = set(model.objects.filter(**{f'{self.field}__in': codes}).values_list(self.field, flat=True))
+        return [code for code in codes if code not in taken]
+
+    def _fetch(self, count):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [self.sequence, count])
+            return [self._code(row[0]) for row in cursor.fetchall()]
+
+    def allocate(self, count=1):
+        """``count`` unused codes"""
+        if connection.vendor != 'postgresql':
+            return self._allocate_random(count)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked worker must not reuse codes cached by its parent
+                self._pool, self._pid = [], os.getpid()
+            while len(self._pool) < count:
+                self._pool.extend(self._without_taken(self._fetch(max(count - len(self._pool), BLOCK_SIZE))))
+            codes, self._pool = self._pool[:count], self._pool[count:]
+        return codes
+
+    def _allocate_random(self, count):
+        allocated = []
+        while len(allocated) < count:
+            candidates = list({self._random_code() for _ in range(count - len(allocated))} - set(allocated))
+            allocated.extend(self._without_taken(candidates))
+        return allocated
+
+
+def create_sequence(sequence):
+    """Migration operation creating a code sequence on PostgreSQL; a no-op elsewhere"""
+    from django.db import migrations
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
+
+    return migrations.RunPython(forwards, backwards)
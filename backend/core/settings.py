@@ -116,6 +116,9 @@ else:
 
 REDIS_URL = env('REDIS_URL', default='redis://127.0.0.1:6379')
 
+# Seconds to wait for Redis before treating it as unavailable, so an outage can't hang requests
+REDIS_SOCKET_TIMEOUT = env.float('REDIS_SOCKET_TIMEOUT', default=1.0)
+
 if REDIS_URL.startswith('rediss://'):
     CHANNEL_LAYERS = {
         'default': {
@@ -138,6 +141,21 @@ else:
         },
     }
 
+# Shared application cache (dashboard counters, reports, feeds); see core/cache.py
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'manpower',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'socket_connect_timeout': REDIS_SOCKET_TIMEOUT,
+            'socket_timeout': REDIS_SOCKET_TIMEOUT,
+            **({'ssl_cert_reqs': None} if REDIS_URL.startswith('rediss://') else {}),
+        },
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -272,6 +290,46 @@ SPECTACULAR_SETTINGS = {
 
 FRONTEND_URL = env('FRONTEND_URL', default='http://localhost:3000')
 
+# Weeks of dated shift occurrences kept materialized ahead of today
+SHIFT_OCCURRENCE_HORIZON_WEEKS = env.int('SHIFT_OCCURRENCE_HORIZON_WEEKS', default=8)
+
+# How long Idempotency-Key responses and punch receipts are kept for replay
+IDEMPOTENCY_KEY_TTL = timedelta(hours=env.int('IDEMPOTENCY_KEY_TTL_HOURS', default=24))
+
+# How long a request may hold its Idempotency-Key before a retry can take the key over
+IDEMPOTENCY_LEASE = timedelta(seconds=env.int('IDEMPOTENCY_LEASE_SECONDS', default=120))
+
+# Offline punch sync: how far ahead of server time a device clock may run, and how old a queued punch may be
+PUNCH_MAX_CLOCK_SKEW_SECONDS = env.int('PUNCH_MAX_CLOCK_SKEW_SECONDS', default=300)
+PUNCH_OFFLINE_WINDOW_HOURS = env.int('PUNCH_OFFLINE_WINDOW_HOURS', default=72)
+
+# Labor reports: weekly hours after which overtime is paid, its pay multiplier, and report cache lifetime
+OVERTIME_WEEKLY_HOURS = env.float('OVERTIME_WEEKLY_HOURS', default=40)
+OVERTIME_MULTIPLIER = env.float('OVERTIME_MULTIPLIER', default=1.5)
+LABOR_REPORT_CACHE_SECONDS = env.int('LABOR_REPORT_CACHE_SECONDS', default=3600)
+
+# Seconds a live roster stays in Redis before it is rebuilt from the open cards in the database
+LIVE_ROSTER_TTL_SECONDS = env.int('LIVE_ROSTER_TTL_SECONDS', default=3600)
+
+# Hours after clock-in when sweep_open_hours_cards closes a card that was never clocked out
+OPEN_CARD_MAX_HOURS = env.int('OPEN_CARD_MAX_HOURS', default=16)
+
+# Minutes between sweeps; roster, start-screen and clock-in requests run the sweep when one is due
+OPEN_CARD_SWEEP_MINUTES = env.int('OPEN_CARD_SWEEP_MINUTES', default=60)
+
+# Attendance: minutes late/early tolerated, and days re-summarized each day to pick up late edits
+ATTENDANCE_GRACE_MINUTES = env.int('ATTENDANCE_GRACE_MINUTES', default=5)
+ATTENDANCE_REFRESH_DAYS = env.int('ATTENDANCE_REFRESH_DAYS', default=7)
+
+# Seconds calendar apps may reuse an iCal feed before revalidating it with its ETag
+CALENDAR_FEED_MAX_AGE = env.int('CALENDAR_FEED_MAX_AGE', default=300)
+
+# Upper bound on how long business dashboard counters are cached; signals drop them on every change
+DASHBOARD_CACHE_SECONDS = env.int('DASHBOARD_CACHE_SECONDS', default=300)
+
+# How long a page of the job feed is served from cache; likes, comments and post edits invalidate it
+JOB_FEED_CACHE_SECONDS = env.int('JOB_FEED_CACHE_SECONDS', default=120)
+
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -307,6 +365,12 @@ CORS_ALLOW_HEADERS = [
     "x-csrftoken",
     "x-requested-with",
     "x-api-key",
+    "idempotency-key",
+]
+
+# Response headers the frontend may read
+CORS_EXPOSE_HEADERS = [
+    "idempotent-replayed",
 ]
 
 CORS_ALLOW_METHODS = [
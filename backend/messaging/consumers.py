@@ -211,3 +211,19 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def invitation_update(self, event):
             """Handle invitation count updates"""
             await self.send_counts()
+
+    async def roster_update(self, event):
+        """Forward live roster changes (clock in/out) to business owners"""
+        await self.send(text_data=json.dumps({
+            'type': 'roster_update',
+            'action': event['action'],
+            'entries': event['entries']
+        }))
+
+    async def hours_card_update(self, event):
+        """Tell a worker their hour cards were reviewed"""
+        await self.send(text_data=json.dumps({
+            'type': 'hours_card_update',
+            'action': event['action'],
+            'cards': event['cards']
+        }))
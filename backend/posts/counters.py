@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Now
+
+from .models import Comment, JobApplication, Like, Poke, Post
+
+
+def _count(model, related='post', **filters):
+    """Correlated subquery counting ``model`` rows for the outer post"""
+    rows = model.objects.filter(**{related: OuterRef('pk')}, **filters).order_by()
+    subquery = rows.values(related).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def actual_counts():
+    """Counter column -> expression recomputing it from the source table"""
+    return {
+        'like_count': _count(Like, like=True),
+        'poke_count': _count(Poke, poke=True),
+        'comment_count': _count(Comment),
+        'application_count': _count(JobApplication, related='job'),
+    }
+
+
+def adjust(post_id, **deltas):
+    """
+    Apply ``counter=delta`` changes to a post in a single UPDATE.
+
+    The arithmetic happens in the database, so concurrent requests can't
+    lose each other's increments; counters never go below zero. updated_at
+    is bumped too, so conditional GETs on the post see the new totals.
+    """
+    changes = {field: Greatest(F(field) + delta, 0) for field, delta in deltas.items() if delta}
+    if changes:
+        Post.objects.filter(pk=post_id).update(**changes, updated_at=Now())
+
+
+def toggle(model, flag, counter, user, post):
+    """
+    Flip ``user``'s like or poke on ``post`` and keep ``counter`` in step.
+
+    The reaction row is locked while it is flipped so two concurrent
+    toggles by the same user apply one after the other. Returns the
+    reaction and the post's new count.
+    """
+    with transaction.atomic():
+        reaction, created = model.objects.select_for_update().get_or_create(
+            user=user, post=post, defaults={flag: True}
+        )
+        if not created:
+            setattr(reaction, flag, not getattr(reaction, flag))
+            reaction.save(update_fields=[flag, 'updated_at'])
+        adjust(post.pk, **{counter: 1 if getattr(reaction, flag) else -1})
+        total = Post.objects.filter(pk=post.pk).values_list(counter, flat=True).get()
+    return reaction, total
+
+
+def reconcile(queryset=None, dry_run=False):
+    """
+    Reset counters that drifted from their source tables.
+
+    Returns the ids of the posts that were (or, with dry_run, would be) fixed.
+    """
+    queryset = Post.objects.all() if queryset is None else queryset
+    actual = actual_counts()
+    drifted = queryset.annotate(**{f'actual_{field}': expr for field, expr in actual.items()}).filter(
+        Q(*[~Q(**{field: F(f'actual_{field}')}) for field in actual], _connector=Q.OR)
+    )
+    post_ids = list(drifted.values_list('pk', flat=True))
+    if post_ids and not dry_run:
+        Post.objects.filter(pk__in=post_ids).update(**actual, updated_at=Now())
+    return post_ids
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import reconcile
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recount like, poke, comment and application totals on posts and fix any that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--post', help='Only check this post ID')
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted posts without fixing them')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options['post']:
+            posts = posts.filter(pk=options['post'])
+
+        post_ids = reconcile(posts, dry_run=options['dry_run'])
+        for post_id in post_ids:
+            self.stdout.write(f"Counters drifted on post {post_id}")
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(post_ids)} posts with drifted counters"))
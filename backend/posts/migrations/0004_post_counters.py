@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-16 23:28
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+
+    def count(model_name, related='post', **filters):
+        rows = apps.get_model('posts', model_name).objects.filter(**{related: OuterRef('pk')}, **filters)
+        subquery = rows.order_by().values(related).annotate(n=Count('pk')).values('n')
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    Post.objects.update(
+        like_count=count('Like', like=True),
+        poke_count=count('Poke', poke=True),
+        comment_count=count('Comment'),
+        application_count=count('JobApplication', related='job'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_jobapplication'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='poke_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -46,6 +46,11 @@ class Post(UUIDModel):
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
     view_count = models.PositiveIntegerField(default=0)
+    # Denormalized totals, kept in step by posts.counters
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    poke_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    application_count = models.PositiveIntegerField(default=0, editable=False)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -79,15 +84,15 @@ class Post(UUIDModel):
 
     @property
     def total_likes(self):
-        return self.likes.filter(like=True).count()
+        return self.like_count
 
     @property
     def total_pokes(self):
-        return self.pokes.filter(poke=True).count()
+        return self.poke_count
 
     @property
     def total_comments(self):
-        return self.comments.count()
+        return self.comment_count
 
     @property
     def is_expired(self):
@@ -98,7 +103,7 @@ class Post(UUIDModel):
 
     @property
     def total_applications(self):
-        return self.applications.count()
+        return self.application_count
 
 
 class Like(UUIDModel):
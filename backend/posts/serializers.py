@@ -84,6 +84,24 @@ class PostListSerializer(serializers.ModelSerializer):
         return obj.total_comments
 
 
+class NearbyJobSerializer(PostListSerializer):
+    """Job post with the poster's nearest business; context['nearest'] maps owner id to (business, distance)"""
+    business = serializers.SerializerMethodField()
+    distance_meters = serializers.SerializerMethodField()
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ['expires_at', 'business', 'distance_meters']
+
+    def get_business(self, obj):
+        business, _ = self.context['nearest'][obj.user_id]
+        return {'id': str(business.id), 'name': business.name, 'city': business.city}
+
+    @extend_schema_field(serializers.IntegerField)
+    def get_distance_meters(self, obj) -> int:
+        _, distance = self.context['nearest'][obj.user_id]
+        return round(distance)
+
+
 class CommentSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.full_name', read_only=True)
     replies_count = serializers.SerializerMethodField()
@@ -0,0 +1,9 @@
+from core.cache import Namespace, invalidate_on
+from .models import Comment, Like, Post
+
+
+# Cached pages of the post and job feed
+POST_FEEDS = Namespace('post-feed')
+
+# Detail views bump view_count on every read; the feed doesn't show it
+invalidate_on(POST_FEEDS, Post, Like, Comment, ignore=('view_count',))
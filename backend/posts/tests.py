@@ -1,3 +1,67 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from . import counters
+from .models import Comment, Like, Post
+
+
+class PostCounterTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='x', account_type='BUSINESS')
+        self.worker = User.objects.create_user(email='worker@example.com', password='x')
+        self.post = Post.objects.create(user=self.owner, post_type='JOB', title='Barista', description='Coffee')
+        self.client = APIClient()
+        self.client.force_authenticate(self.worker)
+
+    def counts(self):
+        self.post.refresh_from_db()
+        return self.post.like_count, self.post.comment_count
+
+    def comment(self, text, parent=None):
+        data = {'post': str(self.post.id), 'comment': text}
+        if parent:
+            data['parent'] = str(parent.id)
+        response = self.client.post('/posts/comments/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Comment.objects.get(id=response.data['id'])
+
+    def test_toggling_a_like_twice_returns_to_zero(self):
+        updated_at = self.post.updated_at
+        self.assertEqual(self.client.post(f'/posts/{self.post.id}/toggle_like/').status_code, 200)
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertGreater(self.post.updated_at, updated_at)
+
+        self.client.post(f'/posts/{self.post.id}/toggle_like/')
+        self.assertEqual(self.counts(), (0, 0))
+        self.assertEqual(Like.objects.filter(post=self.post, like=True).count(), 0)
+
+    def test_deleting_a_comment_removes_its_replies_from_the_count(self):
+        parent = self.comment('First')
+        self.comment('Reply', parent=parent)
+        self.comment('Another reply', parent=parent)
+        self.comment('Second')
+        self.assertEqual(self.counts(), (0, 4))
+
+        self.assertEqual(self.client.delete(f'/posts/comments/{parent.id}/').status_code, 204)
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_counters_never_go_below_zero(self):
+        counters.adjust(self.post.pk, like_count=-3, comment_count=-1)
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_reconcile_restores_drifted_counters(self):
+        Like.objects.create(user=self.worker, post=self.post, like=True)
+        Comment.objects.create(user=self.worker, post=self.post, comment='Hi')
+        Post.objects.filter(pk=self.post.pk).update(like_count=7, comment_count=0)
+
+        out = StringIO()
+        call_command('reconcile_post_counters', '--dry-run', stdout=out)
+        self.assertIn('Found 1 posts', out.getvalue())
+        self.assertEqual(self.counts(), (7, 0))
 
-# Create your tests here.
+        call_command('reconcile_post_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), (1, 1))
@@ -9,6 +9,7 @@ urlpatterns = [
     path('<uuid:pk>/', views.PostRetrieveUpdateDestroyView.as_view(), name='post-detail'),
     path('comments/', views.CommentListCreateView.as_view(), name='comment-list'),
     path('comments/<uuid:pk>/', views.CommentRetrieveUpdateDestroyView.as_view(), name='comment-detail'),
+    path('jobs/nearby/', views.NearbyJobListView.as_view(), name='job-nearby'),
     path('jobs/<uuid:job_id>/apply/', views.JobApplicationCreateView.as_view(), name='job-apply'),
 
     # Likes and Pokes
@@ -10,15 +10,22 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.openapi import OpenApiResponse
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.conf import settings
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from core.cache import cache_response
+from core.conditional import ConditionalGetMixin
+from . import counters
+from .signals import POST_FEEDS
 from .models import JobApplication, Post, Like, Poke, Comment
 from .serializers import (
     ApplicationStatusUpdateSerializer, JobApplicationListSerializer, PostSerializer, PostListSerializer, CommentSerializer,
-    LikeSerializer, PokeSerializer, CommentSerializer, JobApplicationSerializer
+    LikeSerializer, PokeSerializer, CommentSerializer, JobApplicationSerializer, NearbyJobSerializer
 )
 from rest_framework.views import APIView
 from rest_framework.generics import UpdateAPIView
 
-class PostListCreateView(ListCreateAPIView):
+class PostListCreateView(ConditionalGetMixin, ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['post_type', 'priority', 'location', 'user__account_type', 'user']
@@ -33,7 +40,7 @@ class PostListCreateView(ListCreateAPIView):
         - WORKER users: See all active job posts (to browse/apply)
         """
         user = self.request.user
-        queryset = Post.objects.filter(is_active=True)
+        queryset = Post.objects.filter(is_active=True).select_related('user')
 
         if user.account_type == 'BUSINESS':
             queryset = queryset.filter(user=user)
@@ -48,6 +55,9 @@ class PostListCreateView(ListCreateAPIView):
             return PostListSerializer
         return PostSerializer
 
+    # The author's name and email are rendered with each post
+    validator_related = ('user__updated_at',)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user, created_by=self.request.user)
 
@@ -60,6 +70,14 @@ class PostListCreateView(ListCreateAPIView):
         ],
         responses={200: PostListSerializer(many=True)}
     )
+    @method_decorator(cache_response(
+        POST_FEEDS,
+        timeout=getattr(settings, 'JOB_FEED_CACHE_SECONDS', 120),
+        # Business users see their own posts; every other account of a type sees the same feed
+        vary=lambda request: (request.user.pk,) if request.user.account_type == 'BUSINESS' else (request.user.account_type,),
+        # View counts don't invalidate the cache, so pages ordered by them would go stale
+        bypass=lambda request: 'view_count' in request.query_params.get('ordering', ''),
+    ))
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
@@ -73,6 +91,53 @@ class PostListCreateView(ListCreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
+class NearbyJobListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Nearby jobs",
+        description="Active job posts of verified businesses ranked by distance from a point",
+        parameters=[
+            OpenApiParameter('lat', float, required=True, description='Latitude'),
+            OpenApiParameter('lng', float, required=True, description='Longitude'),
+            OpenApiParameter('radius_km', float, description='Search radius in km (default 10, max 100)'),
+            OpenApiParameter('limit', int, description='Maximum results (default 50, max 200)'),
+        ],
+        responses={200: NearbyJobSerializer(many=True)}
+    )
+    def get(self, request):
+        """Jobs belong to the owner's account, so each is placed at the owner's nearest business"""
+        from django.db.models import Q
+        from django.utils import timezone as django_timezone
+        from business.models import Business
+        from business.nearby import nearby_businesses, parse_limit, parse_point
+
+        try:
+            lat, lon, radius = parse_point(request.query_params)
+        except (KeyError, ValueError):
+            return Response(
+                {'error': "'lat' and 'lng' must be valid coordinates and 'radius_km' a positive number"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        nearest = {}
+        for business_id, owner_id, distance in nearby_businesses(lat, lon, radius):
+            nearest.setdefault(owner_id, (business_id, distance))
+        businesses = Business.objects.in_bulk([business_id for business_id, _ in nearest.values()])
+        nearest = {owner_id: (businesses[business_id], distance) for owner_id, (business_id, distance) in nearest.items()}
+
+        jobs = list(
+            Post.objects.filter(user_id__in=nearest.keys(), post_type='JOB', is_active=True)
+            .filter(Q(expires_at__isnull=True) | Q(expires_at__gt=django_timezone.now()))
+            .select_related('user')
+        )
+        jobs.sort(key=lambda job: (nearest[job.user_id][1], -job.created_at.timestamp()))
+        jobs = jobs[:parse_limit(request.query_params)]
+
+        serializer = NearbyJobSerializer(jobs, many=True, context={'request': request, 'nearest': nearest})
+        return Response({'count': len(jobs), 'radius_km': radius / 1000, 'results': serializer.data})
+
+
 class PostRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     queryset = Post.objects.filter(is_active=True)
     serializer_class = PostSerializer
@@ -139,18 +204,11 @@ class PostRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     @action(detail=True, methods=['post'])
     def toggle_like(self, request, pk=None):
         post = self.get_object()
-        like, created = Like.objects.get_or_create(
-            user=request.user,
-            post=post,
-            defaults={'like': True}
-        )
-        if not created:
-            like.like = not like.like
-            like.save()
+        like, total = counters.toggle(Like, 'like', 'like_count', request.user, post)
 
         return Response({
             'liked': like.like,
-            'total_likes': post.total_likes
+            'total_likes': total
         })
 
     @extend_schema(
@@ -161,18 +219,11 @@ class PostRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     @action(detail=True, methods=['post'])
     def toggle_poke(self, request, pk=None):
         post = self.get_object()
-        poke, created = Poke.objects.get_or_create(
-            user=request.user,
-            post=post,
-            defaults={'poke': True}
-        )
-        if not created:
-            poke.poke = not poke.poke
-            poke.save()
+        poke, total = counters.toggle(Poke, 'poke', 'poke_count', request.user, post)
 
         return Response({
             'poked': poke.poke,
-            'total_pokes': post.total_pokes
+            'total_pokes': total
         })
 
 
@@ -187,7 +238,9 @@ class CommentListCreateView(ListCreateAPIView):
         return Comment.objects.filter(post__is_active=True)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            comment = serializer.save(user=self.request.user)
+            counters.adjust(comment.post_id, comment_count=1)
 
     @extend_schema(
         summary="List comments",
@@ -226,7 +279,10 @@ class CommentRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         if instance.user != self.request.user:
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You can only delete your own comments")
-        instance.delete()
+        with transaction.atomic():
+            # Replies are deleted with their parent and count too
+            _, deleted = instance.delete()
+            counters.adjust(instance.post_id, comment_count=-deleted.get(Comment._meta.label, 0))
 
     @extend_schema(
         summary="Get comment",
@@ -270,7 +326,9 @@ class JobApplicationCreateView(CreateAPIView):
             raise ValidationError("You have already applied for this job")
 
         # Save the application
-        application = serializer.save(applicant=self.request.user, job=job)
+        with transaction.atomic():
+            application = serializer.save(applicant=self.request.user, job=job)
+            counters.adjust(job.pk, application_count=1)
 
         # CREATE INITIAL CONVERSATION - ADD THIS:
         self.create_application_submission_message(application)
@@ -296,20 +354,12 @@ class ToggleLikeView(APIView):
 
     def post(self, request, pk):
         post = get_object_or_404(Post, pk=pk)
-        like, created = Like.objects.get_or_create(
-            user=request.user,
-            post=post,
-            defaults={'like': True}
-        )
-
-        if not created:
-            like.like = not like.like
-            like.save()
+        like, total = counters.toggle(Like, 'like', 'like_count', request.user, post)
 
         serializer = LikeSerializer(like)
         return Response({
             'liked': like.like,
-            'total_likes': post.total_likes,
+            'total_likes': total,
             'data': serializer.data
         }, status=status.HTTP_200_OK)
 
@@ -318,20 +368,12 @@ class TogglePokeView(APIView):
 
     def post(self, request, pk):
         post = get_object_or_404(Post, pk=pk)
-        poke, created = Poke.objects.get_or_create(
-            user=request.user,
-            post=post,
-            defaults={'poke': True}
-        )
-
-        if not created:
-            poke.poke = not poke.poke
-            poke.save()
+        poke, total = counters.toggle(Poke, 'poke', 'poke_count', request.user, post)
 
         serializer = PokeSerializer(poke)
         return Response({
             'poked': poke.poke,
-            'total_pokes': post.total_pokes,
+            'total_pokes': total,
             'data': serializer.data
         }, status=status.HTTP_200_OK)
 
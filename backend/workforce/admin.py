@@ -1,6 +1,7 @@
 from datetime import timezone
 from django.contrib import admin
-from .models import BusinessStaff, Shift, HoursCard, StaffInvitation
+from .models import BusinessStaff, WorkSite, Shift, HoursCard, HoursRollup, StaffInvitation
+from .rollups import refresh_for_cards
 
 
 @admin.register(BusinessStaff)
@@ -12,6 +13,14 @@ class BusinessStaffAdmin(admin.ModelAdmin):
     ordering = ['-hire_date']
 
 
+@admin.register(WorkSite)
+class WorkSiteAdmin(admin.ModelAdmin):
+    list_display = ['name', 'business', 'latitude', 'longitude', 'radius_meters', 'is_active']
+    list_filter = ['is_active', 'business']
+    search_fields = ['name', 'address', 'business__name']
+    readonly_fields = ['created_at', 'updated_at']
+
+
 @admin.register(Shift)
 class ShiftAdmin(admin.ModelAdmin):
     list_display = ['name', 'staff', 'business', 'shift_type', 'day_of_week', 'start_time', 'end_time', 'is_active']
@@ -77,6 +86,7 @@ class HoursCardAdmin(admin.ModelAdmin):
             approved_by=request.user,
             approved_at=timezone.now()
         )
+        refresh_for_cards(queryset)
         self.message_user(request, f'{updated} hour cards approved successfully.')
     approve_hours.short_description = "Approve selected hour cards"
 
@@ -86,6 +96,7 @@ class HoursCardAdmin(admin.ModelAdmin):
             approved_by=request.user,
             approved_at=timezone.now()
         )
+        refresh_for_cards(queryset)
         self.message_user(request, f'{updated} hour cards rejected.')
     reject_hours.short_description = "Reject selected hour cards"
 
@@ -94,6 +105,15 @@ class HoursCardAdmin(admin.ModelAdmin):
     total_hours_decimal.short_description = "Total Hours"
 
 
+@admin.register(HoursRollup)
+class HoursRollupAdmin(admin.ModelAdmin):
+    list_display = ['staff', 'business', 'period', 'period_start', 'worked_seconds', 'approved_seconds', 'card_count']
+    list_filter = ['period', 'business']
+    search_fields = ['staff__name', 'business__name']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['-period_start']
+
+
 @admin.register(StaffInvitation)
 class StaffInvitationAdmin(admin.ModelAdmin):
     list_display = ['worker', 'business', 'status', 'created_at']
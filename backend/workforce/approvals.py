@@ -0,0 +1,91 @@
+import logging
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+
+from .models import HoursCard
+from .rollups import refresh_for_cards
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_REVIEW = 1000
+
+REVIEW_STATUSES = ('APPROVED', 'REJECTED')
+
+
+def _notify_workers(cards, approval_status):
+    """One channel-layer event per worker listing all of their reviewed cards"""
+    by_worker = defaultdict(list)
+    for card in cards:
+        if card['staff__user_id']:
+            by_worker[card['staff__user_id']].append({
+                'hours_card_id': str(card['id']),
+                'date': card['date'].isoformat(),
+                'status': approval_status,
+            })
+
+    channel_layer = get_channel_layer()
+    for user_id, worker_cards in by_worker.items():
+        try:
+            async_to_sync(channel_layer.group_send)(
+                f"user_{user_id}",
+                {
+                    'type': 'hours_card_update',
+                    'action': approval_status.lower(),
+                    'cards': worker_cards,
+                }
+            )
+        except Exception as e:
+            logger.warning("Failed to notify worker of reviewed hours cards: %s", e)
+
+
+def bulk_review(owner, queryset, approval_status, rejection_reason='', requested_ids=None):
+    """
+    Approve or reject many signed hours cards with a single UPDATE.
+
+    ``queryset`` selects the candidate cards; only those belonging to the
+    owner's businesses are considered. Candidates are locked, signed ones are
+    updated in one statement and every card gets an outcome.
+    """
+    now = timezone.now()
+    outcomes = {}
+    if requested_ids is not None:
+        outcomes = {str(card_id): 'not_found' for card_id in requested_ids}
+
+    with transaction.atomic():
+        cards = list(
+            queryset.filter(staff__business__user=owner)
+            .select_for_update(of=('self',))
+            .values('id', 'staff_id', 'staff__user_id', 'date', 'status', 'worker_signed_at')
+        )
+        reviewable = [card for card in cards if card['status'] == 'SIGNED' and card['worker_signed_at']]
+        reviewable_ids = {card['id'] for card in reviewable}
+
+        update = {
+            'status': approval_status,
+            'approved_by': owner,
+            'approved_at': now,
+            'updated_at': now,
+        }
+        if approval_status == 'REJECTED':
+            update['rejection_reason'] = rejection_reason
+        HoursCard.objects.filter(
+            id__in=reviewable_ids,
+            status='SIGNED',
+        ).update(**update)
+
+    for card in cards:
+        if card['id'] in reviewable_ids:
+            outcomes[str(card['id'])] = approval_status.lower()
+        elif card['status'] == 'PENDING' or not card['worker_signed_at']:
+            outcomes[str(card['id'])] = 'not_signed'
+        else:
+            outcomes[str(card['id'])] = f"already_{card['status'].lower()}"
+
+    refresh_for_cards([HoursCard(staff_id=card['staff_id'], date=card['date']) for card in reviewable])
+    _notify_workers(reviewable, approval_status)
+
+    return [{'hours_card_id': card_id, 'outcome': outcome} for card_id, outcome in outcomes.items()]
@@ -0,0 +1,202 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from core.cache import claim_period
+from .models import AttendanceSummary, HoursCard, ShiftOccurrence
+from .schedule import ensure_horizon
+
+
+COUNTERS = ('scheduled', 'attended', 'late', 'no_show', 'left_early', 'late_seconds', 'early_seconds')
+
+
+def grace():
+    """Minutes a worker may arrive late or leave early before it counts"""
+    return timedelta(minutes=getattr(settings, 'ATTENDANCE_GRACE_MINUTES', 5))
+
+
+def scheduled_days(business_ids, start, end):
+    """
+    One row per staff-day with a schedule between start and end (inclusive).
+
+    Occurrences are grouped per staff and day in SQL (first start, last end,
+    shift count) and the day's hours card is joined with correlated
+    subqueries, so the whole range is a single query.
+    """
+    ensure_horizon()
+    cards = HoursCard.objects.filter(staff_id=OuterRef('staff_id'), date=OuterRef('date'))
+    return (
+        ShiftOccurrence.objects.filter(business_id__in=business_ids, date__gte=start, date__lte=end)
+        .values('business_id', 'staff_id', 'date')
+        .annotate(
+            scheduled_shifts=Count('id'),
+            scheduled_start=Min('start'),
+            scheduled_end=Max('end'),
+            clock_in_datetime=Subquery(cards.values('clock_in_datetime')[:1]),
+            clock_out_datetime=Subquery(cards.values('clock_out_datetime')[:1]),
+        )
+        .order_by('date', 'staff_id')
+    )
+
+
+def classify(row, now=None):
+    """AttendanceSummary (unsaved) for a scheduled_days row"""
+    now = now or timezone.now()
+    clock_in, clock_out = row['clock_in_datetime'], row['clock_out_datetime']
+    start, end = row['scheduled_start'], row['scheduled_end']
+
+    late_seconds = int((clock_in - start).total_seconds()) if clock_in and clock_in > start + grace() else 0
+    early_seconds = int((end - clock_out).total_seconds()) if clock_out and clock_out < end - grace() else 0
+    return AttendanceSummary(
+        business_id=row['business_id'],
+        staff_id=row['staff_id'],
+        date=row['date'],
+        scheduled_shifts=row['scheduled_shifts'],
+        scheduled_start=start,
+        scheduled_end=end,
+        clock_in_datetime=clock_in,
+        clock_out_datetime=clock_out,
+        is_late=late_seconds > 0,
+        is_no_show=clock_in is None and end <= now,
+        left_early=early_seconds > 0,
+        late_seconds=late_seconds,
+        early_seconds=early_seconds,
+    )
+
+
+def refresh_summaries(business_ids, start, end):
+    """Recompute stored summaries for the businesses between start and end; returns rows written"""
+    now = timezone.now()
+    summaries = [classify(row, now) for row in scheduled_days(business_ids, start, end).iterator(chunk_size=2000)]
+    with transaction.atomic():
+        AttendanceSummary.objects.filter(business_id__in=business_ids, date__gte=start, date__lte=end).delete()
+        AttendanceSummary.objects.bulk_create(summaries, batch_size=1000)
+    return len(summaries)
+
+
+def refresh_all(since=None, business_ids=None, today=None):
+    """
+    End-of-day refresh: recompute each business's summaries through yesterday.
+
+    Starts ATTENDANCE_REFRESH_DAYS before the business's last stored day so
+    late edits to recent cards are picked up, or from its first scheduled
+    day if it has no summaries yet. Returns rows written.
+    """
+    yesterday = (today or timezone.localdate()) - timedelta(days=1)
+    overlap = timedelta(days=getattr(settings, 'ATTENDANCE_REFRESH_DAYS', 7))
+
+    occurrences = ShiftOccurrence.objects.filter(date__lte=yesterday)
+    summaries = AttendanceSummary.objects.all()
+    if business_ids:
+        occurrences = occurrences.filter(business_id__in=business_ids)
+        summaries = summaries.filter(business_id__in=business_ids)
+    first_days = dict(occurrences.values('business_id').annotate(first=Min('date')).values_list('business_id', 'first'))
+    last_days = dict(summaries.values('business_id').annotate(last=Max('date')).values_list('business_id', 'last'))
+
+    written = 0
+    for business_id, first_day in first_days.items():
+        start = since or (last_days[business_id] - overlap if business_id in last_days else first_day)
+        written += refresh_summaries([business_id], max(start, first_day), yesterday)
+    return written
+
+
+def summarized_through(business):
+    """Last day with stored summaries; later days are computed live"""
+    return AttendanceSummary.objects.filter(business=business).aggregate(last=Max('date'))['last']
+
+
+def _stored_counters(summaries, group_by):
+    return summaries.values(*group_by).annotate(
+        scheduled=Count('id'),
+        attended=Count('id', filter=Q(clock_in_datetime__isnull=False)),
+        late=Count('id', filter=Q(is_late=True)),
+        no_show=Count('id', filter=Q(is_no_show=True)),
+        left_early=Count('id', filter=Q(left_early=True)),
+        late_seconds=Sum('late_seconds'),
+        early_seconds=Sum('early_seconds'),
+    ).order_by()
+
+
+def _add(target, summary):
+    target['scheduled'] += 1
+    target['attended'] += summary.clock_in_datetime is not None
+    target['late'] += summary.is_late
+    target['no_show'] += summary.is_no_show
+    target['left_early'] += summary.left_early
+    target['late_seconds'] += summary.late_seconds
+    target['early_seconds'] += summary.early_seconds
+
+
+def _format(counters):
+    scheduled = counters['scheduled']
+    return {
+        'scheduled': scheduled,
+        'attended': counters['attended'],
+        'late': counters['late'],
+        'no_shows': counters['no_show'],
+        'left_early': counters['left_early'],
+        'average_late_minutes': round(counters['late_seconds'] / 60 / counters['late'], 1) if counters['late'] else 0,
+        'average_early_minutes': (
+            round(counters['early_seconds'] / 60 / counters['left_early'], 1) if counters['left_early'] else 0
+        ),
+        'attendance_rate': round(counters['attended'] / scheduled, 3) if scheduled else None,
+    }
+
+
+def attendance_report(business, start, end):
+    """
+    Lateness, no-shows and early departures for a business between two dates.
+
+    Days up to the last refresh are aggregated from stored summaries in SQL;
+    any later days (normally just today) are computed live. The first report
+    for a business each day refreshes its summaries through yesterday.
+    """
+    today = timezone.localdate()
+    if claim_period(f'attendance-refresh:{business.id}', today, 24 * 3600):
+        refresh_all(business_ids=[business.id], today=today)
+
+    by_day = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    by_staff = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    through = summarized_through(business)
+    if through and through >= start:
+        stored = AttendanceSummary.objects.filter(business=business, date__gte=start, date__lte=min(end, through))
+        for row in _stored_counters(stored, ['date']):
+            by_day[row['date']] = {key: row[key] or 0 for key in COUNTERS}
+        for row in _stored_counters(stored, ['staff_id']):
+            by_staff[row['staff_id']] = {key: row[key] or 0 for key in COUNTERS}
+
+    live_start = max(start, through + timedelta(days=1)) if through else start
+    if live_start <= end:
+        now = timezone.now()
+        for row in scheduled_days([business.id], live_start, end):
+            summary = classify(row, now)
+            _add(by_day[summary.date], summary)
+            _add(by_staff[summary.staff_id], summary)
+
+    totals = dict.fromkeys(COUNTERS, 0)
+    for counters in by_day.values():
+        for key in COUNTERS:
+            totals[key] += counters[key]
+
+    names = dict(business.staff_members.filter(id__in=by_staff.keys()).values_list('id', 'name'))
+    staff_rows = [
+        {'staff': str(staff_id), 'name': names.get(staff_id), **_format(counters)}
+        for staff_id, counters in by_staff.items()
+    ]
+    staff_rows.sort(key=lambda row: (-row['no_shows'], -row['late'], row['name'] or ''))
+
+    return {
+        'business': str(business.id),
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'grace_minutes': int(grace().total_seconds() // 60),
+        'summarized_through': through.isoformat() if through else None,
+        'totals': _format(totals),
+        'by_day': [{'date': day.isoformat(), **_format(by_day[day])} for day in sorted(by_day)],
+        'by_staff': staff_rows,
+    }
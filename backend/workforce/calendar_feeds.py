@@ -0,0 +1,195 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import BusinessStaff, CalendarFeedKey, Shift
+from .schedule import DAY_INDEX
+
+
+FEED_KINDS = ('staff', 'business')
+TOKEN_SALT = 'workforce.calendar-feed'
+
+RRULE_DAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+
+def _model(kind):
+    from business.models import Business
+    return BusinessStaff if kind == 'staff' else Business
+
+
+def _signer(key):
+    return signing.Signer(salt=f"{TOKEN_SALT}:{key}")
+
+
+def feed_key(kind, object_id):
+    """The feed's secret, generated on first use"""
+    return CalendarFeedKey.objects.get_or_create(
+        kind=kind, object_id=object_id, defaults={'key': secrets.token_hex(16)}
+    )[0].key
+
+
+def rotate_feed_key(kind, object_id):
+    """Revoke every feed URL issued for the staff member or business"""
+    CalendarFeedKey.objects.update_or_create(
+        kind=kind, object_id=object_id, defaults={'key': secrets.token_hex(16)}
+    )
+
+
+def feed_token(kind, object_id):
+    """
+    Signed token identifying a staff member's or a business's feed.
+
+    The signature is salted with the feed's key, so rotating the key
+    revokes the token; the key itself never appears in it.
+    """
+    return _signer(feed_key(kind, object_id)).sign(f"{kind}.{object_id}")
+
+
+def read_token(token):
+    """
+    (kind, owner) for a feed token, the owner being the BusinessStaff or Business.
+
+    Raises signing.BadSignature unless the token was issued for the feed's
+    current key and the staff member (or business) is still active.
+    """
+    kind, _, object_id = token.rpartition(':')[0].partition('.')
+    if kind not in FEED_KINDS or not object_id:
+        raise signing.BadSignature('Unknown feed')
+    try:
+        key = CalendarFeedKey.objects.filter(kind=kind, object_id=object_id).values_list('key', flat=True).first()
+    except ValidationError:
+        key = None
+    if key is None:
+        raise signing.BadSignature('Unknown feed')
+    _signer(key).unsign(token)
+
+    if kind == 'staff':
+        owner = BusinessStaff.objects.filter(id=object_id, status='ACTIVE').select_related('business').first()
+    else:
+        owner = _model(kind).objects.filter(id=object_id, is_active=True).first()
+    if owner is None:
+        raise signing.BadSignature('Feed is no longer active')
+    return kind, owner
+
+
+def feed_shifts(kind, object_id):
+    shifts = Shift.objects.filter(is_active=True)
+    if kind == 'staff':
+        return shifts.filter(staff_id=object_id)
+    return shifts.filter(business_id=object_id)
+
+
+def feed_version(kind, owner):
+    """
+    (etag, last_modified) for a feed from a single aggregate over its shifts.
+
+    The feed also renders staff and business names, so their update times
+    count too. The shift count is part of the ETag so deleting or
+    deactivating a shift changes it even when no remaining shift was updated.
+    """
+    state = feed_shifts(kind, owner.pk).aggregate(
+        count=Count('id'),
+        shifts=Max('updated_at'),
+        staff=Max('staff__updated_at'),
+        businesses=Max('business__updated_at'),
+    )
+    # The owner names an empty calendar, so it counts even without shifts
+    times = [state['shifts'], state['staff'], state['businesses'], owner.updated_at]
+    if kind == 'staff':
+        times.append(owner.business.updated_at)
+    last = max(moment for moment in times if moment)
+    stamps = '|'.join(moment.isoformat() if moment else '' for moment in times)
+    digest = hashlib.sha256(f"{kind}|{owner.pk}|{state['count']}|{stamps}".encode()).hexdigest()
+    return f'"{digest[:32]}"', last
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Split a content line into 75-octet chunks as RFC 5545 requires"""
+    data = line.encode()
+    if len(data) <= 75:
+        return line
+    chunks, start = [], 0
+    while start < len(data):
+        end = min(start + (75 if not chunks else 74), len(data))
+        # Don't split a multi-byte character
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        chunks.append(data[start:end].decode())
+        start = end
+    return '\r\n '.join(chunks)
+
+
+def _utc(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _duration(shift):
+    day = timezone.localdate()
+    seconds = (datetime.combine(day, shift.end_time) - datetime.combine(day, shift.start_time)).total_seconds()
+    if seconds <= 0:
+        seconds += 24 * 3600
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"PT{hours}H{minutes}M"
+
+
+def _first_day(shift):
+    """First date on or after the shift was created that falls on its weekday"""
+    created = timezone.localtime(shift.created_at).date()
+    return created + timedelta(days=(DAY_INDEX[shift.day_of_week] - created.weekday()) % 7)
+
+
+def _event(shift, tzid):
+    details = [f"{shift.staff.name} ({shift.staff.job_title})", shift.get_shift_type_display()]
+    if shift.break_duration:
+        details.append(f"Break: {int(shift.break_duration.total_seconds() // 60)} min")
+    start = datetime.combine(_first_day(shift), shift.start_time)
+    description = _escape('\n'.join(details))
+    return [
+        'BEGIN:VEVENT',
+        f"UID:shift-{shift.id}",
+        f"DTSTAMP:{_utc(shift.updated_at)}",
+        f"LAST-MODIFIED:{_utc(shift.updated_at)}",
+        f"DTSTART;TZID={tzid}:{start:%Y%m%dT%H%M%S}",
+        f"DURATION:{_duration(shift)}",
+        f"RRULE:FREQ=WEEKLY;BYDAY={RRULE_DAYS[DAY_INDEX[shift.day_of_week]]}",
+        f"SUMMARY:{_escape(f'{shift.name} - {shift.business.name}')}",
+        f"DESCRIPTION:{description}",
+        f"LOCATION:{_escape(shift.business.address)}",
+        'END:VEVENT',
+    ]
+
+
+def _calendar_name(kind, owner):
+    return f"{owner.name} - {owner.business.name}" if kind == 'staff' else owner.name
+
+
+def build_feed(kind, owner):
+    """iCalendar document with one weekly recurring event per active shift"""
+    shifts = list(
+        feed_shifts(kind, owner.pk).select_related('staff', 'business').order_by('start_time')
+    )
+    tzid = timezone.get_current_timezone_name()
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Shataya Global//Manpower Shifts//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f"X-WR-CALNAME:{_escape(_calendar_name(kind, owner))}",
+        f"X-WR-TIMEZONE:{tzid}",
+    ]
+    for shift in shifts:
+        lines.extend(_event(shift, tzid))
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
@@ -0,0 +1,119 @@
+import csv
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from .models import HoursCard
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+TIMESHEET_HEADER = [
+    'Date', 'Staff ID', 'Name', 'Department', 'Job Title',
+    'Clock In', 'Clock Out', 'Break Start', 'Break End',
+    'Hours', 'Hourly Rate', 'Cost', 'Status', 'Approved At',
+]
+
+CENTS = Decimal('0.01')
+
+
+class Echo:
+    """File-like object whose write() returns the value, so csv.writer can feed a generator"""
+    def write(self, value):
+        return value
+
+
+def timesheet_queryset(start, end, business_ids=None, owner=None, status='APPROVED'):
+    """Hours cards dated between start and end (inclusive), oldest first"""
+    cards = HoursCard.objects.filter(date__gte=start, date__lte=end).select_related('staff').only(
+        'date', 'clock_in', 'clock_out', 'clock_in_datetime', 'clock_out_datetime',
+        'break_start', 'break_end', 'worked_seconds', 'status', 'approved_at',
+        'staff__staff_id', 'staff__name', 'staff__department', 'staff__job_title', 'staff__hourly_rate',
+    )
+    if owner is not None:
+        cards = cards.filter(staff__business__user=owner)
+    if business_ids:
+        cards = cards.filter(staff__business_id__in=business_ids)
+    if status:
+        cards = cards.filter(status=status)
+    return cards.order_by('date', 'staff__name', 'id')
+
+
+def _time(card, field):
+    value = getattr(card, f'{field}_datetime')
+    if value:
+        return value.isoformat()
+    value = getattr(card, field)
+    return value.strftime('%H:%M') if value else ''
+
+
+def timesheet_row(card):
+    hours = (Decimal(card.worked_seconds) / 3600).quantize(CENTS) if card.worked_seconds is not None else None
+    rate = card.staff.hourly_rate
+    cost = (hours * rate).quantize(CENTS) if hours is not None and rate is not None else None
+    return [
+        card.date.isoformat(),
+        card.staff.staff_id,
+        card.staff.name,
+        card.staff.department,
+        card.staff.job_title,
+        _time(card, 'clock_in'),
+        _time(card, 'clock_out'),
+        card.break_start.strftime('%H:%M') if card.break_start else '',
+        card.break_end.strftime('%H:%M') if card.break_end else '',
+        hours if hours is not None else '',
+        rate if rate is not None else '',
+        cost if cost is not None else '',
+        card.status,
+        card.approved_at.isoformat() if card.approved_at else '',
+    ]
+
+
+def timesheet_rows(cards):
+    """Header plus one row per card, read from the database in chunks"""
+    yield TIMESHEET_HEADER
+    for card in cards.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield timesheet_row(card)
+
+
+def stream_csv(rows):
+    """Encode rows as CSV lines one at a time"""
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_blocks(rows):
+    """Encode rows as CSV text, one block per database chunk"""
+    writer = csv.writer(Echo())
+    rows = iter(rows)
+    while block := list(islice(rows, EXPORT_CHUNK_SIZE)):
+        yield ''.join(writer.writerow(row) for row in block)
+
+
+async def astream_csv(rows):
+    """
+    Async CSV stream for ASGI servers.
+
+    Django consumes a sync iterator under ASGI by collecting it into a list
+    first, so each block is pulled on the sync thread instead, where the
+    database cursor of the row iterator lives.
+    """
+    blocks = csv_blocks(rows)
+    next_block = sync_to_async(lambda: next(blocks, None), thread_sensitive=True)
+    while (block := await next_block()) is not None:
+        yield block
+
+
+def export_filename(start, end):
+    return f"timesheets_{start:%Y%m%d}_{end:%Y%m%d}.csv"
+
+
+def parse_period(start, end):
+    """Parse YYYY-MM-DD bounds; raises ValueError on bad or reversed dates"""
+    start, end = date.fromisoformat(start), date.fromisoformat(end)
+    if end < start:
+        raise ValueError("'to' must be on or after 'from'")
+    return start, end
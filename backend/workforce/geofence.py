@@ -0,0 +1,132 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from core.geo import haversine_matrix
+from .models import WorkSite
+
+
+NOT_CONFIGURED = 'Workplace location not configured. Please contact your manager.'
+
+
+@dataclass
+class Fence:
+    """A geofence to check against: a WorkSite, or the business's own workplace point"""
+    site: Optional[WorkSite]
+    latitude: float
+    longitude: float
+    radius_meters: int
+
+
+@dataclass
+class GeofenceResult:
+    within: bool
+    distance: Optional[float] = None
+    radius_meters: Optional[int] = None
+    site: Optional[WorkSite] = None
+    error: Optional[str] = None
+
+    @property
+    def message(self):
+        if self.error:
+            return self.error
+        if self.within:
+            return None
+        return (
+            f'You must be within {self.radius_meters}m of the workplace to clock in. '
+            f'You are {int(self.distance)}m away.'
+        )
+
+
+def _workplace_fence(business):
+    if not business.workplace_latitude or not business.workplace_longitude:
+        return []
+    return [Fence(None, float(business.workplace_latitude), float(business.workplace_longitude),
+                  business.clock_in_radius_meters)]
+
+
+def _site_fences(sites):
+    return [Fence(site, float(site.latitude), float(site.longitude), site.radius_meters) for site in sites]
+
+
+def _evaluate(fences, points):
+    """Vectorized check of many (lat, lon) points against many fences"""
+    if not fences:
+        return [GeofenceResult(within=False, error=NOT_CONFIGURED) for _ in points]
+
+    lats, lons = zip(*points)
+    distances = haversine_matrix(
+        lats, lons,
+        [fence.latitude for fence in fences],
+        [fence.longitude for fence in fences],
+    )
+    radii = np.array([fence.radius_meters for fence in fences], dtype=float)
+    inside = np.where(distances <= radii[None, :], distances, np.inf)
+
+    results = []
+    for row, inside_row in zip(distances, inside):
+        best = int(np.argmin(inside_row))
+        within = bool(np.isfinite(inside_row[best]))
+        if not within:
+            best = int(np.argmin(row))
+        fence = fences[best]
+        results.append(GeofenceResult(
+            within=within,
+            distance=float(row[best]),
+            radius_meters=fence.radius_meters,
+            site=fence.site,
+        ))
+    return results
+
+
+def check_location(business, latitude, longitude):
+    """
+    Check one point against a business's geofences.
+
+    Sites whose precomputed bounding box contains the point are fetched first;
+    the full site list is only loaded to report the nearest site on rejection.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    candidates = list(WorkSite.objects.filter(
+        business=business,
+        is_active=True,
+        min_latitude__lte=latitude,
+        max_latitude__gte=latitude,
+        min_longitude__lte=longitude,
+        max_longitude__gte=longitude,
+    ))
+    if candidates:
+        result = _evaluate(_site_fences(candidates), [(latitude, longitude)])[0]
+        if result.within:
+            return result
+
+    fences = _site_fences(WorkSite.objects.filter(business=business, is_active=True)) or _workplace_fence(business)
+    return _evaluate(fences, [(latitude, longitude)])[0]
+
+
+def check_many(entries):
+    """
+    Check many punches in one call.
+
+    ``entries`` is a list of (business, latitude, longitude). All active sites
+    for the businesses involved are loaded in one query and each business's
+    points are checked against its sites as a single distance matrix.
+    """
+    businesses = {business.id: business for business, _, _ in entries}
+    sites = defaultdict(list)
+    for site in WorkSite.objects.filter(business_id__in=businesses.keys(), is_active=True):
+        sites[site.business_id].append(site)
+
+    grouped = defaultdict(list)
+    for index, (business, latitude, longitude) in enumerate(entries):
+        grouped[business.id].append((index, (float(latitude), float(longitude))))
+
+    results = [None] * len(entries)
+    for business_id, indexed_points in grouped.items():
+        fences = _site_fences(sites[business_id]) or _workplace_fence(businesses[business_id])
+        indexes, points = zip(*indexed_points)
+        for index, result in zip(indexes, _evaluate(fences, points)):
+            results[index] = result
+    return results
@@ -0,0 +1,125 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord, PunchReceipt
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def get_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', timedelta(hours=24))
+
+
+def get_lease():
+    return getattr(settings, 'IDEMPOTENCY_LEASE', timedelta(minutes=2))
+
+
+def fingerprint(data):
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _claim(user, scope, key, request_fingerprint):
+    """
+    Claim a key with INSERT ... ON CONFLICT DO NOTHING.
+
+    Returns (record, claimed). Expired records, and claims still in progress
+    after the lease (their request crashed), are evicted and re-claimed;
+    every claim is a new row, so created_at is when it started.
+    """
+    record = IdempotencyRecord(
+        user=user,
+        scope=scope,
+        key=key,
+        request_fingerprint=request_fingerprint,
+        expires_at=timezone.now() + get_ttl(),
+    )
+    IdempotencyRecord.objects.bulk_create([record], ignore_conflicts=True)
+    try:
+        stored = IdempotencyRecord.objects.get(user=user, scope=scope, key=key)
+    except IdempotencyRecord.DoesNotExist:
+        # The conflicting claim failed with a server error and was deleted
+        return _claim(user, scope, key, request_fingerprint)
+    if stored.id == record.id:
+        return stored, True
+
+    now = timezone.now()
+    if stored.expires_at <= now or (not stored.is_complete and stored.created_at <= now - get_lease()):
+        IdempotencyRecord.objects.filter(id=stored.id).delete()
+        return _claim(user, scope, key, request_fingerprint)
+    return stored, False
+
+
+def idempotent(scope):
+    """
+    Make a function-based API view safe to retry.
+
+    Requests carrying an Idempotency-Key header are recorded per user and
+    scope; a retry with the same key replays the first response instead of
+    running the view again. Requests without the header are unaffected.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return view(request, *args, **kwargs)
+            if len(key) > 255:
+                return Response(
+                    {'error': f'{IDEMPOTENCY_HEADER} must be at most 255 characters'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            request_fingerprint = fingerprint(request.data)
+            record, claimed = _claim(request.user, scope, key, request_fingerprint)
+
+            if not claimed:
+                if record.request_fingerprint != request_fingerprint:
+                    return Response(
+                        {'error': f'{IDEMPOTENCY_HEADER} was already used with a different request'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                    )
+                if not record.is_complete:
+                    return Response(
+                        {'error': 'A request with this idempotency key is still in progress'},
+                        status=status.HTTP_409_CONFLICT
+                    )
+                response = Response(record.response, status=record.status_code)
+                response['Idempotent-Replayed'] = 'true'
+                return response
+
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+
+            if response.status_code >= 500:
+                # Let the client retry server errors with the same key
+                record.delete()
+            else:
+                # A no-op if a retry took the claim over after the lease ran out
+                IdempotencyRecord.objects.filter(id=record.id).update(
+                    status_code=response.status_code,
+                    response=json.loads(json.dumps(response.data, default=str)),
+                    updated_at=timezone.now(),
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired():
+    """Delete expired idempotency records and punch receipts older than the TTL"""
+    now = timezone.now()
+    records, _ = IdempotencyRecord.objects.filter(expires_at__lte=now).delete()
+    receipts, _ = PunchReceipt.objects.filter(created_at__lte=now - get_ttl()).delete()
+    return records, receipts
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from workforce.exports import timesheet_queryset, timesheet_rows, stream_csv, parse_period
+
+
+class Command(BaseCommand):
+    help = "Export hours cards for a period as CSV for payroll"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', required=True, help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end', required=True, help='Last date (YYYY-MM-DD)')
+        parser.add_argument('--business', action='append', help='Business ID to export (repeatable); defaults to all')
+        parser.add_argument('--status', default='APPROVED', help='Card status to export, or "all"')
+        parser.add_argument('--output', help='File to write; defaults to stdout')
+
+    def handle(self, *args, **options):
+        try:
+            start, end = parse_period(options['start'], options['end'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        card_status = options['status']
+        cards = timesheet_queryset(
+            start, end,
+            business_ids=options['business'],
+            status=None if card_status.lower() == 'all' else card_status.upper(),
+        )
+
+        if not options['output']:
+            for line in stream_csv(timesheet_rows(cards)):
+                self.stdout.write(line, ending='')
+            return
+
+        rows = 0
+        with open(options['output'], 'w', newline='') as output:
+            for line in stream_csv(timesheet_rows(cards)):
+                output.write(line)
+                rows += 1
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows - 1} hours cards to {options['output']}"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from workforce.models import Shift
+from workforce.schedule import extend_horizon, regenerate_for_shifts
+
+
+class Command(BaseCommand):
+    help = "Materialize upcoming ShiftOccurrence rows from the weekly Shift templates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Delete and regenerate all upcoming occurrences instead of only filling gaps'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            regenerate_for_shifts(Shift.objects.all())
+            self.stdout.write(self.style.SUCCESS("Regenerated upcoming shift occurrences"))
+            return
+
+        considered = extend_horizon()
+        self.stdout.write(self.style.SUCCESS(f"Ensured {considered} upcoming shift occurrences"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from business.models import Business
+from workforce.staff_import import StaffImport, read_csv
+
+
+class Command(BaseCommand):
+    help = "Import staff members for a business from a CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('business', help='Business ID to add the staff to')
+        parser.add_argument('csv_file', help='CSV with a header row (name, job_title, department, employment_type, email, phone, hourly_rate, hire_date, user_email)')
+        parser.add_argument('--skip-invalid', action='store_true', help='Import valid rows even if some rows are invalid')
+
+    def handle(self, *args, **options):
+        business = Business.objects.filter(id=options['business']).first()
+        if not business:
+            raise CommandError(f"Business {options['business']} not found")
+
+        with open(options['csv_file'], encoding='utf-8') as f:
+            rows = read_csv(f.read())
+
+        staff_import = StaffImport(business, rows, skip_invalid=options['skip_invalid'])
+        created = staff_import.run()
+        for error in staff_import.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if staff_import.errors and not options['skip_invalid']:
+            raise CommandError("Some rows are invalid; nothing was imported")
+
+        invited = sum(1 for staff in created if staff.user_id)
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(created)} staff members ({invited} invited)"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from workforce.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key records and old punch receipts"
+
+    def handle(self, *args, **options):
+        records, receipts = purge_expired()
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {records} idempotency records and {receipts} punch receipts"
+        ))
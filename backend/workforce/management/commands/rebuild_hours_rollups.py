@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from workforce.models import HoursCard, HoursRollup
+from workforce.rollups import refresh_for_cards
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily/weekly hours rollups from HoursCard records"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business', help='Only rebuild rollups for this business ID')
+        parser.add_argument('--since', help='Only rebuild days on or after this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        cards = HoursCard.objects.only('staff_id', 'date')
+        rollups = HoursRollup.objects.all()
+        if options['business']:
+            cards = cards.filter(staff__business_id=options['business'])
+            rollups = rollups.filter(business_id=options['business'])
+        if options['since']:
+            cards = cards.filter(date__gte=options['since'])
+            rollups = rollups.filter(period_start__gte=options['since'])
+
+        rollups.delete()
+        refresh_for_cards(cards.iterator(chunk_size=2000))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {cards.count()} hours cards"))
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workforce.attendance import refresh_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh stored daily attendance summaries through yesterday; attendance reports also do "
+        "this for their business on the first request each day, so scheduling this is optional"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', help='Only refresh this business ID (repeatable)')
+        parser.add_argument('--since', help='Recompute from this date (YYYY-MM-DD) instead of the last refreshed day')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError("--since must be a date (YYYY-MM-DD)")
+
+        written = refresh_all(since=since, business_ids=options['business'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} attendance summaries"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from workforce.sweeper import sweep_open_cards, max_open_duration
+
+
+class Command(BaseCommand):
+    help = (
+        "Close hours cards left open past OPEN_CARD_MAX_HOURS now; requests also sweep "
+        "every OPEN_CARD_SWEEP_MINUTES, so scheduling this is optional"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List the cards that would be closed')
+
+    def handle(self, *args, **options):
+        cards = sweep_open_cards(dry_run=options['dry_run'])
+        if options['dry_run']:
+            for card in cards:
+                self.stdout.write(f"{card.id} {card.staff.name} clocked in {card.clock_in_datetime:%Y-%m-%d %H:%M}")
+            self.stdout.write(f"{len(cards)} cards open longer than {max_open_duration()}")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Closed {len(cards)} cards open longer than {max_open_duration()}"))
@@ -0,0 +1,85 @@
+# Generated by Django 4.2 on 2026-10-16 09:12
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def card_seconds(card):
+    if not card.clock_out_datetime:
+        return 0
+    if card.clock_in_datetime:
+        total = card.clock_out_datetime - card.clock_in_datetime
+    elif card.clock_in and card.clock_out:
+        total = datetime.combine(card.date, card.clock_out) - datetime.combine(card.date, card.clock_in)
+    else:
+        return 0
+    if card.break_start and card.break_end:
+        total -= datetime.combine(card.date, card.break_end) - datetime.combine(card.date, card.break_start)
+    return max(int(total.total_seconds()), 0)
+
+
+def backfill_rollups(apps, schema_editor):
+    HoursCard = apps.get_model('workforce', 'HoursCard')
+    HoursRollup = apps.get_model('workforce', 'HoursRollup')
+
+    buckets = {}
+    cards = HoursCard.objects.select_related('staff')
+    for card in cards.iterator(chunk_size=2000):
+        seconds = card_seconds(card)
+        week_start = card.date - timedelta(days=card.date.weekday())
+        for period, start in (('DAY', card.date), ('WEEK', week_start)):
+            row = buckets.setdefault((card.staff_id, period, start), {
+                'business_id': card.staff.business_id,
+                'worked_seconds': 0, 'submitted_seconds': 0, 'approved_seconds': 0, 'card_count': 0,
+            })
+            row['card_count'] += 1
+            row['worked_seconds'] += seconds
+            if card.status in ('SIGNED', 'APPROVED'):
+                row['submitted_seconds'] += seconds
+            if card.status == 'APPROVED':
+                row['approved_seconds'] += seconds
+
+    HoursRollup.objects.bulk_create(
+        [
+            HoursRollup(staff_id=staff_id, period=period, period_start=start, **values)
+            for (staff_id, period, start), values in buckets.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0003_business_street'),
+        ('workforce', '0007_hourscard_clock_in_distance_meters_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HoursRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', models.CharField(choices=[('DAY', 'Day'), ('WEEK', 'Week')], max_length=4)),
+                ('period_start', models.DateField(help_text='Day, or Monday of the week, this rollup covers')),
+                ('worked_seconds', models.PositiveIntegerField(default=0, help_text='All clocked-out hours')),
+                ('submitted_seconds', models.PositiveIntegerField(default=0, help_text='Hours on signed or approved cards')),
+                ('approved_seconds', models.PositiveIntegerField(default=0, help_text='Hours on approved cards')),
+                ('card_count', models.PositiveIntegerField(default=0)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hours_rollups', to='business.business')),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hours_rollups', to='workforce.businessstaff')),
+            ],
+            options={
+                'verbose_name': 'Hours Rollup',
+                'verbose_name_plural': 'Hours Rollups',
+                'indexes': [models.Index(fields=['business', 'period', 'period_start'], name='workforce_h_busines_4a428d_idx'), models.Index(fields=['staff', 'period', 'period_start'], name='workforce_h_staff_i_19c6d7_idx')],
+                'unique_together': {('staff', 'period', 'period_start')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-16 10:04
+
+from datetime import datetime
+
+from django.db import migrations, models
+
+
+def backfill_worked_seconds(apps, schema_editor):
+    HoursCard = apps.get_model('workforce', 'HoursCard')
+
+    batch = []
+    for card in HoursCard.objects.filter(clock_out_datetime__isnull=False).iterator(chunk_size=2000):
+        if card.clock_in_datetime:
+            total = card.clock_out_datetime - card.clock_in_datetime
+        elif card.clock_in and card.clock_out:
+            total = datetime.combine(card.date, card.clock_out) - datetime.combine(card.date, card.clock_in)
+        else:
+            continue
+        if card.break_start and card.break_end:
+            total -= datetime.combine(card.date, card.break_end) - datetime.combine(card.date, card.break_start)
+        card.worked_seconds = max(int(total.total_seconds()), 0)
+        batch.append(card)
+        if len(batch) >= 1000:
+            HoursCard.objects.bulk_update(batch, ['worked_seconds'])
+            batch = []
+    if batch:
+        HoursCard.objects.bulk_update(batch, ['worked_seconds'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0008_hoursrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hourscard',
+            name='worked_seconds',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Worked time net of breaks, kept in sync on save (null while clocked in)', null=True),
+        ),
+        migrations.RunPython(backfill_worked_seconds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-16 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('workforce', '0009_hourscard_worked_seconds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PunchReceipt',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client_key', models.CharField(help_text='Idempotency key generated by the device', max_length=100)),
+                ('punch_type', models.CharField(choices=[('IN', 'Clock In'), ('OUT', 'Clock Out')], max_length=3)),
+                ('result', models.JSONField(default=dict, help_text='Result returned when the punch was applied')),
+                ('hours_card', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='punch_receipts', to='workforce.hourscard')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='punch_receipts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Punch Receipt',
+                'verbose_name_plural': 'Punch Receipts',
+                'indexes': [models.Index(fields=['created_at'], name='workforce_p_created_001910_idx')],
+                'unique_together': {('user', 'client_key')},
+            },
+        ),
+    ]
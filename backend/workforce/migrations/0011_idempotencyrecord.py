@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-16 12:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('workforce', '0010_punchreceipt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('scope', models.CharField(help_text='Endpoint the key was used on', max_length=100)),
+                ('key', models.CharField(max_length=255)),
+                ('request_fingerprint', models.CharField(help_text='Hash of the request payload', max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, help_text='Null while the request is in progress', null=True)),
+                ('response', models.JSONField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_records', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Idempotency Record',
+                'verbose_name_plural': 'Idempotency Records',
+                'indexes': [models.Index(fields=['expires_at'], name='workforce_i_expires_e8736f_idx')],
+                'unique_together': {('user', 'scope', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-16 13:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0003_business_street'),
+        ('workforce', '0011_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkSite',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('address', models.CharField(blank=True, max_length=500)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('radius_meters', models.IntegerField(default=100, help_text='Allowed radius in meters for clock-in')),
+                ('is_active', models.BooleanField(default=True)),
+                ('min_latitude', models.FloatField(default=0, editable=False)),
+                ('max_latitude', models.FloatField(default=0, editable=False)),
+                ('min_longitude', models.FloatField(default=0, editable=False)),
+                ('max_longitude', models.FloatField(default=0, editable=False)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='work_sites', to='business.business')),
+            ],
+            options={
+                'verbose_name': 'Work Site',
+                'verbose_name_plural': 'Work Sites',
+                'indexes': [models.Index(fields=['business', 'is_active'], name='workforce_w_busines_f89768_idx'), models.Index(fields=['business', 'min_latitude', 'max_latitude'], name='workforce_w_busines_62b040_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='hourscard',
+            name='work_site',
+            field=models.ForeignKey(blank=True, help_text='Site the worker clocked in at', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hours_cards', to='workforce.worksite'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-16 14:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0003_business_street'),
+        ('workforce', '0012_worksite_hourscard_work_site'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShiftOccurrence',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shift_occurrences', to='business.business')),
+                ('shift', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='workforce.shift')),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shift_occurrences', to='workforce.businessstaff')),
+            ],
+            options={
+                'verbose_name': 'Shift Occurrence',
+                'verbose_name_plural': 'Shift Occurrences',
+                'ordering': ['start'],
+                'indexes': [models.Index(fields=['business', 'start'], name='workforce_s_busines_f815fb_idx'), models.Index(fields=['staff', 'start'], name='workforce_s_staff_i_cd4c6c_idx')],
+                'unique_together': {('shift', 'date')},
+            },
+        ),
+    ]
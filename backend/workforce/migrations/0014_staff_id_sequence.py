@@ -0,0 +1,16 @@
+# Generated by Django 4.2 on 2026-10-16 15:10
+
+from django.db import migrations
+
+from core.ids import create_sequence
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0013_shiftoccurrence'),
+    ]
+
+    operations = [
+        create_sequence('workforce_staff_id_seq'),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-16 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0014_staff_id_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hourscard',
+            name='auto_closed_at',
+            field=models.DateTimeField(blank=True, help_text='Set when a card left open too long was closed automatically; times need review', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='hourscard',
+            index=models.Index(condition=models.Q(('clock_in_datetime__isnull', False), ('clock_out_datetime__isnull', True)), fields=['staff', 'clock_in_datetime'], name='hourscard_open_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-16 23:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0004_business_id_sequence'),
+        ('workforce', '0015_hourscard_auto_closed_at_open_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('scheduled_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('scheduled_start', models.DateTimeField()),
+                ('scheduled_end', models.DateTimeField()),
+                ('clock_in_datetime', models.DateTimeField(blank=True, null=True)),
+                ('clock_out_datetime', models.DateTimeField(blank=True, null=True)),
+                ('is_late', models.BooleanField(default=False)),
+                ('is_no_show', models.BooleanField(default=False)),
+                ('left_early', models.BooleanField(default=False)),
+                ('late_seconds', models.PositiveIntegerField(default=0)),
+                ('early_seconds', models.PositiveIntegerField(default=0)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='business.business')),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='workforce.businessstaff')),
+            ],
+            options={
+                'verbose_name': 'Attendance Summary',
+                'verbose_name_plural': 'Attendance Summaries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='attendancesummary',
+            index=models.Index(fields=['business', 'date'], name='workforce_a_busines_5f0e58_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendancesummary',
+            unique_together={('staff', 'date')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-16 23:40
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0016_attendancesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarFeedKey',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this record', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('staff', 'Staff member'), ('business', 'Business')], max_length=10)),
+                ('object_id', models.UUIDField(help_text='BusinessStaff or Business the feed belongs to')),
+                ('key', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name': 'Calendar Feed Key',
+                'verbose_name_plural': 'Calendar Feed Keys',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -1,16 +1,47 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
+from core.ids import CodeAllocator
 from core.models import UUIDModel
 from business.models import Business
-import string
-import random
+import math
 import uuid
 from django.conf import settings
 
+
+STAFF_IDS = CodeAllocator(
+    prefix='EMP', length=6, sequence='workforce_staff_id_seq',
+    model='workforce.BusinessStaff', field='staff_id', multiplier=2654435761,
+)
+
+
 def generate_staff_id():
     """Generate unique staff ID"""
-    return f"EMP-{''.join(random.choices(string.ascii_uppercase + string.digits, k=6))}"
+    return STAFF_IDS.allocate()[0]
+
+
+def generate_staff_ids(count):
+    """Generate ``count`` unique staff IDs in one batch"""
+    return STAFF_IDS.allocate(count)
+
+
+class BusinessStaffQuerySet(models.QuerySet):
+    def with_list_data(self, month_start):
+        """
+        Everything BusinessStaffSerializer reads, in the same query: the business,
+        the invitation and approved hours since ``month_start`` from the day rollups.
+        """
+        month_seconds = HoursRollup.objects.filter(
+            staff=models.OuterRef('pk'),
+            period='DAY',
+            period_start__gte=month_start,
+        ).values('staff').annotate(total=models.Sum('approved_seconds')).values('total')
+        return self.select_related('business', 'invitation').annotate(
+            month_approved_seconds=Coalesce(
+                models.Subquery(month_seconds, output_field=models.IntegerField()), 0
+            )
+        )
 
 
 class BusinessStaff(UUIDModel):
@@ -78,6 +109,8 @@ class BusinessStaff(UUIDModel):
         help_text="Distance from workplace when clocking in"
     )
 
+    objects = BusinessStaffQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Business Staff'
         verbose_name_plural = 'Business Staff'
@@ -96,6 +129,45 @@ class BusinessStaff(UUIDModel):
         return self.status == 'ACTIVE'
 
 
+class WorkSite(UUIDModel):
+    """A clock-in location of a business, with its own geofence radius"""
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="work_sites"
+    )
+    name = models.CharField(max_length=255)
+    address = models.CharField(max_length=500, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    radius_meters = models.IntegerField(default=100, help_text="Allowed radius in meters for clock-in")
+    is_active = models.BooleanField(default=True)
+
+    # Bounding box of the geofence, precomputed so candidate sites can be found with range filters
+    min_latitude = models.FloatField(editable=False, default=0)
+    max_latitude = models.FloatField(editable=False, default=0)
+    min_longitude = models.FloatField(editable=False, default=0)
+    max_longitude = models.FloatField(editable=False, default=0)
+
+    class Meta:
+        verbose_name = 'Work Site'
+        verbose_name_plural = 'Work Sites'
+        indexes = [
+            models.Index(fields=['business', 'is_active']),
+            models.Index(fields=['business', 'min_latitude', 'max_latitude']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.business.name}"
+
+    def save(self, *args, **kwargs):
+        from core.geo import bounding_box
+        self.min_latitude, self.max_latitude, self.min_longitude, self.max_longitude = bounding_box(
+            self.latitude, self.longitude, self.radius_meters
+        )
+        super().save(*args, **kwargs)
+
+
 class Shift(UUIDModel):
     """Work shifts for business staff"""
     SHIFT_TYPES = (
@@ -148,6 +220,106 @@ class Shift(UUIDModel):
         return f"{self.staff.name} - {self.day_of_week} {self.shift_type}"
 
 
+class ShiftOccurrence(UUIDModel):
+    """A concrete dated instance of a weekly Shift, materialized for a rolling horizon"""
+    shift = models.ForeignKey(
+        Shift,
+        on_delete=models.CASCADE,
+        related_name="occurrences"
+    )
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="shift_occurrences"
+    )
+    staff = models.ForeignKey(
+        BusinessStaff,
+        on_delete=models.CASCADE,
+        related_name="shift_occurrences"
+    )
+    date = models.DateField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('shift', 'date')
+        ordering = ['start']
+        verbose_name = 'Shift Occurrence'
+        verbose_name_plural = 'Shift Occurrences'
+        indexes = [
+            models.Index(fields=['business', 'start']),
+            models.Index(fields=['staff', 'start']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name} - {self.start:%Y-%m-%d %H:%M}"
+
+
+class HoursCardQuerySet(models.QuerySet):
+    """Worked-time queries evaluated in the database via the stored worked_seconds column"""
+
+    def with_worked_hours(self):
+        return self.annotate(
+            worked_hours=models.ExpressionWrapper(
+                models.F('worked_seconds') / 3600.0,
+                output_field=models.FloatField()
+            )
+        )
+
+    # worked_seconds is a 32-bit integer column; bounds outside it are clamped so they still compare
+    SECONDS_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+    @classmethod
+    def _seconds(cls, hours):
+        """Whole seconds in ``hours``; raises ValueError unless it is a finite number"""
+        hours = float(hours)
+        if not math.isfinite(hours):
+            raise ValueError('Hours must be a finite number')
+        low, high = cls.SECONDS_RANGE
+        return min(max(int(hours * 3600), low), high)
+
+    def worked_over(self, hours):
+        return self.filter(worked_seconds__gt=self._seconds(hours))
+
+    def worked_under(self, hours):
+        return self.filter(worked_seconds__lt=self._seconds(hours))
+
+    def open(self):
+        """Cards clocked in but not yet out; served by the partial open-card index"""
+        return self.filter(clock_in_datetime__isnull=False, clock_out_datetime__isnull=True)
+
+    def with_access(self):
+        """Join staff and business so ownership checks need no further queries"""
+        return self.select_related('staff__business')
+
+    def insert_if_absent(self, card):
+        """
+        Insert ``card`` with INSERT ... ON CONFLICT DO NOTHING on (staff, date).
+
+        Returns (card, True) when inserted, otherwise (existing_card, False).
+        Bypasses save(), so derived fields are synced here.
+        """
+        card.sync_derived_fields()
+        self.bulk_create([card], ignore_conflicts=True)
+        stored = self.filter(staff_id=card.staff_id, date=card.date).first()
+        if stored is not None and stored.id == card.id:
+            return card, True
+        return stored, False
+
+    def worked_totals(self):
+        """Sum, average and count of worked time across the queryset"""
+        result = self.aggregate(
+            total_seconds=models.Sum('worked_seconds'),
+            average_seconds=models.Avg('worked_seconds'),
+            cards=models.Count('worked_seconds'),
+        )
+        return {
+            'total_hours': (result['total_seconds'] or 0) / 3600,
+            'average_hours': (result['average_seconds'] or 0) / 3600,
+            'cards': result['cards'],
+        }
+
+
 class HoursCard(UUIDModel):
     """Daily time tracking for staff"""
     STATUS_CHOICES = (
@@ -199,6 +371,14 @@ class HoursCard(UUIDModel):
         blank=True,
         help_text="Distance from workplace when clocking in (in meters)"
     )
+    work_site = models.ForeignKey(
+        WorkSite,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="hours_cards",
+        help_text="Site the worker clocked in at"
+    )
 
     break_start = models.TimeField(null=True, blank=True)
     break_end = models.TimeField(null=True, blank=True)
@@ -233,6 +413,19 @@ class HoursCard(UUIDModel):
     )
     approved_at = models.DateTimeField(null=True, blank=True)
     rejection_reason = models.TextField(max_length=500, blank=True)
+    worked_seconds = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Worked time net of breaks, kept in sync on save (null while clocked in)"
+    )
+    auto_closed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Set when a card left open too long was closed automatically; times need review"
+    )
+
+    objects = HoursCardQuerySet.as_manager()
 
     class Meta:
         unique_together = ('staff', 'date')
@@ -243,17 +436,45 @@ class HoursCard(UUIDModel):
             models.Index(fields=['staff', 'date']),
             models.Index(fields=['status', 'date']),
             models.Index(fields=['approved_by', 'approved_at']),
+            models.Index(
+                fields=['staff', 'clock_in_datetime'],
+                condition=models.Q(clock_in_datetime__isnull=False, clock_out_datetime__isnull=True),
+                name='hourscard_open_idx',
+            ),
         ]
 
     def __str__(self):
         return f"{self.staff.name} - {self.date}"
 
+    TIME_FIELDS = ('clock_in', 'clock_out', 'clock_in_datetime', 'clock_out_datetime', 'break_start', 'break_end')
+
     def save(self, *args, **kwargs):
+        self.sync_derived_fields()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.TIME_FIELDS):
+            kwargs['update_fields'] = set(update_fields) | {'clock_in', 'clock_out', 'worked_seconds'}
+        super().save(*args, **kwargs)
+
+    def sync_derived_fields(self):
+        """Fill legacy time fields and worked_seconds; call directly before bulk writes"""
         if self.clock_in_datetime and not self.clock_in:
             self.clock_in = self.clock_in_datetime.time()
         if self.clock_out_datetime and not self.clock_out:
             self.clock_out = self.clock_out_datetime.time()
-        super().save(*args, **kwargs)
+        self.worked_seconds = self.compute_worked_seconds()
+
+    @property
+    def is_open(self):
+        """Clocked in and not yet out"""
+        return bool(self.clock_in_datetime) and not self.clock_out_datetime
+
+    def compute_worked_seconds(self):
+        """Worked seconds from the clock and break times, or None while still clocked in"""
+        total = self.total_hours
+        if total is None:
+            return None
+        return max(int(total.total_seconds()), 0)
 
     @property
     def total_hours(self):
@@ -295,11 +516,170 @@ class HoursCard(UUIDModel):
     @property
     def total_hours_decimal(self):
         """Return total hours as decimal for calculations"""
+        if self.worked_seconds is not None:
+            return self.worked_seconds / 3600
         if not self.total_hours:
             return 0
         return self.total_hours.total_seconds() / 3600
 
 
+class HoursRollup(UUIDModel):
+    """Per-staff daily and weekly totals of worked hours, kept in sync with HoursCard"""
+    PERIOD_CHOICES = (
+        ('DAY', 'Day'),
+        ('WEEK', 'Week'),
+    )
+
+    staff = models.ForeignKey(
+        BusinessStaff,
+        on_delete=models.CASCADE,
+        related_name="hours_rollups"
+    )
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="hours_rollups"
+    )
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    period_start = models.DateField(help_text="Day, or Monday of the week, this rollup covers")
+    worked_seconds = models.PositiveIntegerField(default=0, help_text="All clocked-out hours")
+    submitted_seconds = models.PositiveIntegerField(default=0, help_text="Hours on signed or approved cards")
+    approved_seconds = models.PositiveIntegerField(default=0, help_text="Hours on approved cards")
+    card_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('staff', 'period', 'period_start')
+        verbose_name = 'Hours Rollup'
+        verbose_name_plural = 'Hours Rollups'
+        indexes = [
+            models.Index(fields=['business', 'period', 'period_start']),
+            models.Index(fields=['staff', 'period', 'period_start']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name} - {self.period} {self.period_start}"
+
+
+class AttendanceSummary(UUIDModel):
+    """Scheduled vs. actual attendance for one staff member on one day, refreshed after the day ends"""
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="attendance_summaries"
+    )
+    staff = models.ForeignKey(
+        BusinessStaff,
+        on_delete=models.CASCADE,
+        related_name="attendance_summaries"
+    )
+    date = models.DateField()
+    scheduled_shifts = models.PositiveSmallIntegerField(default=0)
+    scheduled_start = models.DateTimeField()
+    scheduled_end = models.DateTimeField()
+    clock_in_datetime = models.DateTimeField(null=True, blank=True)
+    clock_out_datetime = models.DateTimeField(null=True, blank=True)
+    is_late = models.BooleanField(default=False)
+    is_no_show = models.BooleanField(default=False)
+    left_early = models.BooleanField(default=False)
+    late_seconds = models.PositiveIntegerField(default=0)
+    early_seconds = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('staff', 'date')
+        verbose_name = 'Attendance Summary'
+        verbose_name_plural = 'Attendance Summaries'
+        indexes = [
+            models.Index(fields=['business', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name} - {self.date}"
+
+
+class PunchReceipt(UUIDModel):
+    """Client idempotency key for a punch applied through batch sync"""
+    PUNCH_TYPES = (
+        ('IN', 'Clock In'),
+        ('OUT', 'Clock Out'),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='punch_receipts'
+    )
+    client_key = models.CharField(max_length=100, help_text="Idempotency key generated by the device")
+    punch_type = models.CharField(max_length=3, choices=PUNCH_TYPES)
+    hours_card = models.ForeignKey(
+        HoursCard,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='punch_receipts'
+    )
+    result = models.JSONField(default=dict, help_text="Result returned when the punch was applied")
+
+    class Meta:
+        unique_together = ('user', 'client_key')
+        verbose_name = 'Punch Receipt'
+        verbose_name_plural = 'Punch Receipts'
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.client_key} ({self.punch_type})"
+
+
+class IdempotencyRecord(UUIDModel):
+    """Stored response for a request sent with an Idempotency-Key header"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_records'
+    )
+    scope = models.CharField(max_length=100, help_text="Endpoint the key was used on")
+    key = models.CharField(max_length=255)
+    request_fingerprint = models.CharField(max_length=64, help_text="Hash of the request payload")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Null while the request is in progress")
+    response = models.JSONField(null=True, blank=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'scope', 'key')
+        verbose_name = 'Idempotency Record'
+        verbose_name_plural = 'Idempotency Records'
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} - {self.key}"
+
+    @property
+    def is_complete(self):
+        return self.status_code is not None
+
+
+class CalendarFeedKey(UUIDModel):
+    """Secret salting a staff member's or business's calendar feed tokens; replacing it revokes issued URLs"""
+    KINDS = (
+        ('staff', 'Staff member'),
+        ('business', 'Business'),
+    )
+
+    kind = models.CharField(max_length=10, choices=KINDS)
+    object_id = models.UUIDField(help_text="BusinessStaff or Business the feed belongs to")
+    key = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+        verbose_name = 'Calendar Feed Key'
+        verbose_name_plural = 'Calendar Feed Keys'
+
+    def __str__(self):
+        return f"{self.kind} feed {self.object_id}"
+
 
 class StaffInvitation(models.Model):
     STATUS_CHOICES = [
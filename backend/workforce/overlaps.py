@@ -0,0 +1,81 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+from .models import Shift
+
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAY_INDEX = {day: index for index, (day, _) in enumerate(Shift.DAYS_OF_WEEK)}
+
+
+@dataclass
+class Overlap:
+    shift: Shift
+    other: Shift
+
+    def __str__(self):
+        return f"{describe(self.shift)} overlaps {describe(self.other)}"
+
+
+def describe(shift):
+    return f"{shift.day_of_week.title()} {shift.start_time:%H:%M}-{shift.end_time:%H:%M}"
+
+
+def week_intervals(shift):
+    """
+    Minute-of-week intervals covered by a shift.
+
+    Shifts ending at or before their start run overnight; a Sunday night
+    shift wraps around to Monday morning and is split in two.
+    """
+    start = DAY_INDEX[shift.day_of_week] * MINUTES_PER_DAY + shift.start_time.hour * 60 + shift.start_time.minute
+    end = DAY_INDEX[shift.day_of_week] * MINUTES_PER_DAY + shift.end_time.hour * 60 + shift.end_time.minute
+    if end <= start:
+        end += MINUTES_PER_DAY
+    if end > MINUTES_PER_WEEK:
+        return [(start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK)]
+    return [(start, end)]
+
+
+def find_overlaps(shifts):
+    """
+    Overlapping pairs among active shifts, per staff member, in O(n log n).
+
+    Intervals are sorted by start and swept once while tracking the interval
+    that reaches furthest; any interval starting before that end overlaps it.
+    """
+    by_staff = defaultdict(list)
+    for shift in shifts:
+        if not shift.is_active:
+            continue
+        for start, end in week_intervals(shift):
+            by_staff[str(shift.staff_id)].append((start, end, shift))
+
+    overlaps = []
+    for intervals in by_staff.values():
+        intervals.sort(key=lambda interval: (interval[0], interval[1]))
+        furthest = None
+        for start, end, shift in intervals:
+            if furthest is not None and start < furthest[1] and furthest[2] is not shift:
+                overlaps.append(Overlap(shift, furthest[2]))
+            if furthest is None or end > furthest[1]:
+                furthest = (start, end, shift)
+    return overlaps
+
+
+def check_new_shifts(new_shifts, exclude_ids=()):
+    """
+    Overlaps involving any of ``new_shifts`` (unsaved or being updated), checked
+    against each other and against the staff members' existing active shifts.
+    """
+    new_shifts = list(new_shifts)
+    staff_ids = {shift.staff_id for shift in new_shifts}
+    existing = Shift.objects.filter(staff_id__in=staff_ids, is_active=True).exclude(id__in=exclude_ids).only(
+        'id', 'staff_id', 'day_of_week', 'start_time', 'end_time', 'is_active'
+    )
+    new_ids = {id(shift) for shift in new_shifts}
+    return [
+        overlap for overlap in find_overlaps([*existing, *new_shifts])
+        if id(overlap.shift) in new_ids or id(overlap.other) in new_ids
+    ]
@@ -0,0 +1,103 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import date
+import uuid
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def wants_keyset(request):
+    """Clients opt into keyset pages with ?pagination=cursor or by following a cursor link"""
+    return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+
+class DateKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (date, id), newest first.
+
+    Each page is a range scan starting after the last row of the previous
+    one, so there is no COUNT(*) and no OFFSET: page 500 costs the same as
+    page 1. The cursor is an opaque token encoding direction, date and id.
+    """
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, reverse, row):
+        token = f"{'p' if reverse else 'n'}|{row.date.isoformat()}|{row.pk}"
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, urlsafe_b64encode(token.encode()).decode()
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            direction, day, pk = urlsafe_b64decode(token.encode()).decode().split('|')
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return direction == 'p', date.fromisoformat(day), uuid.UUID(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        reverse = False
+        queryset = queryset.order_by('-date', '-id')
+        if cursor:
+            reverse, day, pk = cursor
+            if reverse:
+                queryset = queryset.filter(Q(date__gt=day) | Q(date=day, id__gt=pk)).order_by('date', 'id')
+            else:
+                queryset = queryset.filter(Q(date__lt=day) | Q(date=day, id__lt=pk))
+
+        rows = list(queryset[:size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+
+        self.next_row = rows[-1] if rows and (reverse or has_more) else None
+        self.previous_row = rows[0] if rows and cursor and (has_more or not reverse) else None
+        return rows
+
+    def get_next_link(self):
+        return self.encode_cursor(False, self.next_row) if self.next_row else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(True, self.previous_row) if self.previous_row else None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
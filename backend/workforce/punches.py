@@ -0,0 +1,274 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import BusinessStaff, HoursCard, PunchReceipt, ShiftOccurrence
+from .rollups import refresh_for_cards
+from . import roster
+from .schedule import CLOCK_IN_GRACE, ensure_horizon
+from .geofence import check_many
+
+
+MAX_BATCH_SIZE = 200
+
+
+class PunchSerializer(serializers.Serializer):
+    """A single queued clock-in or clock-out punch from a device"""
+    key = serializers.CharField(max_length=100)
+    type = serializers.ChoiceField(choices=PunchReceipt.PUNCH_TYPES)
+    timestamp = serializers.DateTimeField()
+    staff_id = serializers.UUIDField(required=False)
+    latitude = serializers.FloatField(required=False, allow_null=True)
+    longitude = serializers.FloatField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, max_length=500)
+
+    def validate_timestamp(self, value):
+        """Device clocks may run a little ahead, and queued punches expire after the offline window"""
+        now = timezone.now()
+        if value > now + timedelta(seconds=getattr(settings, 'PUNCH_MAX_CLOCK_SKEW_SECONDS', 300)):
+            raise serializers.ValidationError('Punch time is in the future')
+        if value < now - timedelta(hours=getattr(settings, 'PUNCH_OFFLINE_WINDOW_HOURS', 72)):
+            raise serializers.ValidationError('Punch is older than the offline sync window')
+        return value
+
+
+class PunchError(Exception):
+    pass
+
+
+class PunchBatch:
+    """
+    Applies a batch of punches for one user.
+
+    Staff, businesses, existing cards and previously applied keys are loaded
+    up front in a fixed number of queries; punches are then validated in
+    memory in timestamp order and written with bulk_create/bulk_update.
+    """
+
+    def __init__(self, user, items):
+        self.user = user
+        self.items = items
+        self.results = [None] * len(items)
+        self.staff_by_id = {}
+        self.default_staff = None
+        self.cards = {}
+        self.to_create = {}
+        self.to_update = {}
+        self.receipts = []
+        self.fences = {}
+        self.occurrences = {}
+
+    def run(self):
+        valid = self._validate()
+        valid = self._replay_duplicates(valid)
+        if valid:
+            self._load_staff(valid)
+            self._load_cards(valid)
+            self._check_geofences(valid)
+            for index, punch in sorted(valid, key=lambda pair: pair[1]['timestamp']):
+                try:
+                    self.results[index] = self._apply(punch)
+                except PunchError as e:
+                    self.results[index] = {'key': punch['key'], 'status': 'error', 'error': str(e)}
+            self._write()
+        return self.results
+
+    def _validate(self):
+        valid = []
+        seen = set()
+        for index, item in enumerate(self.items):
+            serializer = PunchSerializer(data=item)
+            if not serializer.is_valid():
+                key = item.get('key') if isinstance(item, dict) else None
+                self.results[index] = {'key': key, 'status': 'error', 'error': serializer.errors}
+                continue
+            punch = serializer.validated_data
+            if punch['key'] in seen:
+                self.results[index] = {'key': punch['key'], 'status': 'error', 'error': 'Duplicate key in batch'}
+                continue
+            seen.add(punch['key'])
+            valid.append((index, punch))
+        return valid
+
+    def _replay_duplicates(self, valid):
+        keys = [punch['key'] for _, punch in valid]
+        applied = dict(
+            PunchReceipt.objects.filter(user=self.user, client_key__in=keys).values_list('client_key', 'result')
+        )
+        remaining = []
+        for index, punch in valid:
+            if punch['key'] in applied:
+                self.results[index] = {**applied[punch['key']], 'status': 'duplicate'}
+            else:
+                remaining.append((index, punch))
+        return remaining
+
+    def _load_staff(self, valid):
+        staff_ids = {punch['staff_id'] for _, punch in valid if punch.get('staff_id')}
+        positions = BusinessStaff.objects.filter(
+            Q(id__in=staff_ids) | Q(user=self.user, status='ACTIVE')
+        ).select_related('business')
+        self.staff_by_id = {staff.id: staff for staff in positions}
+        self.default_staff = next(
+            (staff for staff in positions if staff.user_id == self.user.id and staff.status == 'ACTIVE'),
+            None
+        )
+
+    def _load_cards(self, valid):
+        dates = set()
+        for _, punch in valid:
+            day = timezone.localdate(punch['timestamp'])
+            dates.update({day, day - timedelta(days=1)})
+        cards = HoursCard.objects.filter(staff_id__in=self.staff_by_id.keys(), date__in=dates)
+        self.cards = {(card.staff_id, card.date): card for card in cards}
+
+        clock_ins = [punch['timestamp'] for _, punch in valid if punch['type'] == 'IN']
+        if clock_ins:
+            ensure_horizon()
+            occurrences = ShiftOccurrence.objects.filter(
+                staff_id__in=self.staff_by_id.keys(),
+                start__lte=max(clock_ins) + CLOCK_IN_GRACE,
+                end__gt=min(clock_ins),
+            ).order_by('start')
+            for occurrence in occurrences:
+                self.occurrences.setdefault(occurrence.staff_id, []).append(occurrence)
+
+    def _check_geofences(self, valid):
+        """Run every worker clock-in that needs a location through one vectorized geofence call"""
+        keys, entries = [], []
+        for _, punch in valid:
+            if punch['type'] != 'IN' or punch.get('latitude') is None or punch.get('longitude') is None:
+                continue
+            try:
+                staff, by_owner = self._resolve_staff(punch)
+            except PunchError:
+                continue
+            if by_owner or not staff.business.require_location_for_clock_in:
+                continue
+            keys.append(punch['key'])
+            entries.append((staff.business, punch['latitude'], punch['longitude']))
+        if entries:
+            self.fences = dict(zip(keys, check_many(entries)))
+
+    def _resolve_staff(self, punch):
+        if not punch.get('staff_id'):
+            if not self.default_staff:
+                raise PunchError('No active staff record found')
+            return self.default_staff, False
+
+        staff = self.staff_by_id.get(punch['staff_id'])
+        if not staff:
+            raise PunchError('Staff not found')
+        if staff.status != 'ACTIVE':
+            raise PunchError(f'{staff.name} is not an active staff member')
+        if staff.user_id == self.user.id:
+            return staff, False
+        if staff.business.user_id == self.user.id:
+            return staff, True
+        raise PunchError('You can only punch for yourself or your own staff')
+
+    def _apply(self, punch):
+        staff, by_owner = self._resolve_staff(punch)
+        if punch['type'] == 'IN':
+            card = self._clock_in(staff, by_owner, punch)
+            status = 'created'
+        else:
+            card = self._clock_out(staff, punch)
+            status = 'updated'
+
+        result = {'key': punch['key'], 'status': status, 'hours_card_id': str(card.id)}
+        self.receipts.append(PunchReceipt(
+            user=self.user,
+            client_key=punch['key'],
+            punch_type=punch['type'],
+            hours_card=card,
+            result=result,
+        ))
+        return result
+
+    def _clock_in(self, staff, by_owner, punch):
+        day = timezone.localdate(punch['timestamp'])
+        if (staff.id, day) in self.cards:
+            raise PunchError(f'Hours already recorded for {staff.name} on {day.isoformat()}')
+
+        latitude, longitude = punch.get('latitude'), punch.get('longitude')
+        distance, work_site = None, None
+        if not by_owner and staff.business.require_location_for_clock_in:
+            if latitude is None or longitude is None:
+                raise PunchError('Location is required to clock in')
+            fence = self.fences[punch['key']]
+            if not fence.within:
+                raise PunchError(fence.message)
+            distance, work_site = fence.distance, fence.site
+
+        occurrence = next(
+            (o for o in self.occurrences.get(staff.id, [])
+             if o.start <= punch['timestamp'] + CLOCK_IN_GRACE and o.end > punch['timestamp']),
+            None
+        )
+        card = HoursCard(
+            staff=staff,
+            shift_id=occurrence.shift_id if occurrence else None,
+            date=day,
+            clock_in_datetime=punch['timestamp'],
+            clock_in_latitude=latitude,
+            clock_in_longitude=longitude,
+            clock_in_distance_meters=distance,
+            work_site=work_site,
+            notes=punch.get('notes', ''),
+            clocked_in_by=self.user,
+            status='PENDING'
+        )
+        self.cards[(staff.id, day)] = card
+        self.to_create[card.id] = card
+        return card
+
+    def _clock_out(self, staff, punch):
+        day = timezone.localdate(punch['timestamp'])
+        card = self.cards.get((staff.id, day))
+        if card is None or card.clock_out_datetime:
+            # Overnight shifts close the previous day's card
+            previous = self.cards.get((staff.id, day - timedelta(days=1)))
+            if previous is not None and not previous.clock_out_datetime:
+                card = previous
+        if card is None:
+            raise PunchError('No open hours card to clock out')
+        if card.clock_out_datetime:
+            raise PunchError('Already clocked out')
+        if card.clock_in_datetime and punch['timestamp'] < card.clock_in_datetime:
+            raise PunchError('Clock-out is before clock-in')
+
+        card.clock_out_datetime = punch['timestamp']
+        card.clocked_out_by = self.user
+        if punch.get('notes'):
+            card.notes = punch['notes']
+        if card.id not in self.to_create:
+            self.to_update[card.id] = card
+        return card
+
+    def _write(self):
+        now = timezone.now()
+        for card in [*self.to_create.values(), *self.to_update.values()]:
+            card.sync_derived_fields()
+            card.updated_at = now
+
+        with transaction.atomic():
+            HoursCard.objects.bulk_create(self.to_create.values())
+            HoursCard.objects.bulk_update(
+                self.to_update.values(),
+                ['clock_out_datetime', 'clock_out', 'clocked_out_by', 'notes', 'worked_seconds', 'updated_at']
+            )
+            PunchReceipt.objects.bulk_create(self.receipts)
+            refresh_for_cards([*self.to_create.values(), *self.to_update.values()])
+
+        roster.clocked_in(self.to_create.values())
+        roster.clocked_out([card for card in self.to_update.values() if card.clock_out_datetime])
+
+
+def apply_punch_batch(user, items):
+    """Apply queued punches; returns per-item results or raises IntegrityError on a concurrent write"""
+    return PunchBatch(user, items).run()
@@ -0,0 +1,210 @@
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncWeek
+
+from core.cache import Namespace, get_or_compute
+from .models import HoursCard
+from . import rollups
+
+
+LABOR_REPORTS = Namespace('labor-report')
+
+
+def overtime_rules():
+    """Weekly overtime threshold in hours and the pay multiplier applied above it"""
+    return (
+        getattr(settings, 'OVERTIME_WEEKLY_HOURS', 40),
+        getattr(settings, 'OVERTIME_MULTIPLIER', 1.5),
+    )
+
+
+def invalidate(business_id, day=None):
+    """Expire cached reports covering ``day``'s week, or every report for the business"""
+    if day is None:
+        LABOR_REPORTS.bump((business_id,))
+    else:
+        LABOR_REPORTS.bump((business_id, rollups.week_start_for(day).isoformat()))
+
+
+def invalidate_weeks(business_weeks):
+    """Expire cached reports for several (business_id, week_start) pairs with one write"""
+    if business_weeks:
+        LABOR_REPORTS.bump(*{(business_id, week.isoformat()) for business_id, week in business_weeks})
+
+
+def _cache_key(business_id, start, end, status):
+    """Report key that changes whenever any week it covers (or the business's rates) change"""
+    scopes = [(business_id,)]
+    week = rollups.week_start_for(start)
+    while week <= end:
+        scopes.append((business_id, week.isoformat()))
+        week += timedelta(days=7)
+    return LABOR_REPORTS.key(business_id, start, end, status or '', overtime_rules(), scopes=scopes)
+
+
+def _worked_cards(business, start, end, status=None):
+    cards = HoursCard.objects.filter(
+        staff__business=business,
+        date__gte=start,
+        date__lte=end,
+        worked_seconds__isnull=False,
+    )
+    if status:
+        cards = cards.filter(status=status)
+    return cards
+
+
+def _rate_seconds():
+    """worked_seconds x hourly_rate; divide the sum by 3600 for cost at the plain rate"""
+    return Sum(ExpressionWrapper(
+        F('worked_seconds') * F('staff__hourly_rate'),
+        output_field=DecimalField(max_digits=20, decimal_places=2)
+    ))
+
+
+def _sql_breakdown(cards, field):
+    """Hours, base cost and card count per value of ``field``"""
+    return list(
+        cards.values(field)
+        .annotate(seconds=Sum('worked_seconds'), rate_seconds=_rate_seconds(), cards=Count('id'))
+        .order_by(field)
+    )
+
+
+def _staff_day_overtime(business, start, end, status):
+    """
+    Overtime seconds per (staff, date) inside the period, computed in NumPy.
+
+    Weeks are Monday-based. Only staff with at least one week over the
+    threshold are loaded; their day rows (including the days of the first
+    week that fall before the period) are sorted by staff and date, a
+    cumulative sum is taken per staff-week, and each day's overtime is the
+    part of that day's hours past the weekly threshold.
+    """
+    threshold_hours, _ = overtime_rules()
+    threshold = threshold_hours * 3600
+    cards = _worked_cards(business, rollups.week_start_for(start), end, status)
+    over_staff = set(
+        cards.annotate(week=TruncWeek('date')).values('staff_id', 'week')
+        .annotate(seconds=Sum('worked_seconds'))
+        .filter(seconds__gt=threshold)
+        .values_list('staff_id', flat=True)
+    )
+    if not over_staff:
+        return []
+
+    rows = list(
+        cards.filter(staff_id__in=over_staff)
+        .order_by('staff_id', 'date')
+        .values_list('staff_id', 'date', 'worked_seconds', 'staff__hourly_rate', 'staff__department', 'staff__employment_type')
+    )
+    staff_ids, dates, seconds, rates, departments, employment_types = zip(*rows)
+
+    seconds = np.array(seconds, dtype=np.int64)
+    ordinals = np.array([day.toordinal() for day in dates], dtype=np.int64)
+    # date.toordinal() is 1 for Monday 0001-01-01, so (ordinal - 1) // 7 numbers Monday-based weeks
+    weeks = (ordinals - 1) // 7
+    _, staff_index = np.unique(np.array([str(staff_id) for staff_id in staff_ids]), return_inverse=True)
+
+    group = np.empty(len(seconds), dtype=bool)
+    group[0] = True
+    group[1:] = (staff_index[1:] != staff_index[:-1]) | (weeks[1:] != weeks[:-1])
+    running = np.cumsum(seconds)
+    group_offset = np.maximum.accumulate(np.where(group, running - seconds, 0))
+    cumulative = running - group_offset
+
+    overtime = np.maximum(cumulative - threshold, 0) - np.maximum(cumulative - seconds - threshold, 0)
+    in_period = ordinals >= start.toordinal()
+
+    return [
+        {
+            'date': dates[i],
+            'staff__department': departments[i],
+            'staff__employment_type': employment_types[i],
+            'seconds': int(overtime[i]),
+            'rate': float(rates[i]) if rates[i] is not None else None,
+        }
+        for i in np.flatnonzero((overtime > 0) & in_period)
+    ]
+
+
+def _premium(row, multiplier):
+    """Cost of overtime on top of the plain hourly rate already counted in the SQL totals"""
+    return row['seconds'] / 3600 * (row['rate'] or 0.0) * (multiplier - 1)
+
+
+def _combine(base_rows, overtime_rows, field, multiplier):
+    """Merge SQL totals with overtime for one breakdown, returning JSON-ready rows"""
+    overtime = {}
+    for row in overtime_rows:
+        seconds, premium = overtime.get(row[field], (0, 0.0))
+        overtime[row[field]] = (seconds + row['seconds'], premium + _premium(row, multiplier))
+
+    result = []
+    for row in base_rows:
+        overtime_seconds, premium = overtime.get(row[field], (0, 0.0))
+        base_cost = float(row['rate_seconds'] or 0) / 3600
+        result.append({
+            field.replace('staff__', ''): row[field],
+            'hours': round(row['seconds'] / 3600, 2),
+            'overtime_hours': round(overtime_seconds / 3600, 2),
+            'cost': round(base_cost + premium, 2),
+            'overtime_premium': round(premium, 2),
+            'cards': row['cards'],
+        })
+    return result
+
+
+def build_labor_report(business, start, end, status=None):
+    """Labor hours and cost for a business between two dates (inclusive), with weekly overtime"""
+    threshold_hours, multiplier = overtime_rules()
+    cards = _worked_cards(business, start, end, status)
+    overtime_rows = _staff_day_overtime(business, start, end, status)
+
+    by_day = _combine(_sql_breakdown(cards, 'date'), overtime_rows, 'date', multiplier)
+    for row in by_day:
+        row['date'] = row['date'].isoformat()
+
+    totals = cards.aggregate(
+        seconds=Sum('worked_seconds'),
+        rate_seconds=_rate_seconds(),
+        cards=Count('id'),
+    )
+    unrated = cards.filter(staff__hourly_rate__isnull=True).aggregate(seconds=Sum('worked_seconds'))['seconds'] or 0
+    seconds = totals['seconds'] or 0
+    overtime_seconds = sum(row['seconds'] for row in overtime_rows)
+    overtime_premium = sum(_premium(row, multiplier) for row in overtime_rows)
+
+    return {
+        'business': str(business.id),
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'status': status,
+        'overtime_rules': {'weekly_threshold_hours': threshold_hours, 'multiplier': multiplier},
+        'totals': {
+            'hours': round(seconds / 3600, 2),
+            'regular_hours': round((seconds - overtime_seconds) / 3600, 2),
+            'overtime_hours': round(overtime_seconds / 3600, 2),
+            'cost': round(float(totals['rate_seconds'] or 0) / 3600 + overtime_premium, 2),
+            'overtime_premium': round(overtime_premium, 2),
+            'unrated_hours': round(unrated / 3600, 2),
+            'cards': totals['cards'],
+        },
+        'by_day': by_day,
+        'by_department': _combine(_sql_breakdown(cards, 'staff__department'), overtime_rows, 'staff__department', multiplier),
+        'by_employment_type': _combine(
+            _sql_breakdown(cards, 'staff__employment_type'), overtime_rows, 'staff__employment_type', multiplier
+        ),
+    }
+
+
+def labor_report(business, start, end, status=None):
+    """Cached build_labor_report; entries expire when a covered week's cards or the business's staff change"""
+    return get_or_compute(
+        _cache_key(business.id, start, end, status),
+        lambda: build_labor_report(business, start, end, status),
+        getattr(settings, 'LABOR_REPORT_CACHE_SECONDS', 3600),
+    )
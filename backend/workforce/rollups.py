@@ -0,0 +1,120 @@
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncWeek
+
+from .models import BusinessStaff, HoursCard, HoursRollup
+from . import reports
+
+
+SUBMITTED_STATUSES = ('SIGNED', 'APPROVED')
+
+
+def week_start_for(day):
+    """Monday of the week containing ``day``"""
+    return day - timedelta(days=day.weekday())
+
+
+# Touched (staff, day) keys recomputed per round of grouped queries
+REFRESH_BATCH_SIZE = 250
+
+CARD_TOTALS = {
+    'worked_seconds': Sum('worked_seconds'),
+    'submitted_seconds': Sum('worked_seconds', filter=Q(status__in=SUBMITTED_STATUSES)),
+    'approved_seconds': Sum('worked_seconds', filter=Q(status='APPROVED')),
+    'card_count': Count('id'),
+}
+
+ROLLUP_FIELDS = ['business', *CARD_TOTALS, 'updated_at']
+
+
+def _grouped_totals(staff_ids, start, end, period):
+    """Card totals per (staff_id, day or week start), from one grouped aggregate"""
+    bucket = F('date') if period == 'DAY' else TruncWeek('date')
+    rows = (
+        HoursCard.objects.filter(staff_id__in=staff_ids, date__gte=start, date__lte=end)
+        .annotate(bucket=bucket).values('staff_id', 'bucket')
+        # Aggregates can't reuse the names of the model fields they sum
+        .annotate(**{f'total_{field}': total for field, total in CARD_TOTALS.items()}).order_by()
+    )
+    return {
+        (row['staff_id'], row['bucket']): {field: row[f'total_{field}'] or 0 for field in CARD_TOTALS}
+        for row in rows
+    }
+
+
+def _refresh(keys, business_ids):
+    """Recompute the day rollups for ``keys`` and the week rollups containing them"""
+    days = [day for _, day in keys]
+    weeks = {(staff_id, week_start_for(day)) for staff_id, day in keys}
+    staff_ids = {staff_id for staff_id, _ in keys}
+
+    day_totals = _grouped_totals(staff_ids, min(days), max(days), 'DAY')
+    week_start = min(week for _, week in weeks)
+    week_totals = _grouped_totals(staff_ids, week_start, max(days) + timedelta(days=6 - max(days).weekday()), 'WEEK')
+
+    stored, empty = [], []
+    for period, period_keys, totals in (('DAY', keys, day_totals), ('WEEK', weeks, week_totals)):
+        for staff_id, period_start in period_keys:
+            key_totals = totals.get((staff_id, period_start))
+            if key_totals:
+                stored.append(HoursRollup(
+                    staff_id=staff_id, business_id=business_ids[staff_id],
+                    period=period, period_start=period_start, **key_totals
+                ))
+            else:
+                empty.append(Q(staff_id=staff_id, period=period, period_start=period_start))
+
+    if empty:
+        HoursRollup.objects.filter(reduce(or_, empty)).delete()
+    HoursRollup.objects.bulk_create(
+        stored,
+        update_conflicts=True,
+        unique_fields=['staff', 'period', 'period_start'],
+        update_fields=ROLLUP_FIELDS,
+    )
+    reports.invalidate_weeks({(business_ids[staff_id], week) for staff_id, week in weeks})
+
+
+def refresh_staff_day(staff_id, day, business_id=None):
+    """Recompute the day rollup for one staff member and the week rollup containing it"""
+    if business_id is None:
+        business_id = BusinessStaff.objects.filter(id=staff_id).values_list('business_id', flat=True).first()
+        if business_id is None:
+            return
+    _refresh({(staff_id, day)}, {staff_id: business_id})
+
+
+def refresh_for_cards(cards):
+    """
+    Refresh rollups touched by a batch of cards (e.g. after bulk_create or queryset.update).
+
+    Each batch of touched (staff, day) keys costs a fixed handful of queries:
+    grouped day and week aggregates, one upsert and at most one delete.
+    """
+    keys = {(card.staff_id, card.date) for card in cards}
+    business_ids = dict(
+        BusinessStaff.objects.filter(id__in={staff_id for staff_id, _ in keys}).values_list('id', 'business_id')
+    ) if keys else {}
+    keys = sorted(key for key in keys if key[0] in business_ids)
+    for index in range(0, len(keys), REFRESH_BATCH_SIZE):
+        _refresh(keys[index:index + REFRESH_BATCH_SIZE], business_ids)
+
+
+def staff_hours_between(staff, start, end=None, field='approved_seconds'):
+    """Sum of rolled-up hours for a staff member from ``start`` (inclusive) to ``end`` (exclusive)"""
+    rows = HoursRollup.objects.filter(staff=staff, period='DAY', period_start__gte=start)
+    if end is not None:
+        rows = rows.filter(period_start__lt=end)
+    seconds = rows.aggregate(total=Sum(field))['total'] or 0
+    return seconds / 3600
+
+
+def business_week_hours(business, week_start, field='submitted_seconds'):
+    """Total rolled-up hours for all staff of a business in the given week"""
+    seconds = HoursRollup.objects.filter(
+        business=business, period='WEEK', period_start=week_start
+    ).aggregate(total=Sum(field))['total'] or 0
+    return seconds / 3600
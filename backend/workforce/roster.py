@@ -0,0 +1,152 @@
+import json
+import logging
+
+import redis
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from .models import BusinessStaff, HoursCard
+
+logger = logging.getLogger(__name__)
+
+# Field kept in every roster hash so an empty roster is distinguishable from one never built
+BUILT_MARKER = '__built__'
+
+# Updates a roster only if it has been built, checking and writing in one atomic step.
+# ARGV: marker field, 'set' or 'del', then field/value pairs for 'set' or fields for 'del'.
+UPDATE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+if ARGV[2] == 'set' then
+    for i = 3, #ARGV, 2 do
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+else
+    for i = 3, #ARGV do
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+return 1
+"""
+
+_client = None
+_update_script = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        timeout = getattr(settings, 'REDIS_SOCKET_TIMEOUT', 1.0)
+        options = {'decode_responses': True, 'socket_timeout': timeout, 'socket_connect_timeout': timeout}
+        if settings.REDIS_URL.startswith('rediss://'):
+            options['ssl_cert_reqs'] = None
+        _client = redis.Redis.from_url(settings.REDIS_URL, **options)
+    return _client
+
+
+def _update(key, action, values):
+    global _update_script
+    if _update_script is None:
+        _update_script = get_client().register_script(UPDATE_SCRIPT)
+    _update_script(keys=[key], args=[BUILT_MARKER, action, *values])
+
+
+def roster_key(business_id):
+    return f"roster:business:{business_id}"
+
+
+def roster_entry(card):
+    return {
+        'hours_card_id': str(card.id),
+        'staff_id': str(card.staff_id),
+        'staff_name': card.staff.name,
+        'clock_in_datetime': card.clock_in_datetime.isoformat() if card.clock_in_datetime else None,
+        'work_site_id': str(card.work_site_id) if card.work_site_id else None,
+    }
+
+
+def _open_cards(business_id):
+    return HoursCard.objects.open().filter(staff__business_id=business_id).select_related('staff')
+
+
+def _push(owner_id, action, entries):
+    channel_layer = get_channel_layer()
+    try:
+        async_to_sync(channel_layer.group_send)(
+            f"user_{owner_id}",
+            {
+                'type': 'roster_update',
+                'action': action,
+                'entries': entries,
+            }
+        )
+    except Exception as e:
+        logger.warning("Failed to push roster update: %s", e)
+
+
+def rebuild(business_id):
+    """Reload a business's roster hash from the open cards in the database"""
+    entries = {str(card.id): json.dumps(roster_entry(card)) for card in _open_cards(business_id)}
+    key = roster_key(business_id)
+    pipe = get_client().pipeline(transaction=True)
+    pipe.delete(key)
+    pipe.hset(key, mapping={BUILT_MARKER: '1', **entries})
+    # Bounds how long a missed update can leave the roster wrong
+    pipe.expire(key, getattr(settings, 'LIVE_ROSTER_TTL_SECONDS', 3600))
+    pipe.execute()
+    return [json.loads(entry) for entry in entries.values()]
+
+
+def get_roster(business_id):
+    """Everyone currently on the clock, read from Redis; rebuilt from the database on a miss"""
+    try:
+        entries = get_client().hgetall(roster_key(business_id))
+        if BUILT_MARKER not in entries:
+            return rebuild(business_id)
+        return [json.loads(value) for field, value in entries.items() if field != BUILT_MARKER]
+    except redis.RedisError as e:
+        logger.warning("Roster cache unavailable, reading from database: %s", e)
+        return [roster_entry(card) for card in _open_cards(business_id)]
+
+
+def _apply(cards, action):
+    by_business = {}
+    for card in cards:
+        by_business.setdefault((card.staff.business_id, card.staff.business.user_id), []).append(card)
+
+    for (business_id, owner_id), business_cards in by_business.items():
+        entries = [roster_entry(card) for card in business_cards]
+        key = roster_key(business_id)
+        if action == 'clock_in':
+            values = [value for entry in entries for value in (entry['hours_card_id'], json.dumps(entry))]
+        else:
+            values = [entry['hours_card_id'] for entry in entries]
+        try:
+            _update(key, 'set' if action == 'clock_in' else 'del', values)
+        except redis.RedisError as e:
+            logger.warning("Failed to update roster cache: %s", e)
+        _push(owner_id, action, entries)
+
+
+def clocked_in(cards):
+    """Add newly opened cards to their businesses' rosters and notify the owners"""
+    _apply([card for card in cards if card.clock_in_datetime and not card.clock_out_datetime], 'clock_in')
+
+
+def clocked_out(cards):
+    """Remove closed or deleted cards from their businesses' rosters and notify the owners"""
+    _apply(cards, 'clock_out')
+
+
+def card_deleted(card_id, staff_id):
+    """Drop a deleted card from its business's roster, if the staff member still exists"""
+    staff = BusinessStaff.objects.filter(id=staff_id).values('business_id', 'business__user_id').first()
+    if not staff:
+        return
+    try:
+        get_client().hdel(roster_key(staff['business_id']), str(card_id))
+    except redis.RedisError as e:
+        logger.warning("Failed to update roster cache: %s", e)
+    _push(staff['business__user_id'], 'clock_out', [{'hours_card_id': str(card_id), 'staff_id': str(staff_id)}])
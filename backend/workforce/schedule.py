@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core import cache
+from .models import Shift, ShiftOccurrence
+
+
+DAY_INDEX = {day: index for index, (day, _) in enumerate(Shift.DAYS_OF_WEEK)}
+
+# How early a worker may clock in and still be matched to a scheduled shift
+CLOCK_IN_GRACE = timedelta(hours=1)
+
+# Cache key holding the (exclusive) date occurrences have been generated up to
+HORIZON_KEY = 'shift-occurrences:through'
+
+# Day this process last made sure the horizon was current
+_checked_on = None
+
+
+def horizon_end(start=None):
+    weeks = getattr(settings, 'SHIFT_OCCURRENCE_HORIZON_WEEKS', 8)
+    return (start or timezone.localdate()) + timedelta(weeks=weeks)
+
+
+def occurrence_bounds(shift, day):
+    """Aware start/end datetimes of a shift on a date; shifts ending at or before their start run overnight"""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, shift.start_time), tz)
+    end = timezone.make_aware(datetime.combine(day, shift.end_time), tz)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def build_occurrences(shifts, start_date, end_date):
+    """Unsaved ShiftOccurrence rows for every active shift between start_date and end_date (exclusive)"""
+    occurrences = []
+    for shift in shifts:
+        if not shift.is_active:
+            continue
+        offset = (DAY_INDEX[shift.day_of_week] - start_date.weekday()) % 7
+        day = start_date + timedelta(days=offset)
+        while day < end_date:
+            start, end = occurrence_bounds(shift, day)
+            occurrences.append(ShiftOccurrence(
+                shift=shift,
+                business_id=shift.business_id,
+                staff_id=shift.staff_id,
+                date=day,
+                start=start,
+                end=end,
+            ))
+            day += timedelta(days=7)
+    return occurrences
+
+
+def regenerate_for_shifts(shifts, start_date=None):
+    """Replace upcoming occurrences of the given shifts; past occurrences are kept for history"""
+    start_date = start_date or timezone.localdate()
+    shifts = list(shifts)
+    with transaction.atomic():
+        ShiftOccurrence.objects.filter(shift__in=shifts, date__gte=start_date).delete()
+        ShiftOccurrence.objects.bulk_create(
+            build_occurrences(shifts, start_date, horizon_end(start_date)),
+            batch_size=1000,
+        )
+
+
+def extend_horizon(start_date=None, end_date=None):
+    """Create any missing occurrences up to the horizon for all active shifts; returns rows considered"""
+    start_date = start_date or timezone.localdate()
+    end_date = end_date or horizon_end(start_date)
+    shifts = Shift.objects.filter(is_active=True).only(
+        'id', 'business_id', 'staff_id', 'day_of_week', 'start_time', 'end_time', 'is_active'
+    )
+    created = ShiftOccurrence.objects.bulk_create(
+        build_occurrences(shifts.iterator(chunk_size=2000), start_date, end_date),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    cache.set(HORIZON_KEY, end_date, None)
+    return len(created)
+
+
+def ensure_horizon():
+    """
+    Keep the rolling horizon current without relying on a scheduled job.
+
+    Deploys run generate_shift_occurrences, but a deploy older than the
+    horizon would leave schedules, clock-in matching and attendance with no
+    occurrences to find. The first call each day per process extends from
+    where the last extension stopped; later calls that day cost nothing.
+    """
+    global _checked_on
+    today = timezone.localdate()
+    if _checked_on == today:
+        return
+    end = horizon_end(today)
+    through = cache.get(HORIZON_KEY)
+    if through is cache.MISS or through < end:
+        extend_horizon(today if through is cache.MISS else max(today, through), end)
+    _checked_on = today
+
+
+def current_occurrence(staff, moment):
+    """The scheduled occurrence a clock-in at ``moment`` belongs to, if any"""
+    ensure_horizon()
+    return ShiftOccurrence.objects.filter(
+        staff=staff,
+        start__lte=moment + CLOCK_IN_GRACE,
+        end__gt=moment,
+    ).order_by('start').first()
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import BusinessStaff, Shift, HoursCard, StaffInvitation
+from .models import BusinessStaff, WorkSite, Shift, ShiftOccurrence, HoursCard, StaffInvitation
 from drf_spectacular.utils import extend_schema_field
+from .overlaps import check_new_shifts
 
 
 class BusinessStaffSerializer(serializers.ModelSerializer):
@@ -24,14 +25,16 @@ class BusinessStaffSerializer(serializers.ModelSerializer):
     def get_total_hours_this_month(self, obj) -> float:
         from django.utils import timezone
         from datetime import datetime
+        from .rollups import staff_hours_between
+
+        # Annotated by BusinessStaffQuerySet.with_list_data on list/detail views
+        if hasattr(obj, 'month_approved_seconds'):
+            return obj.month_approved_seconds / 3600
+
         now = timezone.now()
         month_start = datetime(now.year, now.month, 1).date()
 
-        hours = obj.hours_cards.filter(
-            date__gte=month_start,
-            status='APPROVED'
-        )
-        return sum(card.total_hours_decimal for card in hours)
+        return staff_hours_between(obj, month_start)
 
     @extend_schema_field(serializers.CharField(allow_null=True))
     def get_invitation_status(self, obj):
@@ -61,6 +64,24 @@ class BusinessStaffListSerializer(serializers.ModelSerializer):
         ]
 
 
+class WorkSiteSerializer(serializers.ModelSerializer):
+    business_name = serializers.CharField(source='business.name', read_only=True)
+
+    class Meta:
+        model = WorkSite
+        fields = [
+            'id', 'business', 'business_name', 'name', 'address',
+            'latitude', 'longitude', 'radius_meters', 'is_active',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def validate_radius_meters(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Radius must be greater than zero")
+        return value
+
+
 class ShiftSerializer(serializers.ModelSerializer):
     staff_name = serializers.CharField(source='staff.name', read_only=True)
     business_name = serializers.CharField(source='business.name', read_only=True)
@@ -254,18 +275,21 @@ class ShiftSerializer(serializers.ModelSerializer):
         return validated
 
     def create(self, validated_data):
+        from django.db import transaction
+
         staff_ids = validated_data.pop('staff_list')
         days_list = validated_data.pop('day_list')
 
-        shifts = []
-        for staff_id in staff_ids:
-            for day in days_list:
-                shift = Shift.objects.create(
-                    staff_id=staff_id,
-                    day_of_week=day,
-                    **validated_data
-                )
-                shifts.append(shift)
+        shifts = [
+            Shift(staff_id=staff_id, day_of_week=day, **validated_data)
+            for staff_id in staff_ids
+            for day in days_list
+        ]
+        raise_on_overlaps(check_new_shifts(shifts))
+
+        with transaction.atomic():
+            for shift in shifts:
+                shift.save()
 
         return shifts[0] if shifts else None
 
@@ -281,9 +305,146 @@ class ShiftSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
+        raise_on_overlaps(check_new_shifts([instance], exclude_ids=[instance.id]))
         instance.save()
         return instance
 
+
+def raise_on_overlaps(overlaps):
+    if not overlaps:
+        return
+    names = {
+        str(staff_id): name for staff_id, name in BusinessStaff.objects.filter(
+            id__in={overlap.shift.staff_id for overlap in overlaps}
+        ).values_list('id', 'name')
+    }
+    raise serializers.ValidationError({
+        'overlaps': [
+            f"{names.get(str(overlap.shift.staff_id), overlap.shift.staff_id)}: {overlap}"
+            for overlap in overlaps
+        ]
+    })
+
+
+class ShiftCopySerializer(serializers.Serializer):
+    """Apply a template of shifts to many staff members in one request"""
+    business = serializers.UUIDField()
+    source_staff = serializers.UUIDField(required=False, help_text="Copy all active shifts of this staff member")
+    shift_ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    target_staff = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=1000)
+    skip_conflicts = serializers.BooleanField(default=False, help_text="Insert non-conflicting shifts instead of rejecting the whole copy")
+
+    def validate(self, attrs):
+        from business.models import Business
+
+        if not attrs.get('source_staff') and not attrs.get('shift_ids'):
+            raise serializers.ValidationError("Provide source_staff or shift_ids")
+
+        user = self.context['request'].user
+        business = Business.objects.filter(id=attrs['business'], user=user).first()
+        if not business:
+            raise serializers.ValidationError({'business': "You can only copy shifts within your own business"})
+
+        templates = Shift.objects.filter(business=business, is_active=True)
+        if attrs.get('shift_ids'):
+            templates = templates.filter(id__in=attrs['shift_ids'])
+        if attrs.get('source_staff'):
+            templates = templates.filter(staff_id=attrs['source_staff'])
+        templates = list(templates)
+        if not templates:
+            raise serializers.ValidationError("No active shifts found to copy")
+
+        targets = list(BusinessStaff.objects.filter(id__in=attrs['target_staff'], business=business))
+        missing = set(attrs['target_staff']) - {staff.id for staff in targets}
+        if missing:
+            raise serializers.ValidationError({'target_staff': [f"Staff not found in this business: {staff_id}" for staff_id in missing]})
+
+        attrs['business'] = business
+        attrs['templates'] = templates
+        attrs['targets'] = targets
+        return attrs
+
+    def build(self):
+        """
+        Unsaved copies plus their overlaps, validated in memory.
+
+        A copy landing on a deactivated shift with the same day and start
+        (unique per staff member) takes over that row's id, so saving
+        reactivates it instead of inserting a duplicate.
+        """
+        shifts = [
+            Shift(
+                business=self.validated_data['business'],
+                staff=staff,
+                name=template.name,
+                shift_type=template.shift_type,
+                day_of_week=template.day_of_week,
+                start_time=template.start_time,
+                end_time=template.end_time,
+                break_duration=template.break_duration,
+            )
+            for staff in self.validated_data['targets']
+            for template in self.validated_data['templates']
+            if template.staff_id != staff.id
+        ]
+        inactive = dict(
+            ((staff_id, day, start), shift_id)
+            for shift_id, staff_id, day, start in Shift.objects.filter(
+                staff__in=self.validated_data['targets'], is_active=False
+            ).values_list('id', 'staff_id', 'day_of_week', 'start_time')
+        )
+        self.reactivated = set()
+        for shift in shifts:
+            shift_id = inactive.get((shift.staff_id, shift.day_of_week, shift.start_time))
+            if shift_id:
+                shift.id = shift_id
+                self.reactivated.add(shift_id)
+        return shifts, check_new_shifts(shifts)
+
+    def save(self):
+        from django.db import transaction
+        from django.utils import timezone
+        from business import dashboard
+        from .schedule import regenerate_for_shifts
+
+        shifts, overlaps = self.build()
+        conflicting = {id(overlap.shift) for overlap in overlaps} | {id(overlap.other) for overlap in overlaps}
+        if overlaps and not self.validated_data['skip_conflicts']:
+            raise_on_overlaps(overlaps)
+
+        placed = [shift for shift in shifts if id(shift) not in conflicting]
+        reactivated = [shift for shift in placed if shift.id in self.reactivated]
+        now = timezone.now()
+        for shift in reactivated:
+            shift.updated_at = now
+        with transaction.atomic():
+            created = Shift.objects.bulk_create(
+                [shift for shift in placed if shift.id not in self.reactivated], batch_size=1000
+            )
+            Shift.objects.bulk_update(
+                reactivated,
+                ['name', 'shift_type', 'end_time', 'break_duration', 'is_active', 'updated_at'],
+                batch_size=1000,
+            )
+            regenerate_for_shifts([*created, *reactivated])
+            dashboard.invalidate([self.validated_data['business'].id])
+        return created, reactivated, [shift for shift in shifts if id(shift) in conflicting]
+
+
+class ShiftOccurrenceSerializer(serializers.ModelSerializer):
+    shift_name = serializers.CharField(source='shift.name', read_only=True)
+    shift_type = serializers.CharField(source='shift.shift_type', read_only=True)
+    staff_name = serializers.CharField(source='staff.name', read_only=True)
+
+    class Meta:
+        model = ShiftOccurrence
+        fields = [
+            'id', 'shift', 'shift_name', 'shift_type', 'business',
+            'staff', 'staff_name', 'date', 'start', 'end'
+        ]
+        read_only_fields = fields
+
+
 class HoursCardSerializer(serializers.ModelSerializer):
     staff_name = serializers.CharField(source='staff.name', read_only=True)
     shift_name = serializers.CharField(source='shift.name', read_only=True, allow_null=True)
@@ -317,11 +478,11 @@ class HoursCardSerializer(serializers.ModelSerializer):
             'approved_at', 'rejection_reason',
             'total_hours_decimal',
             'is_signed', 'is_clocked_out', 'is_approved',
-            'clock_in_distance_meters',
+            'clock_in_distance_meters', 'work_site',
             'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'clocked_in_by', 'clocked_out_by', 'worker_signed_at',
+            'id', 'clocked_in_by', 'clocked_out_by', 'worker_signed_at', 'work_site',
             'approved_by', 'approved_at', 'created_at', 'updated_at'
         ]
 
@@ -350,7 +511,48 @@ class HoursCardListSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.FloatField)
     def get_total_hours_decimal(self, obj) -> float:
-        return obj.total_hours_decimal
+        # Read the stored column rather than recomputing from clock/break times
+        return (obj.worked_seconds or 0) / 3600
+
+
+class WorkerPositionSerializer(serializers.ModelSerializer):
+    """
+    A worker's position with today's shifts, open card and week-to-date hours.
+    Expects the today_occurrences, open_cards and week_rollups prefetches from the me view.
+    """
+    business_name = serializers.CharField(source='business.name', read_only=True)
+    today_shifts = serializers.SerializerMethodField()
+    open_card = serializers.SerializerMethodField()
+    week_hours = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BusinessStaff
+        fields = [
+            'id', 'business', 'business_name', 'name', 'staff_id', 'job_title',
+            'department', 'employment_type', 'hourly_rate',
+            'today_shifts', 'open_card', 'week_hours'
+        ]
+        read_only_fields = fields
+
+    @extend_schema_field(ShiftOccurrenceSerializer(many=True))
+    def get_today_shifts(self, obj):
+        return ShiftOccurrenceSerializer(obj.today_occurrences, many=True).data
+
+    @extend_schema_field(serializers.DictField(allow_null=True))
+    def get_open_card(self, obj):
+        if not obj.open_cards:
+            return None
+        return HoursCardListSerializer(obj.open_cards[0]).data
+
+    @extend_schema_field(serializers.DictField(child=serializers.FloatField()))
+    def get_week_hours(self, obj):
+        rollup = obj.week_rollups[0] if obj.week_rollups else None
+        return {
+            'worked': round((rollup.worked_seconds if rollup else 0) / 3600, 2),
+            'submitted': round((rollup.submitted_seconds if rollup else 0) / 3600, 2),
+            'approved': round((rollup.approved_seconds if rollup else 0) / 3600, 2),
+        }
+
 
 class StaffInvitationSerializer(serializers.ModelSerializer):
     business_name = serializers.CharField(source='business.name', read_only=True)
@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import BusinessStaff, HoursCard, Shift
+from . import reports, rollups, roster, schedule
+
+
+@receiver(post_init, sender=HoursCard)
+def remember_rollup_key(sender, instance, **kwargs):
+    """Keep the original (staff, date) so edits that move a card refresh both buckets"""
+    instance._rollup_key = (instance.staff_id, instance.date)
+
+
+@receiver(post_save, sender=HoursCard)
+def refresh_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_key', None)
+    current = (instance.staff_id, instance.date)
+    rollups.refresh_staff_day(*current)
+    if previous and previous != current and all(previous):
+        rollups.refresh_staff_day(*previous)
+    instance._rollup_key = current
+
+
+@receiver(post_init, sender=HoursCard)
+def remember_open_state(sender, instance, **kwargs):
+    # Unknown (None) when the clock fields were deferred, so loading never costs a query
+    loaded = instance.__dict__
+    if 'clock_in_datetime' in loaded and 'clock_out_datetime' in loaded:
+        instance._was_open = instance.is_open
+    else:
+        instance._was_open = None
+
+
+@receiver(post_save, sender=HoursCard)
+def update_roster_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the live roster in step with cards saved anywhere (clock-out, edits, manual entries).
+
+    Bulk writes bypass signals; the punch batch and the sweeper update the roster themselves.
+    """
+    if raw:
+        return
+    was_open = False if created else getattr(instance, '_was_open', None)
+    instance._was_open = instance.is_open
+    if instance.is_open:
+        transaction.on_commit(lambda: roster.clocked_in([instance]))
+    elif was_open is not False:
+        transaction.on_commit(lambda: roster.clocked_out([instance]))
+
+
+@receiver(post_delete, sender=HoursCard)
+def refresh_rollups_on_delete(sender, instance, **kwargs):
+    # Deferred so cascades from a staff delete don't recreate rows for the removed staff
+    card_id, staff_id, day = instance.id, instance.staff_id, instance.date
+    transaction.on_commit(lambda: rollups.refresh_staff_day(staff_id, day))
+    if instance.is_open:
+        transaction.on_commit(lambda: roster.card_deleted(card_id, staff_id))
+
+
+@receiver(post_save, sender=Shift)
+def regenerate_occurrences_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule.regenerate_for_shifts([instance])
+
+
+@receiver(post_save, sender=BusinessStaff)
+def invalidate_reports_on_staff_save(sender, instance, raw=False, **kwargs):
+    # Rates, departments and employment types feed every labor report of the business
+    if raw:
+        return
+    reports.invalidate(instance.business_id)
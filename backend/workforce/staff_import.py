@@ -0,0 +1,143 @@
+import csv
+import io
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+
+from business import dashboard
+from .models import BusinessStaff, StaffInvitation, generate_staff_ids
+
+logger = logging.getLogger(__name__)
+
+MAX_IMPORT_ROWS = 2000
+
+
+class StaffImportRowSerializer(serializers.Serializer):
+    """One row of a staff import; ``user_email`` invites an existing worker account"""
+    name = serializers.CharField(max_length=255)
+    job_title = serializers.CharField(max_length=255)
+    department = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    employment_type = serializers.ChoiceField(choices=BusinessStaff.EMPLOYMENT_TYPES, required=False, default='FULL_TIME')
+    email = serializers.EmailField(max_length=255, required=False, allow_blank=True, default='')
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True, default='')
+    hourly_rate = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True, default=None)
+    hire_date = serializers.DateField(required=False, allow_null=True, default=None)
+    user_email = serializers.EmailField(required=False, allow_blank=True, default='')
+
+    def to_internal_value(self, data):
+        # CSV cells arrive as strings; treat empty optional cells as missing
+        data = {key: value for key, value in data.items() if key and value not in ('', None)}
+        return super().to_internal_value(data)
+
+
+def read_csv(text):
+    """Rows of a CSV export as dicts keyed by lower-cased header"""
+    reader = csv.DictReader(io.StringIO(text.lstrip('\ufeff')))
+    return [
+        {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+        for row in reader
+    ]
+
+
+class StaffImport:
+    """
+    Validate and create many staff members for one business.
+
+    All rows are validated in memory, linked worker accounts and existing
+    positions are looked up with one query each, staff IDs are allocated in
+    one batch and staff and invitations are inserted with bulk_create.
+    Each invited worker gets a single notification once the import commits.
+    """
+
+    def __init__(self, business, rows, skip_invalid=False):
+        self.business = business
+        self.rows = rows
+        self.skip_invalid = skip_invalid
+        self.errors = []
+
+    def validate(self):
+        valid = []
+        for index, row in enumerate(self.rows, start=1):
+            serializer = StaffImportRowSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                self.errors.append({'row': index, 'errors': serializer.errors})
+
+        user_emails = {data['user_email'].lower() for _, data in valid if data['user_email']}
+        users = {
+            user.email.lower(): user
+            for user in get_user_model().objects.annotate(email_lower=Lower('email')).filter(email_lower__in=user_emails)
+        } if user_emails else {}
+        already_staff = set(
+            BusinessStaff.objects.filter(business=self.business, user__in=users.values()).values_list('user_id', flat=True)
+        ) if users else set()
+
+        checked, seen_users = [], set()
+        for index, data in valid:
+            user = users.get(data['user_email'].lower()) if data['user_email'] else None
+            if data['user_email'] and user is None:
+                self.errors.append({'row': index, 'errors': {'user_email': ['No account found with this email']}})
+            elif user is not None and (user.id in already_staff or user.id in seen_users):
+                self.errors.append({'row': index, 'errors': {'user_email': ['This worker is already on your staff']}})
+            else:
+                if user is not None:
+                    seen_users.add(user.id)
+                checked.append((data, user))
+        self.errors.sort(key=lambda error: error['row'])
+        return checked
+
+    def run(self):
+        """Create the staff; returns the created records, or [] if rows were rejected"""
+        checked = self.validate()
+        if self.errors and not self.skip_invalid:
+            return []
+
+        staff_ids = generate_staff_ids(len(checked))
+        today = timezone.localdate()
+        staff_members, invitations = [], []
+        for (data, user), staff_id in zip(checked, staff_ids):
+            fields = {key: value for key, value in data.items() if key != 'user_email' and value is not None}
+            fields.setdefault('hire_date', today)
+            if user is not None and not fields['email']:
+                fields['email'] = user.email
+            staff = BusinessStaff(business=self.business, user=user, staff_id=staff_id, is_confirmed=user is None, **fields)
+            staff_members.append(staff)
+            if user is not None:
+                invitations.append(StaffInvitation(
+                    staff=staff,
+                    business=self.business,
+                    worker=user,
+                    message=f"You've been invited to join {self.business.name} as {staff.job_title}"
+                ))
+
+        with transaction.atomic():
+            BusinessStaff.objects.bulk_create(staff_members, batch_size=500)
+            StaffInvitation.objects.bulk_create(invitations, batch_size=500)
+            worker_ids = {invitation.worker_id for invitation in invitations}
+            transaction.on_commit(lambda: notify_invited(worker_ids))
+            # bulk_create skips post_save, so the dashboard counters are dropped here
+            dashboard.invalidate([self.business.id])
+        return staff_members
+
+
+def notify_invited(worker_ids):
+    """One invitation_update event per invited worker"""
+    channel_layer = get_channel_layer()
+    for worker_id in worker_ids:
+        try:
+            async_to_sync(channel_layer.group_send)(
+                f"user_{worker_id}",
+                {
+                    'type': 'invitation_update',
+                    'action': 'new_invitation'
+                }
+            )
+        except Exception as e:
+            logger.warning("Failed to notify invited worker: %s", e)
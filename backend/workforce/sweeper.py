@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import claim_period
+from .models import HoursCard, ShiftOccurrence
+from .rollups import refresh_for_cards
+from . import roster
+
+
+AUTO_CLOSE_NOTE = "[Auto-closed: left open past the limit. Please confirm the clock-out time.]"
+
+
+def max_open_duration():
+    return timedelta(hours=getattr(settings, 'OPEN_CARD_MAX_HOURS', 16))
+
+
+def _scheduled_ends(cards):
+    """Scheduled end of each card's shift occurrence on its date, in one query"""
+    keys = {(card.shift_id, card.date) for card in cards if card.shift_id}
+    if not keys:
+        return {}
+    occurrences = ShiftOccurrence.objects.filter(
+        shift_id__in={shift_id for shift_id, _ in keys},
+        date__in={day for _, day in keys},
+    ).values_list('shift_id', 'date', 'end')
+    return {(shift_id, day): end for shift_id, day, end in occurrences if (shift_id, day) in keys}
+
+
+def sweep_open_cards(now=None, dry_run=False):
+    """
+    Close cards still open after OPEN_CARD_MAX_HOURS.
+
+    A card linked to a scheduled shift is closed at the shift's end; any
+    other card is closed at its clock-in time so no unverified hours are
+    counted. Either way auto_closed_at is set and a note added so the owner
+    can correct the times. Returns the swept cards.
+    """
+    now = now or timezone.now()
+    cards = list(
+        HoursCard.objects.open()
+        .filter(clock_in_datetime__lt=now - max_open_duration())
+        .with_access()
+    )
+    if not cards or dry_run:
+        return cards
+
+    scheduled_ends = _scheduled_ends(cards)
+    for card in cards:
+        end = scheduled_ends.get((card.shift_id, card.date))
+        card.clock_out_datetime = end if end and end > card.clock_in_datetime else card.clock_in_datetime
+        card.clock_out = None
+        card.auto_closed_at = now
+        card.updated_at = now
+        card.notes = f"{card.notes}\n{AUTO_CLOSE_NOTE}".strip()
+        card.sync_derived_fields()
+
+    with transaction.atomic():
+        # Guard against cards clocked out while the sweep was running
+        still_open = set(
+            HoursCard.objects.open().select_for_update()
+            .filter(id__in=[card.id for card in cards]).values_list('id', flat=True)
+        )
+        cards = [card for card in cards if card.id in still_open]
+        HoursCard.objects.bulk_update(
+            cards,
+            ['clock_out_datetime', 'clock_out', 'worked_seconds', 'auto_closed_at', 'notes', 'updated_at'],
+            batch_size=500,
+        )
+
+    refresh_for_cards(cards)
+    roster.clocked_out(cards)
+    return cards
+
+
+def sweep_if_due():
+    """
+    Sweep at most once every OPEN_CARD_SWEEP_MINUTES, from whichever request gets there first.
+
+    Nothing else schedules sweep_open_hours_cards, so requests that show or
+    create open cards call this; when no sweep is due it costs nothing.
+    """
+    interval = getattr(settings, 'OPEN_CARD_SWEEP_MINUTES', 60) * 60
+    if claim_period('sweep-open-cards', int(time.time() // interval), interval):
+        sweep_open_cards()
@@ -1,3 +1,626 @@
-from django.test import TestCase
+import uuid
+from datetime import date, datetime, time, timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.core import signing
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from authentication.models import User
+from business.models import Business
+from core import cache
+from .models import (
+    AttendanceSummary, BusinessStaff, HoursCard, HoursRollup, IdempotencyRecord, PunchReceipt, Shift,
+    ShiftOccurrence, StaffInvitation,
+)
+from . import schedule
+from .calendar_feeds import _fold, feed_token, read_token, rotate_feed_key
+from .idempotency import fingerprint, idempotent
+from .overlaps import check_new_shifts, find_overlaps
+from .reports import _staff_day_overtime, build_labor_report
+from .sweeper import sweep_open_cards
+
+
+class StaffListQueryCountTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='x', account_type='BUSINESS')
+        self.business = Business.objects.create(
+            user=self.owner, name='Cafe', category='RESTAURANT', email='cafe@example.com',
+            phone='1', address='1 Street', city='City', country='Country'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def add_staff(self, count):
+        first_of_month = timezone.localdate().replace(day=1)
+        clock_in = timezone.make_aware(datetime.combine(first_of_month, time(8)))
+        for index in range(count):
+            worker = User.objects.create_user(email=f'worker{index}-{count}@example.com', password='x')
+            staff = BusinessStaff.objects.create(
+                business=self.business, user=worker, name=f'Worker {index}', job_title='Barista'
+            )
+            StaffInvitation.objects.create(staff=staff, business=self.business, worker=worker)
+            HoursCard.objects.create(
+                staff=staff, date=first_of_month, status='APPROVED',
+                clock_in_datetime=clock_in, clock_out_datetime=clock_in + timedelta(hours=8)
+            )
+
+    def list_staff(self):
+        response = self.client.get('/workforce/staff/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_staff(2)
+        with self.assertNumQueries(2):
+            self.list_staff()
+
+        self.add_staff(8)
+        with self.assertNumQueries(2):
+            rows = self.list_staff()
+        self.assertEqual(len(rows), 10)
+
+    def test_rows_carry_hours_and_invitation(self):
+        self.add_staff(1)
+        row = self.list_staff()[0]
+        self.assertEqual(row['business_name'], 'Cafe')
+        self.assertEqual(row['invitation_status'], 'PENDING')
+        self.assertEqual(row['total_hours_this_month'], 8)
+
+    def test_staff_without_invitation(self):
+        BusinessStaff.objects.create(business=self.business, name='Walk-in', job_title='Cook')
+        row = self.list_staff()[0]
+        self.assertIsNone(row['invitation_status'])
+        self.assertEqual(row['total_hours_this_month'], 0)
+
+
+STAFF_ID = uuid.uuid4()
+
+
+def shift(day, start, end, staff_id=None, **kwargs):
+    """Unsaved shift for one staff member; start and end are (hour, minute)"""
+    return Shift(
+        staff_id=staff_id or STAFF_ID, day_of_week=day,
+        start_time=time(*start), end_time=time(*end), **kwargs
+    )
+
+
+class FindOverlapsTests(SimpleTestCase):
+    def test_touching_shifts_do_not_overlap(self):
+        self.assertEqual(find_overlaps([shift('MONDAY', (8, 0), (12, 0)), shift('MONDAY', (12, 0), (16, 0))]), [])
+
+    def test_overlapping_shifts(self):
+        first, second = shift('MONDAY', (8, 0), (12, 0)), shift('MONDAY', (11, 30), (16, 0))
+        overlaps = find_overlaps([first, second])
+        self.assertEqual([(overlap.shift, overlap.other) for overlap in overlaps], [(second, first)])
+
+    def test_other_staff_and_inactive_shifts_are_ignored(self):
+        self.assertEqual(find_overlaps([
+            shift('MONDAY', (8, 0), (12, 0)),
+            shift('MONDAY', (9, 0), (13, 0), staff_id=uuid.uuid4()),
+            shift('MONDAY', (10, 0), (14, 0), is_active=False),
+        ]), [])
+
+    def test_overnight_shift_runs_into_the_next_day(self):
+        night = shift('TUESDAY', (22, 0), (6, 0))
+        self.assertEqual(len(find_overlaps([night, shift('WEDNESDAY', (5, 0), (9, 0))])), 1)
+        self.assertEqual(find_overlaps([night, shift('WEDNESDAY', (6, 0), (9, 0))]), [])
+
+    def test_sunday_overnight_shift_wraps_to_monday(self):
+        night = shift('SUNDAY', (22, 0), (6, 0))
+        self.assertEqual(len(find_overlaps([night, shift('MONDAY', (5, 0), (9, 0))])), 1)
+        self.assertEqual(find_overlaps([night, shift('MONDAY', (6, 0), (9, 0))]), [])
+
+
+class ShiftOverlapUpdateTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='x', account_type='BUSINESS')
+        self.business = Business.objects.create(
+            user=self.owner, name='Cafe', category='RESTAURANT', email='cafe@example.com',
+            phone='1', address='1 Street', city='City', country='Country'
+        )
+        self.staff = BusinessStaff.objects.create(business=self.business, name='Worker', job_title='Barista')
+        self.morning = Shift.objects.create(
+            business=self.business, staff=self.staff, name='Morning', day_of_week='MONDAY',
+            start_time=time(8), end_time=time(12)
+        )
+        self.afternoon = Shift.objects.create(
+            business=self.business, staff=self.staff, name='Afternoon', day_of_week='MONDAY',
+            start_time=time(12), end_time=time(16)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def patch(self, shift, **data):
+        data.update(staff=[str(self.staff.id)], day_of_week=[shift.day_of_week])
+        return self.client.patch(f'/workforce/shifts/{shift.id}/', data, format='json')
+
+    def test_updated_shift_is_not_checked_against_itself(self):
+        self.morning.start_time = time(7)
+        self.assertEqual(check_new_shifts([self.morning], exclude_ids=[self.morning.id]), [])
+
+        response = self.patch(self.morning, start_time='07:00')
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_into_another_shift_is_rejected(self):
+        response = self.patch(self.morning, end_time='13:00')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('overlaps', response.json())
+        self.morning.refresh_from_db()
+        self.assertEqual(self.morning.end_time, time(12))
+
+
+def create_business(email, name='Cafe'):
+    owner = User.objects.create_user(email=email, password='x', account_type='BUSINESS')
+    return Business.objects.create(
+        user=owner, name=name, category='RESTAURANT', email=f'cafe-{email}',
+        phone='1', address='1 Street', city='City', country='Country'
+    )
+
+
+class PunchBatchTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+        self.owner = self.business.user
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.clock_in = timezone.now().replace(microsecond=0) - timedelta(hours=3)
+        # The first clock-in of the day may extend the shift horizon; keep that out of the counts
+        schedule.ensure_horizon()
+
+    def add_staff(self, count):
+        return [
+            BusinessStaff.objects.create(business=self.business, name=f'Worker {index}', job_title='Barista')
+            for index in range(count)
+        ]
+
+    def punch(self, *punches):
+        response = self.client.post('/workforce/punches/batch/', {'punches': list(punches)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def shift_punches(self, staff, prefix):
+        return [
+            punch
+            for member in staff
+            for punch in (
+                {'key': f'{prefix}-in-{member.id}', 'type': 'IN', 'timestamp': self.clock_in.isoformat(),
+                 'staff_id': str(member.id)},
+                {'key': f'{prefix}-out-{member.id}', 'type': 'OUT',
+                 'timestamp': (self.clock_in + timedelta(hours=2)).isoformat(), 'staff_id': str(member.id)},
+            )
+        ]
+
+    def test_query_count_does_not_grow_with_batch(self):
+        counts = []
+        for prefix, size in (('small', 2), ('large', 10)):
+            staff = self.add_staff(size)
+            with CaptureQueriesContext(connection) as queries:
+                data = self.punch(*self.shift_punches(staff, prefix))
+            self.assertEqual(data['applied'], 2 * size)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+        day = timezone.localdate(self.clock_in)
+        rollups = HoursRollup.objects.filter(business=self.business, period='DAY', period_start=day)
+        self.assertEqual(rollups.count(), 12)
+        self.assertEqual({rollup.worked_seconds for rollup in rollups}, {2 * 3600})
+
+    def test_timestamps_outside_the_clock_skew_and_offline_window_are_rejected(self):
+        staff = self.add_staff(3)
+        now = timezone.now()
+        data = self.punch(*[
+            {'key': key, 'type': 'IN', 'timestamp': timestamp.isoformat(), 'staff_id': str(member.id)}
+            for key, timestamp, member in (
+                ('ahead', now + timedelta(hours=1), staff[0]),
+                ('stale', now - timedelta(hours=100), staff[1]),
+                ('skewed', now + timedelta(minutes=2), staff[2]),
+            )
+        ])
+        results = {result['key']: result for result in data['results']}
+        self.assertIn('timestamp', results['ahead']['error'])
+        self.assertIn('timestamp', results['stale']['error'])
+        self.assertEqual(results['skewed']['status'], 'created')
+        self.assertEqual(data['failed'], 2)
+
+    def test_worker_clock_in_is_geofenced(self):
+        self.business.workplace_latitude, self.business.workplace_longitude = 52.5, 13.4
+        self.business.require_location_for_clock_in = True
+        self.business.save()
+        worker = User.objects.create_user(email='worker@example.com', password='x')
+        BusinessStaff.objects.create(business=self.business, user=worker, name='Worker', job_title='Barista')
+        self.client.force_authenticate(worker)
+
+        punch = {'type': 'IN', 'timestamp': self.clock_in.isoformat()}
+        far = self.punch({**punch, 'key': 'far', 'latitude': 52.6, 'longitude': 13.4})['results'][0]
+        self.assertEqual(far['status'], 'error')
+        self.assertIn('within', far['error'])
+        near = self.punch({**punch, 'key': 'near', 'latitude': 52.5002, 'longitude': 13.4})['results'][0]
+        self.assertEqual(near['status'], 'created')
+        self.assertLess(HoursCard.objects.get(id=near['hours_card_id']).clock_in_distance_meters, 100)
+
+    def test_received_keys_are_replayed(self):
+        punches = self.shift_punches(self.add_staff(1), 'replay')
+        first = self.punch(*punches)
+        self.assertEqual(PunchReceipt.objects.filter(user=self.owner).count(), 2)
+
+        again = self.punch(*punches)
+        self.assertEqual((again['applied'], again['duplicates']), (0, 2))
+        self.assertEqual(
+            [result['hours_card_id'] for result in again['results']],
+            [result['hours_card_id'] for result in first['results']],
+        )
+        self.assertEqual(HoursCard.objects.count(), 1)
+
+
+class SweepOpenCardsTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+
+    def open_cards(self, count, hours_ago=20):
+        clock_in = timezone.now() - timedelta(hours=hours_ago)
+        for index in range(count):
+            staff = BusinessStaff.objects.create(business=self.business, name=f'Worker {index}', job_title='Barista')
+            HoursCard.objects.create(staff=staff, date=timezone.localdate(clock_in), clock_in_datetime=clock_in)
+
+    def test_query_count_does_not_grow_with_cards(self):
+        counts = []
+        for size in (2, 10):
+            self.open_cards(size)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(len(sweep_open_cards()), size)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_closes_only_stale_cards_at_clock_in(self):
+        self.open_cards(1)
+        self.open_cards(1, hours_ago=2)
+        swept = sweep_open_cards()
+        self.assertEqual(len(swept), 1)
+        card = HoursCard.objects.get(id=swept[0].id)
+        self.assertEqual(card.clock_out_datetime, card.clock_in_datetime)
+        self.assertIsNotNone(card.auto_closed_at)
+        self.assertEqual(HoursCard.objects.open().count(), 1)
+        rollup = HoursRollup.objects.get(staff=card.staff, period='DAY', period_start=card.date)
+        self.assertEqual((rollup.card_count, rollup.worked_seconds), (1, 0))
+
+    def test_roster_request_runs_a_due_sweep(self):
+        self.open_cards(1)
+        cache._claimed_periods.clear()
+        client = APIClient()
+        client.force_authenticate(self.business.user)
+
+        self.assertEqual(client.get('/workforce/live-roster/').status_code, 200)
+        self.assertEqual(HoursCard.objects.open().count(), 0)
+
+        self.open_cards(1)
+        client.get('/workforce/live-roster/')
+        self.assertEqual(HoursCard.objects.open().count(), 1)
+
+
+class ShiftHorizonTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+        staff = BusinessStaff.objects.create(business=self.business, name='Worker', job_title='Barista')
+        Shift.objects.create(
+            business=self.business, staff=staff, name='Morning', day_of_week='MONDAY',
+            start_time=time(8), end_time=time(12)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.business.user)
+
+    def test_schedule_extends_a_stale_horizon_once_a_day(self):
+        ShiftOccurrence.objects.all().delete()
+        schedule._checked_on = None
+
+        response = self.client.get('/workforce/schedule/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ShiftOccurrence.objects.count(), 8)
+        self.assertEqual(len(response.data['results']), 8)
+
+        with CaptureQueriesContext(connection) as queries:
+            schedule.ensure_horizon()
+        self.assertEqual(len(queries), 0)
+
+
+class AttendanceRefreshTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+        staff = BusinessStaff.objects.create(business=self.business, name='Worker', job_title='Barista')
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Shift.objects.create(
+            business=self.business, staff=staff, name='Morning', day_of_week=Shift.DAYS_OF_WEEK[yesterday.weekday()][0],
+            start_time=time(8), end_time=time(12)
+        )
+        schedule.extend_horizon(yesterday)
+        self.client = APIClient()
+        self.client.force_authenticate(self.business.user)
+        cache._claimed_periods.clear()
+
+    def report(self):
+        today = timezone.localdate()
+        response = self.client.get('/workforce/reports/attendance/', {
+            'business': self.business.id,
+            'from': (today - timedelta(days=7)).isoformat(),
+            'to': today.isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_first_report_of_the_day_refreshes_summaries(self):
+        data = self.report()
+        yesterday = timezone.localdate() - timedelta(days=1)
+        self.assertEqual(data['summarized_through'], yesterday.isoformat())
+        self.assertEqual(data['totals']['no_shows'], 1)
+        self.assertEqual(AttendanceSummary.objects.filter(business=self.business).count(), 1)
+
+        AttendanceSummary.objects.all().delete()
+        self.assertIsNone(self.report()['summarized_through'])
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+        self.staff = BusinessStaff.objects.create(business=self.business, name='Worker', job_title='Barista')
+        self.client = APIClient()
+        self.client.force_authenticate(self.business.user)
+
+    def clock_in(self, key, **data):
+        return self.client.post(
+            '/workforce/clock-in/', {'staff_id': str(self.staff.id), **data}, format='json',
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.clock_in('abc')
+        self.assertEqual(first.status_code, 201)
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+
+        retry = self.clock_in('abc')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(HoursCard.objects.filter(staff=self.staff).count(), 1)
+
+    def test_key_reused_with_a_different_body_is_rejected(self):
+        self.clock_in('abc')
+        response = self.clock_in('abc', notes='different')
+        self.assertEqual(response.status_code, 422)
+
+    def test_claim_in_progress_conflicts_until_its_lease_runs_out(self):
+        record = IdempotencyRecord.objects.create(
+            user=self.business.user, scope='clock_in', key='abc',
+            request_fingerprint=fingerprint({'staff_id': str(self.staff.id)}),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.assertEqual(self.clock_in('abc').status_code, 409)
+
+        IdempotencyRecord.objects.filter(id=record.id).update(created_at=timezone.now() - timedelta(hours=1))
+        response = self.clock_in('abc')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(IdempotencyRecord.objects.filter(id=record.id).exists())
+        self.assertEqual(IdempotencyRecord.objects.get(key='abc').status_code, 201)
+
+    def test_client_errors_are_replayed(self):
+        response = self.clock_in('abc', staff_id=str(uuid.uuid4()))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(IdempotencyRecord.objects.get(key='abc').status_code, 404)
+
+    def test_server_error_releases_the_key(self):
+        statuses = [500, 201]
+
+        @api_view(['POST'])
+        @idempotent('test')
+        def view(request):
+            return Response({'attempt': len(statuses)}, status=statuses.pop(0))
+
+        def post():
+            request = APIRequestFactory().post('/', {}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+            force_authenticate(request, self.business.user)
+            return view(request)
+
+        self.assertEqual(post().status_code, 500)
+        self.assertFalse(IdempotencyRecord.objects.filter(key='abc').exists())
+        self.assertEqual(post().status_code, 201)
+        self.assertEqual(IdempotencyRecord.objects.get(key='abc').status_code, 201)
+
+
+class BulkReviewTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+        self.other_business = create_business('other@example.com', name='Diner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.business.user)
+        self.day = timezone.localdate() - timedelta(days=1)
+
+    def card(self, business=None, status='SIGNED'):
+        staff = BusinessStaff.objects.create(business=business or self.business, name='Worker', job_title='Barista')
+        clock_in = timezone.make_aware(datetime.combine(self.day, time(8)))
+        return HoursCard.objects.create(
+            staff=staff, date=self.day, status=status,
+            clock_in_datetime=clock_in, clock_out_datetime=clock_in + timedelta(hours=8),
+            worker_signed_at=timezone.now() if status != 'PENDING' else None,
+        )
+
+    def review(self, **data):
+        return self.client.post('/workforce/hours-cards/bulk-approve/', data, format='json')
+
+    def test_only_signed_cards_of_own_businesses_are_approved(self):
+        signed, approved, pending = self.card(), self.card(status='APPROVED'), self.card(status='PENDING')
+        foreign = self.card(business=self.other_business)
+        missing = uuid.uuid4()
+
+        response = self.review(
+            status='APPROVED', hours_card_ids=[str(card_id) for card_id in (
+                signed.id, approved.id, pending.id, foreign.id, missing
+            )],
+        )
+        self.assertEqual(response.status_code, 200)
+        outcomes = {result['hours_card_id']: result['outcome'] for result in response.data['results']}
+        self.assertEqual(outcomes, {
+            str(signed.id): 'approved',
+            str(approved.id): 'already_approved',
+            str(pending.id): 'not_signed',
+            str(foreign.id): 'not_found',
+            str(missing): 'not_found',
+        })
+        self.assertEqual((response.data['approved'], response.data['skipped']), (1, 4))
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'SIGNED')
+
+        rollup = HoursRollup.objects.get(staff=signed.staff, period='DAY', period_start=self.day)
+        self.assertEqual(rollup.approved_seconds, 8 * 3600)
+
+    def test_non_object_body_is_rejected(self):
+        response = self.client.post('/workforce/hours-cards/bulk-approve/', [], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_date_range_review_is_limited_to_the_business(self):
+        own, foreign = self.card(), self.card(business=self.other_business)
+        second_business = Business.objects.create(
+            user=self.business.user, name='Bar', category='RESTAURANT', email='bar@example.com',
+            phone='1', address='1 Street', city='City', country='Country'
+        )
+        elsewhere = self.card(business=second_business)
+
+        response = self.review(
+            status='REJECTED', rejection_reason='Wrong times', business=str(self.business.id),
+            **{'from': self.day.isoformat(), 'to': self.day.isoformat()},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rejected'], 1)
+        self.assertEqual(
+            {card.id: card.status for card in HoursCard.objects.filter(id__in=[own.id, foreign.id, elsewhere.id])},
+            {own.id: 'REJECTED', foreign.id: 'SIGNED', elsewhere.id: 'SIGNED'},
+        )
+
+    def test_malformed_business_is_rejected(self):
+        response = self.review(status='APPROVED', business='nope', **{'from': '2026-10-01', 'to': '2026-10-07'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(OVERTIME_WEEKLY_HOURS=40, OVERTIME_MULTIPLIER=1.5)
+class OvertimeTests(TestCase):
+    MONDAY = date(2026, 9, 7)
+
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+
+    def staff(self, name, rate=20):
+        return BusinessStaff.objects.create(business=self.business, name=name, job_title='Barista', hourly_rate=rate)
+
+    def work(self, staff, *hours, start=None):
+        """One card per day from ``start`` (default MONDAY) with the given hours"""
+        for offset, worked in enumerate(hours):
+            day = (start or self.MONDAY) + timedelta(days=offset)
+            clock_in = timezone.make_aware(datetime.combine(day, time(6)))
+            HoursCard.objects.create(
+                staff=staff, date=day, status='APPROVED',
+                clock_in_datetime=clock_in, clock_out_datetime=clock_in + timedelta(hours=worked),
+            )
+
+    def overtime(self, start, end):
+        return {
+            (row['date'], row['seconds'] / 3600)
+            for row in _staff_day_overtime(self.business, start, end, None)
+        }
+
+    def test_exact_threshold_has_no_overtime(self):
+        self.work(self.staff('A'), 8, 8, 8, 8, 8)
+        self.assertEqual(self.overtime(self.MONDAY, self.MONDAY + timedelta(days=6)), set())
+
+    def test_overtime_is_split_per_staff_member(self):
+        self.work(self.staff('A'), 9, 9, 9, 9, 9)
+        self.work(self.staff('B'), 8, 8, 8, 8, 8)
+        self.assertEqual(self.overtime(self.MONDAY, self.MONDAY + timedelta(days=6)), {
+            (self.MONDAY + timedelta(days=4), 5),
+        })
+
+    def test_each_week_starts_from_zero(self):
+        staff = self.staff('A')
+        self.work(staff, 9, 9, 9, 9, 9)
+        self.work(staff, 10, 10, 10, 10, 1, start=self.MONDAY + timedelta(days=7))
+        self.assertEqual(self.overtime(self.MONDAY, self.MONDAY + timedelta(days=13)), {
+            (self.MONDAY + timedelta(days=4), 5),
+            (self.MONDAY + timedelta(days=11), 1),
+        })
+
+    def test_week_crossing_the_period_start_counts_earlier_days(self):
+        self.work(self.staff('A'), 12, 12, 12, 8, 8)
+        thursday = self.MONDAY + timedelta(days=3)
+        self.assertEqual(self.overtime(thursday, self.MONDAY + timedelta(days=6)), {
+            (thursday, 4),
+            (thursday + timedelta(days=1), 8),
+        })
+
+        report = build_labor_report(self.business, thursday, self.MONDAY + timedelta(days=6))
+        self.assertEqual(report['totals']['hours'], 16)
+        self.assertEqual(report['totals']['overtime_hours'], 12)
+        self.assertEqual(report['totals']['overtime_premium'], 12 * 20 * 0.5)
+        self.assertEqual(report['totals']['cost'], 16 * 20 + 12 * 20 * 0.5)
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        self.business = create_business('owner@example.com')
+        self.staff = BusinessStaff.objects.create(business=self.business, name='Worker', job_title='Barista')
+        self.morning = Shift.objects.create(
+            business=self.business, staff=self.staff, name='Morning', day_of_week='MONDAY',
+            start_time=time(8), end_time=time(12)
+        )
+        self.client = APIClient()
+
+    def fetch(self, token, **headers):
+        return self.client.get(f'/workforce/calendar/{token}.ics', **headers)
+
+    def test_rotating_the_key_revokes_old_tokens(self):
+        old = feed_token('staff', self.staff.id)
+        self.assertEqual(read_token(old), ('staff', self.staff))
+
+        rotate_feed_key('staff', self.staff.id)
+        with self.assertRaises(signing.BadSignature):
+            read_token(old)
+        self.assertEqual(self.fetch(old).status_code, 404)
+        self.assertEqual(self.fetch(feed_token('staff', self.staff.id)).status_code, 200)
+
+    def test_rotate_rejects_a_non_object_body(self):
+        self.client.force_authenticate(self.business.user)
+        response = self.client.post('/workforce/calendar-feeds/rotate/', [], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_deactivating_a_shift_changes_the_etag(self):
+        token = feed_token('business', self.business.id)
+        response = self.fetch(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'SUMMARY:Morning - Cafe', response.content)
+        etag = response['ETag']
+        self.assertEqual(self.fetch(token, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A bulk update leaves updated_at alone, so only the shift count moves the ETag
+        Shift.objects.filter(id=self.morning.id).update(is_active=False)
+        response = self.fetch(token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertNotIn(b'BEGIN:VEVENT', response.content)
+
+
+class FoldTests(SimpleTestCase):
+    def test_short_lines_are_left_alone(self):
+        self.assertEqual(_fold('SUMMARY:Morning'), 'SUMMARY:Morning')
+
+    def test_lines_fold_at_75_octets_without_splitting_characters(self):
+        for prefix in range(4):
+            line = 'DESCRIPTION:' + 'x' * prefix + '\u00e9\u2615' * 60
+            with self.subTest(prefix=prefix):
+                folded = _fold(line)
+                chunks = folded.split('\r\n')
+                self.assertGreater(len(chunks), 1)
+                for index, chunk in enumerate(chunks):
+                    self.assertLessEqual(len(chunk.encode()), 75)
+                    if index:
+                        self.assertTrue(chunk.startswith(' '))
+                self.assertEqual(folded.replace('\r\n ', ''), line)
@@ -6,22 +6,39 @@ app_name = 'workforce'
 urlpatterns = [
     path('staff/', views.BusinessStaffListCreateView.as_view(), name='staff-list'),
     path('staff/<uuid:pk>/', views.BusinessStaffRetrieveUpdateDestroyView.as_view(), name='staff-detail'),
+    path('staff/import/', views.import_staff, name='staff-import'),
+
+    path('sites/', views.WorkSiteListCreateView.as_view(), name='site-list'),
+    path('sites/<uuid:pk>/', views.WorkSiteRetrieveUpdateDestroyView.as_view(), name='site-detail'),
 
     path('shifts/', views.ShiftListCreateView.as_view(), name='shift-list'),
     path('shifts/<uuid:pk>/', views.ShiftRetrieveUpdateDestroyView.as_view(), name='shift-detail'),
+    path('shifts/copy/', views.copy_shifts, name='shift-copy'),
+
+    path('schedule/', views.ShiftOccurrenceListView.as_view(), name='schedule'),
 
     path('hours-cards/', views.HoursCardListCreateView.as_view(), name='hours-list'),
     path('hours-cards/<uuid:pk>/', views.HoursCardRetrieveUpdateDestroyView.as_view(), name='hours-detail'),
+    path('hours-cards/export/', views.export_timesheets, name='hours-export'),
 
+    path('me/', views.me, name='me'),
     path('my-shifts/', views.my_shifts, name='my-shifts'),
     path('my-hours/', views.my_hours_cards, name='my-hours'),
+    path('calendar-feeds/', views.calendar_feed_links, name='calendar-feed-links'),
+    path('calendar-feeds/rotate/', views.rotate_calendar_feed, name='calendar-feed-rotate'),
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar-feed'),
 
     path('clock-in/', views.clock_in, name='clock-in'),
     path('hours-cards/<uuid:hours_card_id>/clock-out/', views.clock_out, name='clock-out'),
+    path('punches/batch/', views.batch_punches, name='punch-batch'),
+    path('live-roster/', views.live_roster, name='live-roster'),
+    path('reports/labor/', views.labor_report, name='labor-report'),
+    path('reports/attendance/', views.attendance_report, name='attendance-report'),
 
     path('hours-cards/<uuid:hours_card_id>/sign/', views.sign_hours_card, name='sign-hours'),
 
     path('hours-cards/<uuid:hours_card_id>/approve/', views.approve_hours_card, name='approve-hours'),
+    path('hours-cards/bulk-approve/', views.bulk_approve_hours_cards, name='bulk-approve-hours'),
 
     path('invitations/', views.my_invitations, name='my-invitations'),
     path('invitations/<uuid:invitation_id>/accept/', views.accept_invitation, name='accept-invitation'),
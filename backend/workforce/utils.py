@@ -1,5 +1,12 @@
+import uuid
 from math import radians, cos, sin, asin, sqrt
 
+
+def parse_uuid(value):
+    """UUID from a query parameter, None when it is blank; raises ValueError when malformed"""
+    return uuid.UUID(str(value)) if value else None
+
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """
     Calculate distance between two points on Earth using Haversine formula.
@@ -1,13 +1,28 @@
-from rest_framework import status, permissions
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from rest_framework import serializers, status, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.response import Response
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import ListAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend # type: ignore
 from rest_framework.filters import SearchFilter, OrderingFilter
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
 from drf_spectacular.openapi import OpenApiResponse
+from django.conf import settings
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.db.models import Prefetch, Q
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
@@ -15,18 +30,38 @@ from .models import StaffInvitation
 from .serializers import StaffInvitationSerializer
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .utils import calculate_distance
+from .approvals import bulk_review, MAX_BULK_REVIEW, REVIEW_STATUSES
+from .calendar_feeds import build_feed, feed_token, feed_version, read_token, rotate_feed_key
+from .exports import timesheet_queryset, timesheet_rows, stream_csv, astream_csv, export_filename, parse_period
+from .geofence import check_location
+from .idempotency import idempotent
+from .pagination import DateKeysetPagination, wants_keyset
+from .punches import apply_punch_batch, MAX_BATCH_SIZE
+from .rollups import refresh_staff_day, week_start_for
+from .schedule import current_occurrence, ensure_horizon
+from .staff_import import StaffImport, read_csv, MAX_IMPORT_ROWS
+from .sweeper import sweep_if_due
+from .utils import parse_uuid
+from . import attendance, reports, roster
+from core.conditional import ConditionalGetMixin
 
 from business.models import Business
-from .models import BusinessStaff, Shift, HoursCard
+from .models import BusinessStaff, WorkSite, Shift, ShiftOccurrence, HoursCard, HoursRollup
 from .serializers import (
-    BusinessStaffSerializer, BusinessStaffListSerializer,
-    ShiftSerializer, HoursCardSerializer, HoursCardListSerializer
+    BusinessStaffSerializer, BusinessStaffListSerializer, WorkSiteSerializer,
+    ShiftSerializer, ShiftCopySerializer, ShiftOccurrenceSerializer, HoursCardSerializer, HoursCardListSerializer,
+    WorkerPositionSerializer
 )
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from .models import BusinessStaff, Shift, HoursCard, StaffInvitation
 
+
+def month_start():
+    """First day of the current month, the window for the staff hours column"""
+    return timezone.localdate().replace(day=1)
+
+
 class BusinessStaffListCreateView(ListCreateAPIView):
     serializer_class = BusinessStaffSerializer
     permission_classes = [IsAuthenticated]
@@ -42,13 +77,12 @@ class BusinessStaffListCreateView(ListCreateAPIView):
             return BusinessStaff.objects.none()
 
         user_businesses = Business.objects.filter(user=self.request.user)
-        return BusinessStaff.objects.filter(business__in=user_businesses)
+        return BusinessStaff.objects.filter(business__in=user_businesses).with_list_data(month_start())
 
     def perform_create(self, serializer):
         # Ensure business belongs to user
         business = serializer.validated_data['business']
         if business.user != self.request.user:
-            from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You can only add staff to your own business")
 
         # Get the user object if provided
@@ -100,13 +134,91 @@ class BusinessStaffListCreateView(ListCreateAPIView):
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
+@extend_schema(
+    summary="Import staff",
+    description="Create many staff members from a CSV upload (file) or a JSON list (rows), inviting linked workers",
+    request={
+        'multipart/form-data': {
+            'type': 'object',
+            'properties': {
+                'business': {'type': 'string', 'format': 'uuid'},
+                'file': {'type': 'string', 'format': 'binary'},
+                'skip_invalid': {'type': 'boolean'},
+            }
+        },
+        'application/json': {
+            'type': 'object',
+            'properties': {
+                'business': {'type': 'string', 'format': 'uuid'},
+                'rows': {'type': 'array', 'items': {'type': 'object'}},
+                'skip_invalid': {'type': 'boolean'},
+            }
+        },
+    }
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_staff(request):
+    """Bulk create staff for one of the owner's businesses"""
+    if not isinstance(request.data, dict):
+        return Response({'error': 'The request body must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        business_id = parse_uuid(request.data.get('business'))
+    except ValueError:
+        return Response({'error': "'business' must be a valid business ID"}, status=status.HTTP_400_BAD_REQUEST)
+    business = Business.objects.filter(id=business_id, user=request.user).first() if business_id else None
+    if not business:
+        return Response(
+            {'error': 'You can only add staff to your own business'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    upload = request.FILES.get('file')
+    if upload:
+        try:
+            rows = read_csv(upload.read().decode('utf-8'))
+        except UnicodeDecodeError:
+            return Response(
+                {'error': 'The file must be UTF-8 encoded CSV'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    else:
+        rows = request.data.get('rows')
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+        return Response(
+            {'error': 'Provide a CSV file or a non-empty list of rows'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(rows) > MAX_IMPORT_ROWS:
+        return Response(
+            {'error': f'An import can contain at most {MAX_IMPORT_ROWS} rows'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    skip_invalid = str(request.data.get('skip_invalid', '')).lower() in ('1', 'true', 'yes')
+    staff_import = StaffImport(business, rows, skip_invalid=skip_invalid)
+    created = staff_import.run()
+    if staff_import.errors and not skip_invalid:
+        return Response(
+            {'error': 'Some rows are invalid. Nothing was imported.', 'rows': staff_import.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response({
+        'created': len(created),
+        'invited': sum(1 for staff in created if staff.user_id),
+        'skipped': staff_import.errors,
+        'staff': BusinessStaffListSerializer(created, many=True).data,
+    }, status=status.HTTP_201_CREATED)
+
+
 class BusinessStaffRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     serializer_class = BusinessStaffSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user_businesses = Business.objects.filter(user=self.request.user)
-        return BusinessStaff.objects.filter(business__in=user_businesses)
+        return BusinessStaff.objects.filter(business__in=user_businesses).with_list_data(month_start())
 
     @extend_schema(
         summary="Get staff details",
@@ -134,9 +246,93 @@ class BusinessStaffRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         return super().delete(request, *args, **kwargs)
 
 
-class ShiftListCreateView(ListCreateAPIView):
+class WorkSiteListCreateView(ListCreateAPIView):
+    serializer_class = WorkSiteSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['business', 'is_active']
+    search_fields = ['name', 'address']
+    ordering_fields = ['name', 'created_at']
+    ordering = ['name']
+
+    def get_queryset(self):
+        # Handle Swagger documentation generation
+        if getattr(self, 'swagger_fake_view', False):
+            return WorkSite.objects.none()
+
+        return WorkSite.objects.filter(business__user=self.request.user).select_related('business')
+
+    def perform_create(self, serializer):
+        business = serializer.validated_data['business']
+        if business.user != self.request.user:
+            raise PermissionDenied("You can only add sites to your own business")
+        serializer.save()
+
+    @extend_schema(
+        summary="List work sites",
+        description="Get clock-in sites for user's businesses",
+        parameters=[
+            OpenApiParameter('business', str, description='Filter by business ID'),
+        ],
+        responses={200: WorkSiteSerializer(many=True)}
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Create work site",
+        description="Add a clock-in site with its own geofence radius",
+        request=WorkSiteSerializer,
+        responses={201: WorkSiteSerializer}
+    )
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
+
+class WorkSiteRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+    serializer_class = WorkSiteSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return WorkSite.objects.filter(business__user=self.request.user)
+
+    def perform_update(self, serializer):
+        business = serializer.validated_data.get('business', serializer.instance.business)
+        if business.user != self.request.user:
+            raise PermissionDenied("You can only move sites to your own business")
+        serializer.save()
+
+    @extend_schema(
+        summary="Get work site",
+        description="Retrieve work site by ID",
+        responses={200: WorkSiteSerializer}
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Update work site",
+        description="Update work site location or radius",
+        request=WorkSiteSerializer,
+        responses={200: WorkSiteSerializer}
+    )
+    def patch(self, request, *args, **kwargs):
+        return super().patch(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Delete work site",
+        description="Remove work site",
+        responses={204: OpenApiResponse(description="Work site deleted")}
+    )
+    def delete(self, request, *args, **kwargs):
+        return super().delete(request, *args, **kwargs)
+
+
+class ShiftListCreateView(ConditionalGetMixin, ListCreateAPIView):
     serializer_class = ShiftSerializer
     permission_classes = [IsAuthenticated]
+    # The serializer renders the staff member's and business's names
+    validator_related = ('staff__updated_at', 'business__updated_at')
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['business', 'staff', 'shift_type', 'day_of_week', 'is_active']
     search_fields = ['name', 'staff__name']
@@ -154,7 +350,6 @@ class ShiftListCreateView(ListCreateAPIView):
     def perform_create(self, serializer):
         business = serializer.validated_data['business']
         if business.user != self.request.user:
-            from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You can only create shifts for your own business")
         serializer.save()
 
@@ -180,9 +375,11 @@ class ShiftListCreateView(ListCreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
-class ShiftRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class ShiftRetrieveUpdateDestroyView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = ShiftSerializer
     permission_classes = [IsAuthenticated]
+    # The serializer renders the staff member's and business's names
+    validator_related = ('staff__updated_at', 'business__updated_at')
 
     def get_queryset(self):
         user_businesses = Business.objects.filter(user=self.request.user)
@@ -214,12 +411,120 @@ class ShiftRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         return super().delete(request, *args, **kwargs)
 
 
+@extend_schema(
+    summary="Copy shifts",
+    description="Apply a staff member's shifts (or selected shifts) to many staff in one transaction",
+    request=ShiftCopySerializer,
+    responses={201: inline_serializer(
+        name='ShiftCopyResult',
+        fields={
+            'created': serializers.IntegerField(),
+            'reactivated': serializers.IntegerField(help_text='Deactivated shifts at the same day and start that were reused'),
+            'skipped': inline_serializer(
+                name='ShiftCopySkipped',
+                fields={
+                    'staff': serializers.UUIDField(),
+                    'day_of_week': serializers.CharField(),
+                    'start_time': serializers.TimeField(),
+                    'end_time': serializers.TimeField(),
+                },
+                many=True,
+            ),
+            'shifts': ShiftSerializer(many=True),
+        },
+    )}
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def copy_shifts(request):
+    serializer = ShiftCopySerializer(data=request.data, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    created, reactivated, skipped = serializer.save()
+
+    return Response({
+        'created': len(created),
+        'reactivated': len(reactivated),
+        'skipped': [
+            {'staff': str(shift.staff_id), 'day_of_week': shift.day_of_week,
+             'start_time': shift.start_time, 'end_time': shift.end_time}
+            for shift in skipped
+        ],
+        'shifts': ShiftSerializer([*created, *reactivated], many=True).data,
+    }, status=status.HTTP_201_CREATED)
+
+
+class ShiftOccurrenceListView(ListAPIView):
+    """Dated shift calendar: owners see their businesses, workers see their own shifts"""
+    serializer_class = ShiftOccurrenceSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['business', 'staff', 'shift']
+    ordering_fields = ['start']
+    ordering = ['start']
+
+    def get_queryset(self):
+        # Handle Swagger documentation generation
+        if getattr(self, 'swagger_fake_view', False):
+            return ShiftOccurrence.objects.none()
+
+        ensure_horizon()
+        queryset = ShiftOccurrence.objects.filter(
+            Q(business__user=self.request.user) | Q(staff__user=self.request.user)
+        ).select_related('shift', 'staff')
+
+        date_from = self.request.query_params.get('from')
+        date_to = self.request.query_params.get('to')
+        try:
+            if date_from:
+                queryset = queryset.filter(date__gte=parse_date(date_from))
+            if date_to:
+                queryset = queryset.filter(date__lte=parse_date(date_to))
+        except (TypeError, ValueError):
+            raise ValidationError("from and to must be dates in YYYY-MM-DD format")
+        return queryset
+
+    @extend_schema(
+        summary="List scheduled shifts",
+        description="Get dated shift occurrences within a date range",
+        parameters=[
+            OpenApiParameter('from', str, description='First date (YYYY-MM-DD)'),
+            OpenApiParameter('to', str, description='Last date (YYYY-MM-DD)'),
+            OpenApiParameter('staff', str, description='Filter by staff ID'),
+            OpenApiParameter('business', str, description='Filter by business ID'),
+        ],
+        responses={200: ShiftOccurrenceSerializer(many=True)}
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+def filter_date_window(queryset, params):
+    """Restrict cards to the optional ?from= / ?to= dates (inclusive)"""
+    try:
+        if params.get('from'):
+            queryset = queryset.filter(date__gte=date.fromisoformat(params['from']))
+        if params.get('to'):
+            queryset = queryset.filter(date__lte=date.fromisoformat(params['to']))
+    except ValueError:
+        raise ValidationError("from and to must be dates (YYYY-MM-DD)")
+    return queryset
+
+
+HOURS_WINDOW_PARAMETERS = [
+    OpenApiParameter('from', str, description='Only cards on or after this date (YYYY-MM-DD)'),
+    OpenApiParameter('to', str, description='Only cards on or before this date (YYYY-MM-DD)'),
+    OpenApiParameter('pagination', str, description='Set to "cursor" for keyset pages ordered by (date, id), newest first'),
+    OpenApiParameter('cursor', str, description='Cursor from a previous keyset page'),
+    OpenApiParameter('page_size', int, description='Keyset page size (max 200)'),
+]
+
+
 class HoursCardListCreateView(ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['staff', 'status', 'date']
     search_fields = ['staff__name', 'notes']
-    ordering_fields = ['date', 'created_at']
+    ordering_fields = ['date', 'created_at', 'worked_seconds']
     ordering = ['-date']
 
     def get_queryset(self):
@@ -228,8 +533,27 @@ class HoursCardListCreateView(ListCreateAPIView):
             return HoursCard.objects.none()
 
         user_businesses = Business.objects.filter(user=self.request.user)
-        return HoursCard.objects.filter(staff__business__in=user_businesses)
-
+        queryset = HoursCard.objects.filter(staff__business__in=user_businesses).select_related('staff')
+        queryset = filter_date_window(queryset, self.request.query_params)
+
+        min_hours = self.request.query_params.get('min_hours')
+        max_hours = self.request.query_params.get('max_hours')
+        try:
+            if min_hours:
+                queryset = queryset.worked_over(min_hours)
+            if max_hours:
+                queryset = queryset.worked_under(max_hours)
+        except ValueError:
+            raise ValidationError("min_hours and max_hours must be numbers")
+        return queryset
+
+
+    @property
+    def pagination_class(self):
+        request = getattr(self, 'request', None)
+        if request is not None and wants_keyset(request):
+            return DateKeysetPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -239,7 +563,6 @@ class HoursCardListCreateView(ListCreateAPIView):
     def perform_create(self, serializer):
         staff = serializer.validated_data['staff']
         if staff.business.user != self.request.user:
-            from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You can only create hours cards for your own staff")
         serializer.save()
 
@@ -250,6 +573,9 @@ class HoursCardListCreateView(ListCreateAPIView):
             OpenApiParameter('staff', str, description='Filter by staff ID'),
             OpenApiParameter('status', str, description='Filter by approval status'),
             OpenApiParameter('date', str, description='Filter by date'),
+            OpenApiParameter('min_hours', float, description='Only cards with more worked hours than this'),
+            OpenApiParameter('max_hours', float, description='Only cards with fewer worked hours than this'),
+            *HOURS_WINDOW_PARAMETERS,
         ],
         responses={200: HoursCardListSerializer(many=True)}
     )
@@ -432,6 +758,54 @@ def send_invitation_count_update(user_id):
 
 
 # Worker endpoints - for workers to manage their own time
+@extend_schema(
+    summary="Worker home",
+    description="All active positions of the logged-in worker with today's shifts, open card and week-to-date hours",
+    responses={200: WorkerPositionSerializer(many=True)}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def me(request):
+    """Everything the worker start screen needs, in a fixed number of queries"""
+    sweep_if_due()
+    today = timezone.localdate()
+    day_start = timezone.make_aware(datetime.combine(today, time.min))
+    day_end = day_start + timedelta(days=1)
+    week_start = week_start_for(today)
+
+    ensure_horizon()
+    positions = BusinessStaff.objects.filter(user=request.user, status='ACTIVE').select_related('business').prefetch_related(
+        Prefetch(
+            'shift_occurrences',
+            queryset=ShiftOccurrence.objects.filter(start__lt=day_end, end__gt=day_start).select_related('shift'),
+            to_attr='today_occurrences'
+        ),
+        Prefetch(
+            'hours_cards',
+            queryset=HoursCard.objects.open(),
+            to_attr='open_cards'
+        ),
+        Prefetch(
+            'hours_rollups',
+            queryset=HoursRollup.objects.filter(period='WEEK', period_start=week_start),
+            to_attr='week_rollups'
+        ),
+    ).order_by('business__name')
+
+    positions = list(positions)
+    data = WorkerPositionSerializer(positions, many=True).data
+    return Response({
+        'date': today,
+        'week_start': week_start,
+        'positions': data,
+        'clocked_in': any(position['open_card'] for position in data),
+        'week_hours': {
+            key: round(sum(position['week_hours'][key] for position in data), 2)
+            for key in ('worked', 'submitted', 'approved')
+        },
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_shifts(request):
@@ -455,6 +829,149 @@ def my_shifts(request):
         )
 
 
+@extend_schema(
+    summary="Calendar feed links",
+    description="Subscribable iCal URLs for the user's own shifts and for each business they own",
+    responses={200: OpenApiResponse(description='Feed URLs')}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def calendar_feed_links(request):
+    """Feed URLs carry a signed token so calendar apps can poll them without logging in"""
+    def feed_url(kind, owner):
+        return request.build_absolute_uri(reverse('workforce:calendar-feed', args=[feed_token(kind, owner.id)]))
+
+    staff = BusinessStaff.objects.filter(user=request.user, status='ACTIVE').select_related('business')
+    businesses = Business.objects.filter(user=request.user).only('id', 'name')
+    return Response({
+        'staff': [
+            {'staff': str(member.id), 'business_name': member.business.name, 'url': feed_url('staff', member)}
+            for member in staff
+        ],
+        'businesses': [
+            {'business': str(business.id), 'name': business.name, 'url': feed_url('business', business)}
+            for business in businesses
+        ],
+    })
+
+
+@extend_schema(
+    summary="Revoke calendar feed",
+    description="Invalidate a feed URL and return a new one; pass either staff or business",
+    request=inline_serializer(
+        name='CalendarFeedRotate',
+        fields={'staff': serializers.UUIDField(required=False), 'business': serializers.UUIDField(required=False)},
+    ),
+    responses={200: OpenApiResponse(description='New feed URL')}
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def rotate_calendar_feed(request):
+    """Workers can revoke their own feeds; owners can revoke their business's and their staff's feeds"""
+    if not isinstance(request.data, dict):
+        return Response({'error': 'The request body must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        staff_id = parse_uuid(request.data.get('staff'))
+        business_id = parse_uuid(request.data.get('business'))
+    except ValueError:
+        return Response({'error': 'staff and business must be valid IDs'}, status=status.HTTP_400_BAD_REQUEST)
+    if bool(staff_id) == bool(business_id):
+        return Response({'error': 'Provide either staff or business'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if staff_id:
+        kind = 'staff'
+        owner = BusinessStaff.objects.filter(
+            Q(user=request.user) | Q(business__user=request.user), id=staff_id
+        ).first()
+    else:
+        kind = 'business'
+        owner = Business.objects.filter(user=request.user, id=business_id).first()
+    if not owner:
+        return Response({'error': 'Feed not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    rotate_feed_key(kind, owner.id)
+    url = request.build_absolute_uri(reverse('workforce:calendar-feed', args=[feed_token(kind, owner.id)]))
+    return Response({kind: str(owner.id), 'url': url})
+
+
+def calendar_feed(request, token):
+    """
+    iCal feed of a staff member's or a business's weekly shifts.
+
+    A plain Django view: calendar clients send Accept headers DRF can't
+    negotiate, and authenticate with the signed token in the URL. The ETag
+    and Last-Modified come from one aggregate query, so a poll of an
+    unchanged feed gets a 304 without the document being rebuilt.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    try:
+        kind, owner = read_token(token)
+    except signing.BadSignature:
+        raise Http404('Unknown calendar feed')
+
+    etag, last_modified = feed_version(kind, owner)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = HttpResponse(build_feed(kind, owner), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="shifts.ics"'
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_cache_control(response, private=True, max_age=getattr(settings, 'CALENDAR_FEED_MAX_AGE', 300))
+    return response
+
+
+@extend_schema(
+    summary="Export timesheets",
+    description="Stream hours cards for a period as CSV for payroll, with worked hours and cost",
+    parameters=[
+        OpenApiParameter('from', str, required=True, description='First date (YYYY-MM-DD)'),
+        OpenApiParameter('to', str, required=True, description='Last date (YYYY-MM-DD)'),
+        OpenApiParameter('business', str, description='Limit to one of your businesses'),
+        OpenApiParameter('status', str, description='Card status to export (default APPROVED, "all" for every status)'),
+    ],
+    responses={200: OpenApiResponse(description='CSV file')}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_timesheets(request):
+    """Stream timesheets as CSV without loading the whole period into memory"""
+    try:
+        start, end = parse_period(request.query_params.get('from', ''), request.query_params.get('to', ''))
+    except ValueError:
+        return Response(
+            {'error': "'from' and 'to' must be dates (YYYY-MM-DD) with 'to' on or after 'from'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        business_id = parse_uuid(request.query_params.get('business'))
+    except ValueError:
+        return Response({'error': "'business' must be a valid business ID"}, status=status.HTTP_400_BAD_REQUEST)
+
+    card_status = request.query_params.get('status', 'APPROVED')
+    cards = timesheet_queryset(
+        start, end,
+        business_ids=[business_id] if business_id else None,
+        owner=request.user,
+        status=None if card_status.lower() == 'all' else card_status.upper(),
+    )
+
+    # Under ASGI a sync iterator would be buffered whole before the first byte is sent
+    stream = astream_csv if isinstance(request._request, ASGIRequest) else stream_csv
+    response = StreamingHttpResponse(stream(timesheet_rows(cards)), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(start, end)}"'
+    return response
+
+
+@extend_schema(
+    summary="My hours cards",
+    description="Hours cards for the logged-in worker; unpaginated unless pagination=cursor is given",
+    parameters=HOURS_WINDOW_PARAMETERS,
+    responses={200: HoursCardListSerializer(many=True)}
+)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_hours_cards(request):
@@ -468,9 +985,16 @@ def my_hours_cards(request):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        hours_cards = HoursCard.objects.filter(staff=staff).order_by('-date')
-        serializer = HoursCardListSerializer(hours_cards, many=True)
+        hours_cards = filter_date_window(HoursCard.objects.filter(staff=staff), request.query_params)
+        if wants_keyset(request):
+            paginator = DateKeysetPagination()
+            page = paginator.paginate_queryset(hours_cards, request)
+            return paginator.get_paginated_response(HoursCardListSerializer(page, many=True).data)
+
+        serializer = HoursCardListSerializer(hours_cards.order_by('-date'), many=True)
         return Response(serializer.data)
+    except (ValidationError, NotFound):
+        raise
     except Exception as e:
         return Response(
             {'error': str(e)},
@@ -479,10 +1003,10 @@ def my_hours_cards(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent('clock_in')
 def clock_in(request):
     """Clock in - can be done by worker or business owner for a worker"""
-    from datetime import datetime, timedelta
-
+    sweep_if_due()
     staff_id = request.data.get('staff_id')
     notes = request.data.get('notes', '')
     latitude = request.data.get('latitude')
@@ -502,6 +1026,7 @@ def clock_in(request):
     custom_date = request.data.get('date')
     custom_clock_in_time = request.data.get('clock_in_time')
     custom_clock_out_time = request.data.get('clock_out_time')
+    work_site = None
 
     try:
         # If staff_id provided, business owner is adding hours for a worker
@@ -553,18 +1078,6 @@ def clock_in(request):
                 else:
                     clock_out_datetime = timezone.make_aware(naive_dt, timezone.utc)
 
-            # Check if record already exists
-            existing = HoursCard.objects.filter(staff=staff, date=clock_date).first()
-            if existing:
-                return Response(
-                    {
-                        'error': f'Hours already recorded for {staff.name} on {clock_date.strftime("%B %d, %Y")}',
-                        'detail': 'Please edit the existing record if you need to make changes.',
-                        'existing_record_id': str(existing.id)
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
         else:
             # Worker clocking in themselves
             staff = BusinessStaff.objects.filter(user=request.user, status='ACTIVE').first()
@@ -586,56 +1099,68 @@ def clock_in(request):
                         status=status.HTTP_400_BAD_REQUEST
                     )
 
-                if not staff.business.workplace_latitude or not staff.business.workplace_longitude:
+                fence = check_location(staff.business, latitude, longitude)
+                if fence.error:
                     return Response(
-                        {'error': 'Workplace location not configured. Please contact your manager.'},
+                        {'error': fence.error},
                         status=status.HTTP_400_BAD_REQUEST
                     )
 
-                distance = calculate_distance(
-                    float(latitude),
-                    float(longitude),
-                    float(staff.business.workplace_latitude),
-                    float(staff.business.workplace_longitude)
-                )
-
-                if distance > staff.business.clock_in_radius_meters:
+                if not fence.within:
                     return Response(
                         {
-                            'error': f'You must be within {staff.business.clock_in_radius_meters}m of the workplace to clock in. You are {int(distance)}m away.',
-                            'distance': int(distance),
-                            'required_distance': staff.business.clock_in_radius_meters
+                            'error': fence.message,
+                            'distance': int(fence.distance),
+                            'required_distance': fence.radius_meters,
+                            'nearest_site': fence.site.name if fence.site else None
                         },
                         status=status.HTTP_400_BAD_REQUEST
                     )
+                distance = fence.distance
+                work_site = fence.site
             else:
                 distance = None
 
-            # Check if already clocked in today
-            existing = HoursCard.objects.filter(
-                staff=staff,
-                date=clock_date,
-                clock_out_datetime__isnull=True
-            ).first()
-            if existing:
-                return Response(
-                    {'error': 'Already clocked in for today'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        occurrence = current_occurrence(staff, clock_in_datetime)
 
-        # Create hour card
-        hours_card = HoursCard.objects.create(
+        # Single INSERT ... ON CONFLICT on (staff, date) instead of check-then-insert
+        hours_card, created = HoursCard.objects.insert_if_absent(HoursCard(
             staff=staff,
+            shift_id=occurrence.shift_id if occurrence else None,
             date=clock_date,
             clock_in_datetime=clock_in_datetime,
             clock_out_datetime=clock_out_datetime,
             clock_in_latitude=latitude if latitude else None,
             clock_in_longitude=longitude if longitude else None,
             clock_in_distance_meters=distance,
+            work_site=work_site,
             notes=notes,
             clocked_in_by=request.user,
             status='PENDING'
-        )
+        ))
+
+        if not created:
+            if staff_id:
+                return Response(
+                    {
+                        'error': f'Hours already recorded for {staff.name} on {clock_date.strftime("%B %d, %Y")}',
+                        'detail': 'Please edit the existing record if you need to make changes.',
+                        'existing_record_id': str(hours_card.id)
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if not hours_card.clock_out_datetime:
+                return Response(
+                    {'error': 'Already clocked in for today'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response(
+                {'error': 'Hours already recorded for today'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        refresh_staff_day(staff.id, clock_date, staff.business_id)
+        roster.clocked_in([hours_card])
 
         serializer = HoursCardSerializer(hours_card)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -651,7 +1176,6 @@ def clock_in(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
-        import traceback
         return Response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -661,14 +1185,12 @@ def clock_in(request):
 @permission_classes([IsAuthenticated])
 def clock_out(request, hours_card_id):
     """Clock out - can be done by worker or business owner"""
-    from datetime import datetime
-
     try:
-        hours_card = HoursCard.objects.get(id=hours_card_id)
+        hours_card = HoursCard.objects.with_access().select_related('shift').get(id=hours_card_id)
 
         # Verify permission
-        is_worker = hours_card.staff.user == request.user
-        is_business_owner = hours_card.staff.business.user == request.user
+        is_worker = hours_card.staff.user_id == request.user.id
+        is_business_owner = hours_card.staff.business.user_id == request.user.id
 
         if not (is_worker or is_business_owner):
             return Response(
@@ -724,10 +1246,10 @@ def sign_hours_card(request, hours_card_id):
         )
 
     try:
-        hours_card = HoursCard.objects.get(id=hours_card_id)
+        hours_card = HoursCard.objects.with_access().select_related('shift').get(id=hours_card_id)
 
         # Verify this is the worker's card
-        if hours_card.staff.user != request.user:
+        if hours_card.staff.user_id != request.user.id:
             return Response(
                 {'error': 'You can only sign your own hour cards'},
                 status=status.HTTP_403_FORBIDDEN
@@ -776,10 +1298,10 @@ def approve_hours_card(request, hours_card_id):
     rejection_reason = request.data.get('rejection_reason', '')
 
     try:
-        hours_card = HoursCard.objects.get(id=hours_card_id)
+        hours_card = HoursCard.objects.with_access().select_related('shift').get(id=hours_card_id)
 
         # Verify business owner
-        if hours_card.staff.business.user != request.user:
+        if hours_card.staff.business.user_id != request.user.id:
             return Response(
                 {'error': 'You can only approve your own staff hour cards'},
                 status=status.HTTP_403_FORBIDDEN
@@ -822,3 +1344,234 @@ def approve_hours_card(request, hours_card_id):
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@extend_schema(
+    summary="Bulk approve hours cards",
+    description="Approve or reject many signed hours cards, given by ID or by business and date range",
+    request={
+        'application/json': {
+            'type': 'object',
+            'properties': {
+                'status': {'type': 'string', 'enum': ['APPROVED', 'REJECTED']},
+                'rejection_reason': {'type': 'string'},
+                'hours_card_ids': {'type': 'array', 'items': {'type': 'string', 'format': 'uuid'}},
+                'business': {'type': 'string', 'format': 'uuid'},
+                'from': {'type': 'string', 'format': 'date'},
+                'to': {'type': 'string', 'format': 'date'},
+            }
+        }
+    }
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_approve_hours_cards(request):
+    """Business owner approves or rejects a batch of signed hour cards"""
+    if not isinstance(request.data, dict):
+        return Response({'error': 'The request body must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+    approval_status = request.data.get('status', 'APPROVED')
+    if approval_status not in REVIEW_STATUSES:
+        return Response(
+            {'error': 'Invalid status. Must be APPROVED or REJECTED'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    card_ids = request.data.get('hours_card_ids')
+    if card_ids is not None:
+        if not isinstance(card_ids, list) or not card_ids:
+            return Response(
+                {'error': 'hours_card_ids must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(card_ids) > MAX_BULK_REVIEW:
+            return Response(
+                {'error': f'At most {MAX_BULK_REVIEW} hour cards can be reviewed at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            card_ids = [str(uuid.UUID(str(card_id))) for card_id in card_ids]
+        except ValueError:
+            return Response(
+                {'error': 'hours_card_ids must contain valid IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = HoursCard.objects.filter(id__in=card_ids)
+    else:
+        try:
+            start = date.fromisoformat(request.data.get('from', ''))
+            end = date.fromisoformat(request.data.get('to', ''))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Provide hours_card_ids, or from and to dates (YYYY-MM-DD)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            business_id = parse_uuid(request.data.get('business'))
+        except ValueError:
+            return Response(
+                {'error': "'business' must be a valid business ID"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = HoursCard.objects.filter(status='SIGNED', date__gte=start, date__lte=end)
+        if business_id:
+            queryset = queryset.filter(staff__business_id=business_id)
+        if queryset.filter(staff__business__user=request.user).count() > MAX_BULK_REVIEW:
+            return Response(
+                {'error': f'At most {MAX_BULK_REVIEW} hour cards can be reviewed at once. Narrow the date range.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    results = bulk_review(
+        request.user,
+        queryset,
+        approval_status,
+        rejection_reason=request.data.get('rejection_reason', ''),
+        requested_ids=card_ids,
+    )
+    outcome = approval_status.lower()
+    return Response({
+        'results': results,
+        outcome: sum(1 for result in results if result['outcome'] == outcome),
+        'skipped': sum(1 for result in results if result['outcome'] != outcome),
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_punches(request):
+    """Apply a batch of offline clock-in/out punches queued on a device"""
+    punches = request.data.get('punches') if isinstance(request.data, dict) else None
+    if not isinstance(punches, list) or not punches:
+        return Response(
+            {'error': 'punches must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(punches) > MAX_BATCH_SIZE:
+        return Response(
+            {'error': f'A batch can contain at most {MAX_BATCH_SIZE} punches'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        results = apply_punch_batch(request.user, punches)
+    except IntegrityError:
+        return Response(
+            {'error': 'Hours cards changed while syncing. Please retry the batch.'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    return Response({
+        'results': results,
+        'applied': sum(1 for result in results if result['status'] in ('created', 'updated')),
+        'duplicates': sum(1 for result in results if result['status'] == 'duplicate'),
+        'failed': sum(1 for result in results if result['status'] == 'error'),
+    })
+
+
+@extend_schema(
+    summary="Labor cost report",
+    description="Hours and cost per day, department and employment type with weekly overtime, for one business",
+    parameters=[
+        OpenApiParameter('business', str, required=True, description='Business ID'),
+        OpenApiParameter('from', str, required=True, description='First date (YYYY-MM-DD)'),
+        OpenApiParameter('to', str, required=True, description='Last date (YYYY-MM-DD)'),
+        OpenApiParameter('status', str, description='Only include cards with this status (e.g. APPROVED)'),
+    ],
+    responses={200: OpenApiResponse(description='Labor report')}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def labor_report(request):
+    """Labor cost and overtime for a period, cached until its cards change"""
+    try:
+        business_id = parse_uuid(request.query_params.get('business'))
+    except ValueError:
+        return Response({'error': "'business' must be a valid business ID"}, status=status.HTTP_400_BAD_REQUEST)
+    business = Business.objects.filter(id=business_id, user=request.user).first() if business_id else None
+    if not business:
+        return Response(
+            {'error': 'Business not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        start, end = parse_period(request.query_params.get('from', ''), request.query_params.get('to', ''))
+    except ValueError:
+        return Response(
+            {'error': "'from' and 'to' must be dates (YYYY-MM-DD) with 'to' on or after 'from'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if (end - start).days > 366:
+        return Response(
+            {'error': 'Reports can cover at most one year'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    card_status = request.query_params.get('status')
+    return Response(reports.labor_report(business, start, end, card_status.upper() if card_status else None))
+
+
+@extend_schema(
+    summary="Attendance report",
+    description="Late arrivals, no-shows and early departures against the schedule for one business",
+    parameters=[
+        OpenApiParameter('business', str, required=True, description='Business ID'),
+        OpenApiParameter('from', str, required=True, description='First date (YYYY-MM-DD)'),
+        OpenApiParameter('to', str, required=True, description='Last date (YYYY-MM-DD)'),
+    ],
+    responses={200: OpenApiResponse(description='Attendance report')}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def attendance_report(request):
+    """Scheduled shifts compared with actual punches over a period"""
+    try:
+        business_id = parse_uuid(request.query_params.get('business'))
+    except ValueError:
+        return Response({'error': "'business' must be a valid business ID"}, status=status.HTTP_400_BAD_REQUEST)
+    business = Business.objects.filter(id=business_id, user=request.user).first() if business_id else None
+    if not business:
+        return Response(
+            {'error': 'Business not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        start, end = parse_period(request.query_params.get('from', ''), request.query_params.get('to', ''))
+    except ValueError:
+        return Response(
+            {'error': "'from' and 'to' must be dates (YYYY-MM-DD) with 'to' on or after 'from'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if (end - start).days > 366:
+        return Response(
+            {'error': 'Reports can cover at most one year'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response(attendance.attendance_report(business, start, end))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def live_roster(request):
+    """Staff currently on the clock for the owner's business"""
+    try:
+        business_id = parse_uuid(request.query_params.get('business'))
+    except ValueError:
+        return Response({'error': "'business' must be a valid business ID"}, status=status.HTTP_400_BAD_REQUEST)
+    businesses = Business.objects.filter(user=request.user)
+    business = businesses.filter(id=business_id).first() if business_id else businesses.first()
+    if not business:
+        return Response(
+            {'error': 'Business not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    sweep_if_due()
+    entries = sorted(roster.get_roster(business.id), key=lambda entry: entry['clock_in_datetime'] or '')
+    return Response({
+        'business': str(business.id),
+        'count': len(entries),
+        'on_the_clock': entries,
+    })